@@ -0,0 +1,126 @@
+import hashlib
+import json
+import math
+import os
+
+# Backtesting: replays past events and scores the title odds the model would have given before each one.
+#
+# Every subdirectory of the events directory is one event:
+#   players.csv   player sheet snapshot from before the event
+#   seeding.csv   rankings used for seeding ('Team Name' column, best first)
+#   results.json  {"format": "swiss" | "double_elim" | "groups", "winner": "<team>"}
+#
+# Forecasts are cached in <events directory>/.backtest_cache, keyed by a hash of the event's input files and the
+# forecast settings and the source of the modules that play the events, so scoring again after changing the model or
+# the results only re-simulates what changed.
+
+EVENT_FILES = {'players': 'players.csv', 'seeding': 'seeding.csv', 'results': 'results.json'}
+
+CACHE_DIRECTORY = '.backtest_cache'
+
+# Modules whose code decides a forecast; editing any of them invalidates every cached forecast
+MODEL_MODULES = ['main.py', 'batch.py', 'kernels.py', 'outcome_models.py', 'pairing.py', 'players.py', 'standings.py']
+
+# Probability bins of the calibration curves
+CALIBRATION_BINS = 10
+
+
+def load_events(directory):
+    events = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if not os.path.isdir(path) or name == CACHE_DIRECTORY:
+            continue
+        missing = [file_name for file_name in EVENT_FILES.values() if not os.path.exists(os.path.join(path, file_name))]
+        if missing:
+            print(f"Skipping {name}: missing {', '.join(missing)}")
+            continue
+
+        with open(os.path.join(path, EVENT_FILES['results']), mode='r') as file:
+            results = json.load(file)
+        events.append({
+            'name': name,
+            'format': results['format'],
+            'winner': results['winner'],
+            'players_path': os.path.join(path, EVENT_FILES['players']),
+            'seeding_path': os.path.join(path, EVENT_FILES['seeding']),
+        })
+    return events
+
+
+def model_fingerprint():
+    # Hash of the model's source code
+    digest = hashlib.sha256()
+    for name in MODEL_MODULES:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), name), mode='rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def input_hash(event, settings):
+    # Hash of everything a forecast depends on: the event's player sheet and seeding, the forecast settings and
+    # the model code
+    digest = hashlib.sha256(model_fingerprint().encode())
+    for key in ['players_path', 'seeding_path']:
+        with open(event[key], mode='rb') as file:
+            digest.update(file.read())
+    digest.update(json.dumps(dict(settings, format=event['format']), sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def load_cached(directory, key):
+    path = os.path.join(directory, CACHE_DIRECTORY, f"{key}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, mode='r') as file:
+        return json.load(file)
+
+
+def store_cached(directory, key, forecast):
+    os.makedirs(os.path.join(directory, CACHE_DIRECTORY), exist_ok=True)
+    with open(os.path.join(directory, CACHE_DIRECTORY, f"{key}.json"), mode='w') as file:
+        json.dump(forecast, file)
+
+
+def score_forecasts(events, forecasts):
+    # Per format: multi-class Brier score and log loss of the title odds, and a calibration curve over every
+    # (team, event) probability. forecasts[name] is {'total_wins': {team: wins}, 'iterations': n}.
+    report = {}
+    for event in events:
+        forecast = forecasts[event['name']]
+        iterations = forecast['iterations']
+        probabilities = {team: wins / iterations for team, wins in forecast['total_wins'].items()}
+        # A team that never won in the simulations still gets half a win, so the log loss stays finite
+        winner_probability = max(probabilities.get(event['winner'], 0.0), 0.5 / iterations)
+
+        scores = report.setdefault(event['format'], {'events': 0, 'brier': 0.0, 'log_loss': 0.0, 'bins': [[0, 0.0, 0] for _ in range(CALIBRATION_BINS)]})
+        scores['events'] += 1
+        scores['brier'] += sum((p - (team == event['winner'])) ** 2 for team, p in probabilities.items())
+        scores['log_loss'] -= math.log(winner_probability)
+        for team, p in probabilities.items():
+            calibration_bin = scores['bins'][min(int(p * CALIBRATION_BINS), CALIBRATION_BINS - 1)]
+            calibration_bin[0] += 1
+            calibration_bin[1] += p
+            calibration_bin[2] += team == event['winner']
+
+    for scores in report.values():
+        scores['brier'] /= scores['events']
+        scores['log_loss'] /= scores['events']
+        # (bin start, mean forecast, observed title rate, teams) for the bins that have any forecasts
+        scores['calibration'] = [
+            (i / CALIBRATION_BINS, total / count, titles / count, count)
+            for i, (count, total, titles) in enumerate(scores.pop('bins')) if count
+        ]
+    return report
+
+
+def report_tables(report):
+    # The score_forecasts report as export tables: scores per format, and every format's calibration curve
+    summary = [[tournament_format, scores['events'], scores['brier'], scores['log_loss']] for tournament_format, scores in report.items()]
+    curves = [[tournament_format, bin_start, bin_start + 1 / CALIBRATION_BINS, mean_forecast, observed, count]
+              for tournament_format, scores in report.items()
+              for bin_start, mean_forecast, observed, count in scores['calibration']]
+    return {
+        'scores': (['Format', 'Events', 'Brier', 'Log Loss'], summary),
+        'calibration': (['Format', 'Bin Start', 'Bin End', 'Mean Forecast', 'Observed', 'Teams'], curves),
+    }
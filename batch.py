@@ -0,0 +1,74 @@
+import numpy as np
+
+from kernels import GOALS, ASSISTS, SAVES, SHOTS, UNCERTAINTY
+from outcome_models import DEFAULT_GAME_PARAMETERS
+
+# Vectorized versions of simulate_game and the series functions: every argument is an array over
+# independent games/series, so thousands of series cost a handful of numpy calls instead of a Python loop each.
+
+
+def simulate_games(stats, team1, team2, rng, games=1, parameters=None):
+    # team1/team2 are team id arrays; returns scores of shape (len(team1), games), each row the same matchup.
+    # parameters replaces simulate_game's constants, e.g. with fitted values from calibration.py.
+    p = parameters or DEFAULT_GAME_PARAMETERS
+    team1 = team1[:, None]
+    team2 = team2[:, None]
+    size = (len(team1), games)
+
+    base_score_team1 = (stats[team1, GOALS] / stats[team1, SHOTS]) * p['goal_weight'] + stats[team1, ASSISTS] * p['assist_weight'] - stats[team2, SAVES] * p['save_weight']
+    base_score_team2 = (stats[team2, GOALS] / stats[team2, SHOTS]) * p['goal_weight'] + stats[team2, ASSISTS] * p['assist_weight'] - stats[team1, SAVES] * p['save_weight']
+
+    form_range = p['form_high'] - p['form_low']
+    score_variation_team1 = base_score_team1 * (p['form_low'] + form_range * rng.random(size))
+    score_variation_team2 = base_score_team2 * (p['form_low'] + form_range * rng.random(size))
+
+    uncertainty_range = p['uncertainty_high'] - p['uncertainty_low']
+    variation_team1 = stats[team1, UNCERTAINTY] * (p['uncertainty_low'] + uncertainty_range * rng.random(size))
+    variation_team2 = stats[team2, UNCERTAINTY] * (p['uncertainty_low'] + uncertainty_range * rng.random(size))
+
+    score_range = p['score_high'] - p['score_low']
+    team1_score = (score_variation_team1 - variation_team1) * (p['score_low'] + score_range * rng.random(size))
+    team2_score = (score_variation_team2 - variation_team2) * (p['score_low'] + score_range * rng.random(size))
+
+    return team1_score, team2_score
+
+
+def simulate_rated_games(probabilities, team1, team2, rng, games=1):
+    # Rating model version of simulate_games: probabilities[i, j] is the chance team i beats team j in a game,
+    # and the winner scores 1
+    team1_won = rng.random((len(team1), games)) < probabilities[team1, team2][:, None]
+    return team1_won.astype(np.float64), (~team1_won).astype(np.float64)
+
+
+def simulate_series(stats, team1, team2, wins_needed, rng, probabilities=None, parameters=None):
+    # Games are played in blocks, and only for the series still undecided. A block is as many games as the
+    # closest undecided series still needs at least, so no series can be decided before a block's last game and
+    # nothing is simulated after a series ends. Returns (team1 won series, team1 games, team2 games) as arrays.
+    team1_games = np.zeros(len(team1), dtype=np.int64)
+    team2_games = np.zeros(len(team1), dtype=np.int64)
+    undecided = np.arange(len(team1))
+    while len(undecided):
+        games = int(wins_needed - np.maximum(team1_games[undecided], team2_games[undecided]).max())
+        if probabilities is None:
+            team1_score, team2_score = simulate_games(stats, team1[undecided], team2[undecided], rng, games, parameters)
+        else:
+            team1_score, team2_score = simulate_rated_games(probabilities, team1[undecided], team2[undecided], rng, games)
+
+        team1_games[undecided] += (team1_score > team2_score).sum(axis=1)
+        team2_games[undecided] += (team2_score > team1_score).sum(axis=1)
+        undecided = undecided[(team1_games[undecided] < wins_needed) & (team2_games[undecided] < wins_needed)]
+    return team1_games == wins_needed, team1_games, team2_games
+
+
+def series_totals(stats, team1, team2, wins_needed, iterations, rng, batch_size=200000, probabilities=None, parameters=None):
+    # Totals for one matchup played iterations times: team1 series wins, team2 series wins, team1 games, team2 games.
+    # Runs in blocks of batch_size series so memory stays flat for any iteration count.
+    totals = np.zeros(4, dtype=np.int64)
+    done = 0
+    while done < iterations:
+        size = min(batch_size, iterations - done)
+        team1_won, team1_games, team2_games = simulate_series(stats, np.full(size, team1), np.full(size, team2), wins_needed, rng, probabilities, parameters)
+        wins = int(team1_won.sum())
+        totals += (wins, size - wins, int(team1_games.sum()), int(team2_games.sum()))
+        done += size
+    return totals
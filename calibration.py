@@ -0,0 +1,168 @@
+import csv
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import batch
+import progress
+from kernels import UNCERTAINTY, team_arrays
+from outcome_models import DEFAULT_GAME_PARAMETERS, REGION_PARAMETERS
+from players import REGION_UNCERTAINTY
+
+# Fits the score model's constants and the regional uncertainty offsets to historical series results by maximum
+# likelihood. A candidate parameter set is scored by simulating every historical matchup with batch.simulate_games
+# to estimate its game win probability, then taking the likelihood of the real series scores given those
+# probabilities. The same seed is used for every candidate (common random numbers), so differences between
+# candidates come from the parameters and not from sampling noise. Candidates are searched with the
+# cross-entropy method, one generation at a time, across a process pool.
+
+# score_high, form_high and uncertainty_high stay fixed, since a game's winner only depends on which score is higher:
+#   - scaling score_low and score_high together scales every score alike, so only their ratio can be fitted
+#   - form is the base score times a factor between form_low and form_high, and the base score is linear in the
+#     three weights, so scaling both form bounds by c and the weights by 1 / c gives the same games
+#   - scaling the three weights and both uncertainty bounds together scales the base score and the variation
+#     alike, so uncertainty_low is only fitted relative to uncertainty_high
+FITTED_PARAMETERS = ['goal_weight', 'assist_weight', 'save_weight', 'form_low', 'uncertainty_low', 'score_low',
+                     'me_uncertainty', 'sam_uncertainty']
+
+BOUNDS = {
+    'goal_weight': (0.0, 3.0),
+    'assist_weight': (0.0, 0.5),
+    'save_weight': (0.0, 0.3),
+    'form_low': (0.0, 1.05),
+    'uncertainty_low': (0.0, 1.0),
+    'score_low': (0.0, 100.0),
+    'me_uncertainty': (-0.1, 0.2),
+    'sam_uncertainty': (-0.1, 0.2),
+}
+
+# Simulated games per historical matchup when estimating its game win probability
+SAMPLES_PER_MATCHUP = 2000
+
+# Per-process data, filled by init_worker in the pool processes
+_state = {}
+
+
+def read_series_results(csv_file):
+    # Historical series as 'Team 1', 'Team 2', 'Team 1 Games', 'Team 2 Games' rows; the series length is taken
+    # from the winner's game count
+    with open(csv_file, mode='r') as file:
+        return [(row['Team 1'], row['Team 2'], int(row['Team 1 Games']), int(row['Team 2 Games']))
+                for row in csv.DictReader(file)]
+
+
+def prepare(team_stats, team_regions, results):
+    # Arrays for the evaluation. read_team_data's default regional offsets are taken back out of the uncertainty
+    # so each candidate can add its own.
+    teams = sorted({team for result in results for team in result[:2]})
+    stats = team_arrays(team_stats, teams)
+    regions = [team_regions.get(team, '') for team in teams]
+    for team_id, region in enumerate(regions):
+        stats[team_id, UNCERTAINTY] -= REGION_UNCERTAINTY.get(region, 0.0)
+
+    team_ids = {team: team_id for team_id, team in enumerate(teams)}
+    matchups = sorted({(team_ids[team1], team_ids[team2]) for team1, team2, _, _ in results})
+    matchup_ids = {matchup: matchup_id for matchup_id, matchup in enumerate(matchups)}
+    return {
+        'teams': teams,
+        'stats': stats,
+        'regions': {region: np.array([r == region for r in regions]) for region in REGION_PARAMETERS},
+        'team1': np.array([team1 for team1, _ in matchups], dtype=np.int64),
+        'team2': np.array([team2 for _, team2 in matchups], dtype=np.int64),
+        'series_matchup': np.array([matchup_ids[(team_ids[team1], team_ids[team2])] for team1, team2, _, _ in results], dtype=np.int64),
+        'team1_games': np.array([result[2] for result in results], dtype=np.int64),
+        'team2_games': np.array([result[3] for result in results], dtype=np.int64),
+    }
+
+
+def game_probabilities(data, parameters, samples=SAMPLES_PER_MATCHUP, seed=0):
+    # Probability that team1 wins a game, for every historical matchup. Tied games are replayed in the engines,
+    # so they're left out, and add-one smoothing keeps the probabilities off 0 and 1.
+    stats = data['stats'].copy()
+    for region, mask in data['regions'].items():
+        stats[mask, UNCERTAINTY] += parameters[REGION_PARAMETERS[region]]
+    team1_score, team2_score = batch.simulate_games(stats, data['team1'], data['team2'], np.random.default_rng(seed), samples, parameters)
+    team1_wins = (team1_score > team2_score).sum(axis=1)
+    team2_wins = (team2_score > team1_score).sum(axis=1)
+    return (team1_wins + 1) / (team1_wins + team2_wins + 2)
+
+
+def series_win_probabilities(p, wins_needed):
+    # Chance team1 wins a first-to-wins_needed series when it wins each game with probability p
+    total = np.zeros_like(p)
+    for losses in range(int(wins_needed.max())):
+        ways = np.array([math.comb(w - 1 + losses, losses) for w in wins_needed], dtype=np.float64)
+        total += np.where(losses < wins_needed, ways * p ** wins_needed * (1 - p) ** losses, 0.0)
+    return total
+
+
+def score(data, parameters, samples=SAMPLES_PER_MATCHUP, seed=0):
+    # Negative log-likelihood of the exact series scores per series (what the fit minimises),
+    # and log loss and Brier score of the series winner
+    p = game_probabilities(data, parameters, samples, seed)[data['series_matchup']]
+    team1_games, team2_games = data['team1_games'], data['team2_games']
+    team1_won = team1_games > team2_games
+    wins_needed = np.maximum(team1_games, team2_games)
+
+    # Orderings of the loser's games before the winner's last one
+    log_ways = np.array([math.log(math.comb(w - 1 + l, l)) for w, l in zip(wins_needed, np.minimum(team1_games, team2_games))])
+    log_likelihood = log_ways + team1_games * np.log(p) + team2_games * np.log(1 - p)
+
+    series_p = np.clip(series_win_probabilities(p, wins_needed), 1e-12, 1 - 1e-12)
+    return {
+        'negative_log_likelihood': float(-log_likelihood.mean()),
+        'log_loss': float(-np.mean(np.where(team1_won, np.log(series_p), np.log(1 - series_p)))),
+        'brier': float(np.mean((series_p - team1_won) ** 2)),
+    }
+
+
+def init_worker(data, samples, seed, counter):
+    _state.update(data=data, samples=samples, seed=seed)
+    progress.init_worker(counter)
+
+
+def candidate_objective(values):
+    parameters = dict(DEFAULT_GAME_PARAMETERS, **dict(zip(FITTED_PARAMETERS, values)))
+    progress.advance()
+    if parameters['uncertainty_high'] < parameters['uncertainty_low']:
+        return math.inf
+    return score(_state['data'], parameters, _state['samples'], _state['seed'])['negative_log_likelihood']
+
+
+def calibrate(data, start=None, generations=25, population=32, elite=8, samples=SAMPLES_PER_MATCHUP, workers=None, seed=0):
+    # Cross-entropy method: sample a generation around the current mean, keep the elite, move the mean and
+    # shrink the spread towards them. The best candidate so far is carried into every generation.
+    start = dict(DEFAULT_GAME_PARAMETERS, **(start or {}))
+    low = np.array([BOUNDS[name][0] for name in FITTED_PARAMETERS])
+    high = np.array([BOUNDS[name][1] for name in FITTED_PARAMETERS])
+    mean = np.array([start[name] for name in FITTED_PARAMETERS])
+    spread = (high - low) / 4
+    rng = np.random.default_rng(random.getrandbits(64))
+    best_values, best_objective = mean, math.inf
+
+    workers = workers or os.cpu_count() or 1
+    reporter = progress.ProgressReporter(generations * population, label="Candidates Evaluated")
+    with reporter, ProcessPoolExecutor(workers, initializer=init_worker, initargs=(data, samples, seed, reporter.worker_counter())) as pool:
+        for _ in range(generations):
+            candidates = np.clip(rng.normal(mean, spread, (population, len(FITTED_PARAMETERS))), low, high)
+            candidates[0] = best_values
+            objectives = np.array(list(pool.map(candidate_objective, candidates, chunksize=max(1, population // (4 * workers)))))
+
+            order = np.argsort(objectives)
+            if objectives[order[0]] < best_objective:
+                best_values, best_objective = candidates[order[0]], objectives[order[0]]
+            elites = candidates[order[:elite]]
+            mean = elites.mean(axis=0)
+            # A floor on the spread so the search doesn't collapse before it has converged
+            spread = np.maximum(elites.std(axis=0), (high - low) * 0.002)
+
+    fitted = dict(start, **{name: float(value) for name, value in zip(FITTED_PARAMETERS, best_values)})
+    return {
+        'parameters': fitted,
+        'start_parameters': start,
+        'fitted_scores': score(data, fitted, samples, seed),
+        'start_scores': score(data, start, samples, seed),
+    }
@@ -0,0 +1,79 @@
+import csv
+import math
+import os
+
+import openpyxl as op
+
+# Export of result tables to CSV or xlsx. A table is a header plus an iterable of rows, and rows are written as they
+# come: through csv.writer for CSV, and through an openpyxl write-only workbook for xlsx, which streams rows to a
+# temporary file instead of keeping a worksheet in memory. A generator of rows can therefore be written while it's
+# still being simulated, and nothing has to be collected into a DataFrame first.
+
+EXPORT_FORMATS = ['csv', 'xlsx']
+
+# Rows per xlsx sheet (Excel's limit); longer tables carry on in further sheets, each with the header
+XLSX_MAX_ROWS = 1048576
+
+# Excel's limit on sheet name length
+SHEET_NAME_LENGTH = 31
+
+
+def cell(value):
+    # Missing values (NaN) become empty cells, which both formats can hold
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def write_csv(path, header, rows):
+    with open(path, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows([cell(value) for value in row] for row in rows)
+
+
+def write_xlsx(path, tables):
+    # tables is {sheet name: (header, rows)}, written as one workbook in order
+    workbook = op.Workbook(write_only=True)
+    for name, (header, rows) in tables.items():
+        part = 1
+        sheet = workbook.create_sheet(name[:SHEET_NAME_LENGTH])
+        sheet.append(header)
+        written = 1
+        for row in rows:
+            if written == XLSX_MAX_ROWS:
+                part += 1
+                suffix = f" ({part})"
+                sheet = workbook.create_sheet(name[:SHEET_NAME_LENGTH - len(suffix)] + suffix)
+                sheet.append(header)
+                written = 1
+            sheet.append([cell(value) for value in row])
+            written += 1
+    workbook.save(path)
+
+
+def write_tables(directory, name, tables, output_format='csv'):
+    # CSV gets one file per table (name.csv for a single table, name_<table>.csv otherwise); xlsx gets one workbook
+    # with a sheet per table. Returns the paths written.
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {output_format!r}, expected one of {EXPORT_FORMATS}")
+    directory = directory or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    if output_format == 'xlsx':
+        path = os.path.join(directory, f"{name}.xlsx")
+        write_xlsx(path, tables)
+        return [path]
+
+    paths = []
+    for table, (header, rows) in tables.items():
+        path = os.path.join(directory, f"{name}.csv" if len(tables) == 1 else f"{name}_{table}.csv")
+        write_csv(path, header, rows)
+        paths.append(path)
+    return paths
+
+
+def dataframe_rows(df, index=False):
+    # Rows of a DataFrame as plain Python values, one at a time
+    for row in df.itertuples(index=index, name=None):
+        yield [value.item() if hasattr(value, 'item') else value for value in row]
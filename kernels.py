@@ -0,0 +1,178 @@
+import os
+
+import numpy as np
+
+# numba is optional. Without it the kernels below are still valid Python, but select_backend()
+# steers callers back to the plain functions in main.py, which are faster than uncompiled numpy scalar code.
+try:
+    import numba
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+    # Parallel kernels on the default tbb layer leave the process hanging at exit once a process pool has
+    # forked after them; the workqueue layer doesn't, and nothing here launches parallel kernels from two threads
+    if 'NUMBA_THREADING_LAYER' not in os.environ:
+        numba.config.THREADING_LAYER = 'workqueue'
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+BACKENDS = ['python', 'numba']
+
+# Column order of the stats array built by team_arrays
+GOALS, ASSISTS, SAVES, SHOTS, UNCERTAINTY = range(5)
+STAT_COLUMNS = ['Goals', 'Assists', 'Saves', 'Shots', 'Uncertainty']
+
+
+def select_backend(name):
+    if name == 'numba' and not NUMBA_AVAILABLE:
+        print("numba is not installed, falling back to the python backend")
+        return 'python'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name!r}, expected one of {BACKENDS}")
+    return name
+
+
+def team_arrays(team_stats, teams):
+    # Team ids are positions in teams; row i of the array holds the stats of teams[i]
+    stats = np.empty((len(teams), len(STAT_COLUMNS)), dtype=np.float64)
+    for i, team in enumerate(teams):
+        for j, stat in enumerate(STAT_COLUMNS):
+            stats[i, j] = team_stats[team][stat]
+    return stats
+
+
+@njit(cache=True)
+def seed(value):
+    # numba keeps its own generator state, separate from numpy's and the random module's
+    np.random.seed(value)
+
+
+@njit(cache=True)
+def simulate_game(stats, team1, team2):
+    # Same formula as main.simulate_game, over rows of the stats array
+    base_score_team1 = (stats[team1, GOALS] / stats[team1, SHOTS]) * 0.9 + stats[team1, ASSISTS] * 0.065 - stats[team2, SAVES] * 0.035
+    base_score_team2 = (stats[team2, GOALS] / stats[team2, SHOTS]) * 0.9 + stats[team2, ASSISTS] * 0.065 - stats[team1, SAVES] * 0.035
+
+    score_variation_team1 = np.random.uniform(base_score_team1 * 0.85, base_score_team1 * 1.05)
+    score_variation_team2 = np.random.uniform(base_score_team2 * 0.85, base_score_team2 * 1.05)
+
+    variation_team1 = np.random.uniform(stats[team1, UNCERTAINTY] * 0.25, stats[team1, UNCERTAINTY] * 0.85)
+    variation_team2 = np.random.uniform(stats[team2, UNCERTAINTY] * 0.25, stats[team2, UNCERTAINTY] * 0.85)
+
+    team1_score = np.random.uniform(50 * (score_variation_team1 - variation_team1), 100 * (score_variation_team1 - variation_team1))
+    team2_score = np.random.uniform(50 * (score_variation_team2 - variation_team2), 100 * (score_variation_team2 - variation_team2))
+
+    return team1_score, team2_score
+
+
+@njit(cache=True)
+def simulate_series(stats, team1, team2, wins_needed):
+    # wins_needed is 3 for a BO5 and 4 for a BO7. Returns winner, loser, team1 games, team2 games
+    team1_game_win, team2_game_win = 0, 0
+    while True:
+        team1_score, team2_score = simulate_game(stats, team1, team2)
+
+        if team1_score > team2_score:
+            team1_game_win += 1
+        elif team2_score > team1_score:
+            team2_game_win += 1
+
+        if team1_game_win == wins_needed:
+            return team1, team2, team1_game_win, team2_game_win
+        elif team2_game_win == wins_needed:
+            return team2, team1, team1_game_win, team2_game_win
+
+
+@njit(cache=True)
+def double_elim_champion(stats, seeds):
+    # 16-team bracket with the same progression as main.simulate_double_elim_tournament,
+    # including where upper bracket losers drop in and which lower bracket rounds get reshuffled
+    upper_round2 = np.empty(8, dtype=np.int64)
+    lower_round1 = np.empty(8, dtype=np.int64)
+    for match in range(8):
+        winner, loser, _, _ = simulate_series(stats, seeds[2 * match], seeds[2 * match + 1], 4)
+        upper_round2[match] = winner
+        lower_round1[match] = loser
+
+    lower_round2 = np.empty(8, dtype=np.int64)
+    for match in range(4):
+        winner, _, _, _ = simulate_series(stats, lower_round1[2 * match], lower_round1[2 * match + 1], 4)
+        lower_round2[match] = winner
+    np.random.shuffle(lower_round2[:4])
+
+    upper_round3 = np.empty(4, dtype=np.int64)
+    for match in range(4):
+        winner, loser, _, _ = simulate_series(stats, upper_round2[2 * match], upper_round2[2 * match + 1], 4)
+        upper_round3[match] = winner
+        lower_round2[4 + match] = loser
+
+    lower_round3 = np.empty(4, dtype=np.int64)
+    for match in range(4):
+        winner, _, _, _ = simulate_series(stats, lower_round2[2 * match], lower_round2[2 * match + 1], 4)
+        lower_round3[match] = winner
+    np.random.shuffle(lower_round3)
+
+    upper_round4 = np.empty(2, dtype=np.int64)
+    lower_round4 = np.empty(4, dtype=np.int64)
+    for match in range(2):
+        winner, loser, _, _ = simulate_series(stats, upper_round3[2 * match], upper_round3[2 * match + 1], 4)
+        upper_round4[match] = winner
+        lower_round4[match] = loser
+
+    for match in range(2):
+        winner, _, _, _ = simulate_series(stats, lower_round3[2 * match], lower_round3[2 * match + 1], 4)
+        lower_round4[2 + match] = winner
+    np.random.shuffle(lower_round4)
+
+    upper_champion, upper_final_loser, _, _ = simulate_series(stats, upper_round4[0], upper_round4[1], 4)
+
+    lower_round5 = np.empty(2, dtype=np.int64)
+    for match in range(2):
+        winner, _, _, _ = simulate_series(stats, lower_round4[2 * match], lower_round4[2 * match + 1], 4)
+        lower_round5[match] = winner
+
+    lower_round5_winner, _, _, _ = simulate_series(stats, lower_round5[0], lower_round5[1], 4)
+    lower_champion, _, _, _ = simulate_series(stats, upper_final_loser, lower_round5_winner, 4)
+
+    champion, _, _, _ = simulate_series(stats, upper_champion, lower_champion, 4)
+    return champion
+
+
+@njit(cache=True)
+def series_counts(stats, team1, team2, wins_needed, iterations):
+    totals = np.zeros(4, dtype=np.int64)
+    for _ in range(iterations):
+        winner, _, team1_game_win, team2_game_win = simulate_series(stats, team1, team2, wins_needed)
+        if winner == team1:
+            totals[0] += 1
+        else:
+            totals[1] += 1
+        totals[2] += team1_game_win
+        totals[3] += team2_game_win
+    return totals
+
+
+@njit(cache=True)
+def double_elim_win_counts(stats, seeds, iterations):
+    counts = np.zeros(stats.shape[0], dtype=np.int64)
+    for _ in range(iterations):
+        counts[double_elim_champion(stats, seeds)] += 1
+    return counts
+
+
+@njit(cache=True, parallel=True)
+def double_elim_win_counts_batch(stats_batch, seeds, iterations, seed_value):
+    # Win counts for every scenario in stats_batch (scenarios, teams, stats), each starting from the same seed so
+    # they share random numbers. Scenarios run in parallel; numba keeps a generator per thread, so the reseed at
+    # the start of each scenario only affects that scenario.
+    counts = np.zeros((stats_batch.shape[0], stats_batch.shape[1]), dtype=np.int64)
+    for scenario in prange(stats_batch.shape[0]):
+        np.random.seed(seed_value)
+        for _ in range(iterations):
+            counts[scenario, double_elim_champion(stats_batch[scenario], seeds)] += 1
+    return counts
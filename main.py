@@ -1,1144 +1,2050 @@
-import csv
-import random
-import pandas as pd
-import openpyxl as op
-
-def get_team_names(csv_file):
-    team_names = []
-    with open(csv_file, mode='r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            team = row['Team Name']
-            if team not in team_names:
-                team_names.append(team)
-
-    return team_names
-
-def get_ordered_teams_from_csv(file_path):
-    # Read the Excel file
-    df = pd.read_csv(file_path)
-
-    # Assuming the teams are sorted by their rank in the Excel file.
-    # If not, sort them here. Replace 'Rank' with the actual rank column name if different.
-    # df.sort_values(by='Rank', inplace=True)
-
-    team_names = df['Team Name'].tolist()
-
-    # Order the teams as per specified sequence
-    ordered_teams = [
-        team_names[0],   # Rank 1
-        team_names[15],  # Rank 16
-        team_names[7],   # Rank 8
-        team_names[8],   # Rank 9
-        team_names[3],   # Rank 4
-        team_names[12],  # Rank 13
-        team_names[4],   # Rank 5
-        team_names[11],  # Rank 12
-        team_names[1],   # Rank 2
-        team_names[14],  # Rank 15
-        team_names[6],   # Rank 7
-        team_names[10],  # Rank 10
-        team_names[2],   # Rank 3
-        team_names[13],  # Rank 14
-        team_names[5],   # Rank 6
-        team_names[9]    # Rank 10
-    ]
-    return ordered_teams
-
-def set_matchups(teams_list):
-    all_matchups = []
-    matchup = []
-    for team in teams_list:
-        matchup.append(team)
-        if len(matchup) == 2:
-            all_matchups.append(matchup)
-            matchup = []
-    return all_matchups
-
-def read_team_data(csv_file):
-    team_stats = {}
-    with open(csv_file, mode='r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            team = row['Team Name']
-            if team not in team_stats:
-                team_stats[team] = {
-                    'Goals': 0,
-                    'Assists': 0,
-                    'Saves': 0,
-                    'Shots': 0,
-                    'Uncertainty': 0,
-                    'Players': 0
-                }
-
-            # Aggregate stats for each team
-            team_stats[team]['Goals'] += float(row['Goals Per Game'])
-            team_stats[team]['Assists'] += float(row['Assists Per Game'])
-            team_stats[team]['Saves'] += float(row['Saves Per Game'])
-            team_stats[team]['Shots'] += float(row['Shots Per Game'])
-            team_stats[team]['Uncertainty'] += float(row['Uncertainty Factor'])
-            team_stats[team]['Players'] += 1
-
-            # Increase Uncertainty for teams from the 'ME' region
-            if 'Region' in row and row['Region'] == 'ME':
-                team_stats[team]['Uncertainty'] += 0.015
-
-            if 'Region' in row and row['Region'] == 'SAM':
-                team_stats[team]['Uncertainty'] += 0.010
-
-    # Calculate average stats for each team
-    for team in team_stats:
-        # print(f"Stats for \033[1m{team}\033[0m:")
-        for stat in ['Goals', 'Assists', 'Saves', 'Shots', 'Uncertainty']:
-            if team_stats[team]['Players'] > 0:  # Check to avoid division by zero
-                team_stats[team][stat] /= team_stats[team]['Players']
-                # print(f"\t{stat}: {team_stats[team][stat]:.3f}")  # Formatting numbers to three decimal places
-            else:
-                print(f"  No players found for {team}, unable to calculate averages.")
-        # print("-" * 30)
-
-    return team_stats
-
-def calculate_composite_score(team_stats):
-    # Adjust these weights according to how much you value each stat
-    weights = {
-        'Goals': 0.40,
-        'Assists': 0.25,
-        'Saves': 0.25,
-        'Shots': 0.10,
-        'Uncertainty': -0.5  # Negative weight if higher uncertainty is worse
-    }
-
-    composite_scores = []
-    for team, stats in team_stats.items():
-        goals_per_shot = ((stats['Goals'] * (1 + weights['Goals'])) / (stats['Shots'] * (1 + weights['Shots'])))
-        score = goals_per_shot + (stats['Assists'] * (1 + weights['Assists'])) + (stats['Saves'] * (1 + weights['Saves']))
-        final_score = abs(score / (stats['Uncertainty'] * weights['Uncertainty']))
-        composite_scores.append(final_score)
-
-    return composite_scores
-
-def write_rankings_to_csv(composite_scores, team_names):
-    # Create a DataFrame from the composite scores and team names
-    df = pd.DataFrame({
-        'Team Name': team_names,
-        'Composite Score': composite_scores
-    })
-
-    # Sort the DataFrame by composite score
-    df.sort_values(by='Composite Score', ascending=False, inplace=True)
-
-    # Write the DataFrame to a CSV file
-    df.to_csv('rankings.csv', index=False)
-
-    print(df.to_string(index=False))
-
-def simulate_game(team1, team2, team_stats):
-    # Base score calculation
-    base_score_team1 = (team_stats[team1]['Goals'] / team_stats[team1]['Shots']) * 0.9 + team_stats[team1]['Assists'] * 0.065 - team_stats[team2]['Saves'] * 0.035
-    base_score_team2 = (team_stats[team2]['Goals'] / team_stats[team2]['Shots']) * 0.9 + team_stats[team2]['Assists'] * 0.065 - team_stats[team1]['Saves'] * 0.035
-
-    # Random variation based on Base score calculation
-    score_variation_team1 = random.uniform(base_score_team1*0.85, base_score_team1*1.05)
-    score_variation_team2 = random.uniform(base_score_team2*0.85, base_score_team2*1.05)
-
-    # Random variation based on Uncertainty
-    variation_team1 = random.uniform(team_stats[team1]['Uncertainty']*0.25, team_stats[team1]['Uncertainty']*0.85)
-    variation_team2 = random.uniform(team_stats[team2]['Uncertainty']*0.25, team_stats[team2]['Uncertainty']*0.85)
-
-    # Final score calculation with reduced random variation and minimum threshold
-    team1_score = random.uniform(50*(score_variation_team1 - variation_team1), 100*(score_variation_team1 - variation_team1))
-    team2_score = random.uniform(50*(score_variation_team2 - variation_team2), 100*(score_variation_team2 - variation_team2))
-
-    # # Print results
-    # if team1_score > team2_score:
-    #     print(f" \033[1m{team1_score:.3f}\033[0m - {team2_score:.3f}")
-    # elif team2_score > team1_score:
-    #     print(f" {team1_score:.3f} - \033[1m{team2_score:.3f}\033[0m")
-
-    return team1_score, team2_score
-
-def simulate_series_BO5(team1, team2, team_stats):
-    team1_game_win, team2_game_win = 0, 0
-
-    for _ in range(1, 6):
-        team1_score, team2_score = simulate_game(team1, team2, team_stats)
-
-        if team1_score > team2_score:
-            team1_game_win += 1
-        elif team2_score > team1_score:
-            team2_game_win += 1
-
-        if team1_game_win == 3:
-            return 1, 0, team1_game_win, team2_game_win, team1, team2  # Team 1 wins this series
-        elif team2_game_win == 3:
-            return 0, 1, team1_game_win, team2_game_win, team2, team1  # Team 2 wins this series
-
-def simulate_series_BO7(team1, team2, team_stats):
-    team1_game_win, team2_game_win = 0, 0
-
-    for _ in range(1, 8):
-        team1_score, team2_score = simulate_game(team1, team2, team_stats)
-
-        if team1_score > team2_score:
-            team1_game_win += 1
-        elif team2_score > team1_score:
-            team2_game_win += 1
-
-        if team1_game_win == 4:
-            return 1, 0, team1_game_win, team2_game_win, team1, team2  # Team 1 wins this series
-        elif team2_game_win == 4:
-            return 0, 1, team1_game_win, team2_game_win, team2, team1  # Team 2 wins this series
-
-def simulate_series_multiple_times(team1, team2, team_stats):
-    num_iterations = int(input("Number of Iterations: "))
-
-    total_team1_series_win, total_team2_series_win = 0, 0
-    total_team1_game_wins, total_team2_game_wins = 0, 0
-
-    max_length = max(len(team1), len(team2)) + 3  # Maximum length considering the team name and score
-
-    for j in range(1, num_iterations + 1):
-        team1_series_win, team2_series_win, team1_game_wins, team2_game_wins, _, _ = simulate_series_BO7(team1, team2, team_stats)
-
-        total_team1_series_win += team1_series_win
-        total_team2_series_win += team2_series_win
-        total_team1_game_wins += team1_game_wins
-        total_team2_game_wins += team2_game_wins
-
-        team1_text = f"{team1} {team1_game_wins}"
-        team2_text = f"{team2_game_wins} {team2}"
-        padding_left = max_length - len(team1_text)
-        padding_right = max_length - len(team2_text)
-
-        if team1_series_win == 1:
-            print(f"Series {j}: {team1_text} {' ' * padding_left}-{' ' * padding_right} {team2_text}")
-        elif team2_series_win == 1:
-            print(f"Series {j}: {team1_text} {' ' * padding_left}-{' ' * padding_right} {team2_text}")
-
-    print("*" * 50)
-    print(f"{team1} {total_team1_series_win} ({total_team1_game_wins})")
-    print(f"{team2} {total_team2_series_win} ({total_team2_game_wins})")
-
-def simulate_single_elim_tournament(teams, team_stats):
-    round_num = 1
-
-    # Remaining teams
-    remaining_teams = teams
-
-    while len(remaining_teams) > 2:
-        # Set matchups for current round
-        all_matchups = set_matchups(remaining_teams)
-        print(f"\nRound {round_num} matchups:\n")
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            if team1_game_win == 4:
-                print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-                # print(f"Winner: \033[1m\033[96m {winner}\033[0m")
-            elif team2_game_win == 4:
-                print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-                # print(f"Winner: \033[1m\033[93m {winner}\033[0m")
-
-            # Remove loser and winner from remaining teams list
-            remaining_teams.remove(loser)
-            remaining_teams.remove(winner)
-
-            # Add winner back to remaining teams list but at the end of the list
-            remaining_teams.append(winner)
-
-            # print("- " * 30)
-        print("-=" * 40)
-        round_num += 1
-
-    # Set Grand Finals matchup
-    team1, team2 = remaining_teams[0], remaining_teams[1]
-    print(f"\nGrand Finals matchup:")
-    # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-    # print("- " * 30)
-    _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-    if team1_game_win == 4:
-        print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-        print(f"Winner: \033[1m\033[96m {winner}\033[0m")
-    elif team2_game_win == 4:
-        print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-        print(f"Winner: \033[1m\033[93m {winner}\033[0m")
-
-def simulate_double_elim_tournament(teams, team_stats):
-    upper_bracket_round_num = 1
-    lower_bracket_round_num = 1
-
-    upper_bracket_teams = teams.copy()
-    remaining_teams = teams.copy()
-    lower_bracket_team_round1 = []
-    lower_bracket_team_round2 = []
-    lower_bracket_team_round3 = []
-    lower_bracket_team_round4 = []
-    lower_bracket_team_round5 = []
-    lower_bracket_team_final = []
-
-    # Upper Bracket
-    while len(remaining_teams) > 2:
-        all_matchups_winner = set_matchups(upper_bracket_teams)
-
-        # if upper_bracket_round_num <= 4:
-        #     print(f"\nUpper Bracket Round {upper_bracket_round_num} matchups:")
-
-        for matchup in all_matchups_winner:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            if upper_bracket_round_num == 1:
-                upper_bracket_teams.remove(loser)
-                lower_bracket_team_round1.append(loser)
-            elif upper_bracket_round_num == 2:
-                upper_bracket_teams.remove(loser)
-                lower_bracket_team_round2.append(loser)
-            elif upper_bracket_round_num == 3:
-                upper_bracket_teams.remove(loser)
-                lower_bracket_team_round4.append(loser)
-            elif upper_bracket_round_num == 4:
-                upper_bracket_teams.remove(loser)
-                lower_bracket_team_final.append(loser)
-
-        if upper_bracket_round_num <= 4:
-            # print("- " * 30)
-            upper_bracket_round_num += 1
-
-        # Loser Bracket
-        if lower_bracket_round_num == 1:
-            all_matchups_lower = set_matchups(lower_bracket_team_round1)
-        elif lower_bracket_round_num == 2:
-            all_matchups_lower = set_matchups(lower_bracket_team_round2)
-        elif lower_bracket_round_num == 3:
-            all_matchups_lower = set_matchups(lower_bracket_team_round3)
-        elif lower_bracket_round_num == 4:
-            all_matchups_lower = set_matchups(lower_bracket_team_round4)
-        elif lower_bracket_round_num == 5:
-            all_matchups_lower = set_matchups(lower_bracket_team_round5)
-        elif lower_bracket_round_num == 6:
-            all_matchups_lower = set_matchups(lower_bracket_team_final)
-
-        # print(f"\nLower Bracket Round {lower_bracket_round_num} matchups:")
-
-        for matchup in all_matchups_lower:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            if lower_bracket_round_num == 1:
-                lower_bracket_team_round1.remove(loser)
-                lower_bracket_team_round2.append(winner)
-                lower_bracket_team_round1.remove(winner)
-                remaining_teams.remove(loser)
-            elif lower_bracket_round_num == 2:
-                lower_bracket_team_round2.remove(loser)
-                lower_bracket_team_round3.append(winner)
-                lower_bracket_team_round2.remove(winner)
-                remaining_teams.remove(loser)
-            elif lower_bracket_round_num == 3:
-                lower_bracket_team_round3.remove(loser)
-                lower_bracket_team_round4.append(winner)
-                lower_bracket_team_round3.remove(winner)
-                remaining_teams.remove(loser)
-            elif lower_bracket_round_num == 4:
-                lower_bracket_team_round4.remove(loser)
-                lower_bracket_team_round5.append(winner)
-                lower_bracket_team_round4.remove(winner)
-                remaining_teams.remove(loser)
-            elif lower_bracket_round_num == 5:
-                lower_bracket_team_round5.remove(loser)
-                lower_bracket_team_final.append(winner)
-                lower_bracket_team_round5.remove(winner)
-                remaining_teams.remove(loser)
-            elif lower_bracket_round_num == 6:
-                lower_bracket_team_final.remove(loser)
-                remaining_teams.remove(loser)
-
-        if lower_bracket_round_num == 1:
-            random.shuffle(lower_bracket_team_round2)
-        elif lower_bracket_round_num == 2:
-            random.shuffle(lower_bracket_team_round3)
-        elif lower_bracket_round_num == 3:
-            random.shuffle(lower_bracket_team_round4)
-
-        # print("*" * 50)
-        lower_bracket_round_num += 1
-
-        if lower_bracket_round_num == 7:
-                break
-
-    # Grand Finals
-    # print(f"\nGrand Finals:")
-    team1 = upper_bracket_teams[0]
-    # print(lower_bracket_team_final)
-    team2 = lower_bracket_team_final[0]
-    # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-    _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-    # print(f"\033[1m\033[96m{team1}\033[0m {team1_game_win} - \033[1m{team2_game_win} \033[93m{team2}\033[0m")
-    # # print(f"Grand Champ: \033[1m {winner}\033[0m")
-    # print("\/" * 100)
-
-    return winner
-
-def simulate_double_elim_tournament_multiple_times(teams, team_stats):
-    num_iterations = int(input("Number of Iterations: "))
-    tournaments_done = 0
-    total_wins = {teams: 0 for teams in teams}
-
-    for _ in range(num_iterations):
-        winner = simulate_double_elim_tournament(teams, team_stats)
-        total_wins[winner] += 1
-        tournaments_done += 1
-        print(f"\rTournaments Done: {tournaments_done}/{num_iterations}", end="")
-    print()
-
-    win_percentages = {team: (wins / num_iterations) * 100 for team, wins in total_wins.items()}
-
-    # Sort the win percentages in descending order
-    sorted_win_percentages = sorted(win_percentages.items(), key=lambda x: x[1], reverse=True)
-
-    print("\nWin Percentages: ")
-    for team, win_percentage in sorted_win_percentages:
-        tourney_wins = total_wins[team]
-        print(f"{team:<7.5} {win_percentage:.2f}% ({tourney_wins} wins)")
-
-def group_stage(teams, team_stats):
-    group_a, group_b, group_c, group_d = [], [], [], []
-
-    for team in teams:
-        if team in teams[:4]:
-            group_a.append(team)
-        elif team in teams[4:8]:
-            group_b.append(team)
-        elif team in teams[8:12]:
-            group_c.append(team)
-        elif team in teams[12:16]:
-            group_d.append(team)
-
-    # print(f"Group A: {group_a}")
-    # print(f"Group B: {group_b}")
-    # print(f"Group C: {group_c}")
-    # print(f"Group D: {group_d}")
-
-    standings = {team: {'series_wins': 0, 'series_losses': 0, 'game_wins': 0, 'game_losses': 0, 'game_differential': 0} for team in group_a}
-    # Group A Matches and Standings
-    # print("\nGroup A:")
-    for i in range(len(group_a)):
-        for j in range(i + 1, len(group_a)):
-            team1 = group_a[i]
-            team2 = group_a[j]
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO5(team1, team2, team_stats)
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-            # if team1_game_win == 3:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 3:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-    # print("-" * 30)
-
-    sorted_standings_a = sorted(standings.items(), key=lambda x: (x[1]['series_wins'], x[1]['game_differential'], x[1]['game_wins']), reverse=True)
-
-    # for index, (team, record) in enumerate(sorted_standings_a):
-    #     if index < 2:  # For the first and second place teams
-    #         print(f"\033[92m\033[01m{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}] \033[0m")
-    #     else:
-    #         print(f"{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}]")
-
-    # ----------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
-
-    standings = {team: {'series_wins': 0, 'series_losses': 0, 'game_wins': 0, 'game_losses': 0, 'game_differential': 0} for team in group_b}
-    # Group B Matches and Standings
-    # print("\nGroup B:")
-    for i in range(len(group_b)):
-        for j in range(i + 1, len(group_b)):
-            team1 = group_b[i]
-            team2 = group_b[j]
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO5(team1, team2, team_stats)
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-    #         if team1_game_win == 3:
-    #             print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-    #         elif team2_game_win == 3:
-    #             print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-    #
-    # print("-" * 30)
-
-    sorted_standings_b = sorted(standings.items(), key=lambda x: (x[1]['series_wins'], x[1]['game_differential'], x[1]['game_wins']), reverse=True)
-
-    # for index, (team, record) in enumerate(sorted_standings_b):
-    #     if index < 2:  # For the first and second place teams
-    #         print(f"\033[92m\033[01m{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}] \033[0m")
-    #     else:
-    #         print(f"{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}]")
-    # ----------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
-
-    standings = {team: {'series_wins': 0, 'series_losses': 0, 'game_wins': 0, 'game_losses': 0, 'game_differential': 0} for team in group_c}
-    # Group C Matches and Standings
-    # print("\nGroup C:")
-    for i in range(len(group_c)):
-        for j in range(i + 1, len(group_c)):
-            team1 = group_c[i]
-            team2 = group_c[j]
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO5(team1, team2, team_stats)
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-    #         if team1_game_win == 3:
-    #             print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-    #         elif team2_game_win == 3:
-    #             print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-    #
-    # print("-" * 30)
-
-    sorted_standings_c = sorted(standings.items(), key=lambda x: (x[1]['series_wins'], x[1]['game_differential'], x[1]['game_wins']), reverse=True)
-
-    # for index, (team, record) in enumerate(sorted_standings_c):
-    #     if index < 2:  # For the first and second place teams
-    #         print(f"\033[92m\033[01m{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}] \033[0m")
-    #     else:
-    #         print(f"{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}]")
-
-    # ----------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
-
-    standings = {team: {'series_wins': 0, 'series_losses': 0, 'game_wins': 0, 'game_losses': 0, 'game_differential': 0} for team in group_d}
-    # Group D Matches and Standings
-    # print("\nGroup D:")
-    for i in range(len(group_d)):
-        for j in range(i + 1, len(group_d)):
-            team1 = group_d[i]
-            team2 = group_d[j]
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO5(team1, team2, team_stats)
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-    #         if team1_game_win == 3:
-    #             print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-    #         elif team2_game_win == 3:
-    #             print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-    #
-    # print("-" * 30)
-
-    sorted_standings_d = sorted(standings.items(), key=lambda x: (x[1]['series_wins'], x[1]['game_differential'], x[1]['game_wins']), reverse=True)
-
-    # for index, (team, record) in enumerate(sorted_standings_d):
-    #     if index < 2:
-    #         print(f"\033[92m\033[01m{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}] \033[0m")
-    #     else:
-    #         print(f"{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}]")
-
-    return sorted_standings_a, sorted_standings_b, sorted_standings_c, sorted_standings_d
-
-def group_stage_playoffs(teams,team_stats):
-    # Determine matchups
-    sorted_standings_a, sorted_standings_b, sorted_standings_c, sorted_standings_d = group_stage(teams, team_stats)
-
-    playoffs = [
-        sorted_standings_a[0][0],
-        sorted_standings_c[1][0],
-        sorted_standings_b[0][0],
-        sorted_standings_d[1][0],
-        sorted_standings_c[0][0],
-        sorted_standings_b[1][0],
-        sorted_standings_d[0][0],
-        sorted_standings_a[1][0]
-    ]
-
-    round_num = 1
-    remaining_teams = playoffs.copy()
-
-    # Print matchups
-
-    # print("*" * 50)
-
-    while len(remaining_teams) > 2:
-        all_matchups = set_matchups(remaining_teams)
-        # if round_num <= 1:
-        #     print(f"\nQuarter-Finals\n")
-        # elif round_num == 2:
-        #     print(f"\nSemi-Finals\n")
-
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            # Remove loser and winner from remaining teams list
-            remaining_teams.remove(loser)
-
-        # print("-" * 30)
-        round_num += 1
-
-    # Set Grand Finals matchup
-    team1, team2 = remaining_teams[0], remaining_teams[1]
-    # print(f"\nGrand Finals")
-    # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-    # print("- " * 30)
-    _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-    # if team1_game_win == 4:
-    #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-    #     print(f"\nWinner: \033[1m\033[96m {winner}\033[0m")
-    # elif team2_game_win == 4:
-    #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-    #     print(f"\nWinner: \033[1m\033[93m {winner}\033[0m")
-
-    return winner
-
-def simulate_multiple_group_stage_playoffs(teams, team_stats):
-    num_iterations = int(input("Number of Iterations: "))
-    tournaments_done = 0
-    total_wins = {teams: 0 for teams in teams}
-
-    for _ in range(num_iterations):
-        winner = group_stage_playoffs(teams, team_stats)
-        total_wins[winner] += 1
-        tournaments_done += 1
-        print(f"\rTournaments Done: {tournaments_done}/{num_iterations}", end="")
-    print()
-
-    win_percentages = {team: (wins / num_iterations) * 100 for team, wins in total_wins.items()}
-
-    # Sort the win percentages in descending order
-    sorted_win_percentages = sorted(win_percentages.items(), key=lambda x: x[1], reverse=True)
-
-    print("\nWin Percentages: ")
-    for team, win_percentage in sorted_win_percentages:
-        tourney_wins = total_wins[team]
-        print(f"{team:<7.5} {win_percentage:.2f}% ({tourney_wins} wins)")
-
-def swiss_format(teams, team_stats):
-    round_num = 1
-    remaining_teams = teams.copy()
-
-    # Round 1 Brackets
-    starting_bracket = teams
-
-    # Round 2 Brackets
-    one_win_zero_losses = []
-    zero_wins_one_loss = []
-
-    # Round 3 Brackets
-    two_wins_zero_losses = []
-    one_win_one_loss = []
-    zero_wins_two_losses = []
-
-    # Round 4 Brackets
-    two_wins_one_loss = []
-    one_win_two_losses = []
-
-    # Round 5 Brackets
-    two_wins_two_losses = []
-
-    # Final Bracket
-    playoff_bracket = []
-    eliminated_teams = []
-
-    # Standings for the Swiss Bracket
-    standings = {team: {'series_wins': 0, 'series_losses': 0, 'game_wins': 0, 'game_losses': 0, 'game_differential': 0} for team in remaining_teams}
-
-    # Print matchups for round 1
-    if round_num == 1:
-        # print(f"\n{' ': >5}\033[1m\033[4m0-0\033[0m")
-        all_matchups = set_matchups(starting_bracket)
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner][
-                'game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser][
-                'game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-            # Winne gets added to winning round while loser gets added to losing round
-            one_win_zero_losses.append(winner)
-            zero_wins_one_loss.append(loser)
-
-        # Sort next round brackets by Series wins, Game differential and Game wins
-        one_win_zero_losses.sort(key=lambda x: (standings[x]['series_wins'], standings[x]['game_differential'], standings[x]['game_wins']), reverse=True)
-        zero_wins_one_loss.sort(key=lambda x: (standings[x]['series_wins'], standings[x]['game_differential'], standings[x]['game_wins']), reverse=True)
-
-        round_num += 1
-
-    # Print matchups for round 2
-    if round_num == 2:
-        # print("=" * 50)
-
-        # PRINT MATCHUPS FOR 1-0 TEAMS
-        # print(f"\n{' ': >5}\033[1m\033[4m1-0\033[0m")
-        all_matchups = set_matchups(one_win_zero_losses)
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-            # Winner gets added to winning round while loser gets added to losing round
-            two_wins_zero_losses.append(winner)
-            one_win_one_loss.append(loser)
-
-        # Sort next round brackets by Series wins, Game differential and Game wins
-        two_wins_zero_losses.sort(key=lambda x: (standings[x]['series_wins'], standings[x]['game_differential'], standings[x]['game_wins']), reverse=True)
-
-        # print("-" * 40)
-
-        # PRINT MATCHUPS FOR 0-1 TEAMS
-        # print(f"{' ': >5}\033[1m\033[4m0-1\033[0m")
-        all_matchups = set_matchups(zero_wins_one_loss)
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-            # Winner gets added to winning round while loser gets added to losing round
-            one_win_one_loss.append(winner)
-            zero_wins_two_losses.append(loser)
-
-        # Sort next round brackets by Series wins, Game differential and Game wins
-        one_win_one_loss.sort(key=lambda x: (standings[x]['series_wins'], standings[x]['game_differential'], standings[x]['game_wins']), reverse=True)
-        zero_wins_two_losses.sort(key=lambda x: (standings[x]['series_wins'], standings[x]['game_differential'], standings[x]['game_wins']), reverse=True)
-
-        round_num += 1
-
-    # Print matchups for round 3
-    if round_num == 3:
-        # print("=" * 50)
-        #
-        # # PRINT MATCHUPS FOR 2-0 TEAMS
-        # print(f"\n{' ': >5}\033[1m\033[4m2-0\033[0m")
-        all_matchups = set_matchups(two_wins_zero_losses)
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-            # Winner gets added to winning round while loser gets added to losing round
-            playoff_bracket.append(winner)
-            two_wins_one_loss.append(loser)
-
-        # print ("-" * 40)
-        #
-        # # PRINT MATCHUPS FOR 1-1 TEAMS
-        # print(f"{' ': >5}\033[1m\033[4m1-1\033[0m")
-        all_matchups = set_matchups(one_win_one_loss)
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-            # Winner gets added to winning round while loser gets added to losing round
-            two_wins_one_loss.append(winner)
-            one_win_two_losses.append(loser)
-
-        # print ("-" * 40)
-        #
-        # # PRINT MATCHUPS FOR 0-2 TEAMS
-        # print(f"{' ': >5}\033[1m\033[4m0-2\033[0m")
-        all_matchups = set_matchups(zero_wins_two_losses)
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-            # Winner gets added to winning round while loser gets added to losing round
-            one_win_two_losses.append(winner)
-            eliminated_teams.append(loser)
-
-        # Sort teams by series wins, then game differential, then game wins
-        two_wins_one_loss.sort(key=lambda x: (standings[x]['series_wins'], standings[x]['game_differential'], standings[x]['game_wins']), reverse=True)
-        one_win_two_losses.sort(key=lambda x: (standings[x]['series_wins'], standings[x]['game_differential'], standings[x]['game_wins']), reverse=True)
-
-        round_num += 1
-
-    # Print matchups for round 4
-    if round_num == 4:
-        # print("=" * 50)
-        #
-        # # PRINT MATCHUPS FOR 2-1 TEAMS
-        # print(f"\n{' ': >5}\033[1m\033[4m2-1\033[0m")
-        all_matchups = set_matchups(two_wins_one_loss)
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-            # Winner gets added to winning round while loser gets added to losing round
-            playoff_bracket.append(winner)
-            two_wins_two_losses.append(loser)
-
-        # print ("-" * 40)
-        #
-        # # PRINT MATCHUPS FOR 1-2 TEAMS
-        # print(f"{' ': >5}\033[1m\033[4m1-2\033[0m")
-        all_matchups = set_matchups(one_win_two_losses)
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-            # Winner gets added to winning round while loser gets added to losing round
-            two_wins_two_losses.append(winner)
-            eliminated_teams.append(loser)
-
-        # Sort teams by series wins, then series losses , then game differential, then game wins
-        two_wins_two_losses.sort(key=lambda x: (standings[x]['series_wins'], standings[x]['game_differential'], standings[x]['game_wins']), reverse=True)
-
-        round_num += 1
-
-    # Print matchups for round 5
-    if round_num == 5:
-        # print("=" * 50)
-        #
-        # # PRINT MATCHUPS FOR 2-2 TEAMS
-        # print(f"\n{' ': >5}\033[1m\033[4m2-2\033[0m")
-        all_matchups = set_matchups(two_wins_two_losses)
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            # Update standings
-            standings[winner]['series_wins'] += 1
-            standings[loser]['series_losses'] += 1
-            standings[winner]['game_wins'] += team1_game_win if winner == team1 else team2_game_win
-            standings[loser]['game_wins'] += team2_game_win if loser == team2 else team1_game_win
-            standings[winner]['game_losses'] += team2_game_win if winner == team1 else team1_game_win
-            standings[loser]['game_losses'] += team1_game_win if loser == team2 else team2_game_win
-            standings[winner]['game_differential'] += team1_game_win - team2_game_win if winner == team1 else team2_game_win - team1_game_win
-            standings[loser]['game_differential'] += team2_game_win - team1_game_win if loser == team2 else team1_game_win - team2_game_win
-
-            # Winner gets added to winning round while loser gets added to losing round
-            playoff_bracket.append(winner)
-            eliminated_teams.append(loser)
-
-        # Sort teams by series wins, then game differential, then game wins
-        playoff_bracket.sort(key=lambda x: (standings[x]['game_differential'], standings[x]['game_wins']), reverse=True)
-        playoff_bracket.sort(key=lambda x: (standings[x]['series_losses']), reverse=False)
-        playoff_bracket.sort(key=lambda x: (standings[x]['series_wins']), reverse=True)
-
-        eliminated_teams.sort(key=lambda x: (standings[x]['game_differential'], standings[x]['game_wins']), reverse=True)
-        eliminated_teams.sort(key=lambda x: (standings[x]['series_losses']), reverse=False)
-        eliminated_teams.sort(key=lambda x: (standings[x]['series_wins']), reverse=True)
-
-    # print("=" * 50)
-
-    # PRINT STANDINGS
-    # print("\n\033[1m\033[4mSTANDINGS\033[0m")
-    # Print each teams series wins, series losses, game wins, game losses, and game differential
-    # for i in range(len(playoff_bracket)):
-    #     team = playoff_bracket[i]
-    #     if i < 2:
-    #         print(f"{i + 1}. \033[1;35m{team}\033[0m ({standings[team]['series_wins']}-{standings[team]['series_losses']}) ({standings[team]['game_wins']}-{standings[team]['game_losses']}) ({standings[team]['game_differential']})")
-    #     if i >= 2 and i < 5:
-    #         print(f"{i + 1}. \033[1;32m{team}\033[0m ({standings[team]['series_wins']}-{standings[team]['series_losses']}) ({standings[team]['game_wins']}-{standings[team]['game_losses']}) ({standings[team]['game_differential']})")
-    #     if i >= 5 and i < 9:
-    #         print(f"{i + 1}. \033[1;33m{team}\033[0m ({standings[team]['series_wins']}-{standings[team]['series_losses']}) ({standings[team]['game_wins']}-{standings[team]['game_losses']}) ({standings[team]['game_differential']})")
-    #
-    # for i in range(len(eliminated_teams)):
-    #     team = eliminated_teams[i]
-    #     print(f"{i + 9}. \033[1;31m{team}\033[0m ({standings[team]['series_wins']}-{standings[team]['series_losses']}) ({standings[team]['game_wins']}-{standings[team]['game_losses']}) ({standings[team]['game_differential']})")
-
-    return playoff_bracket
-
-def swiss_format_playoffs(teams, team_stats):
-    round_num = 1
-    results = swiss_format(teams, team_stats)
-    teams = [
-        results[0], # 1st place
-        results[7], # 8th place
-        results[3], # 4th place
-        results[4], # 5th place
-        results[1], # 2nd place
-        results[6], # 7th place
-        results[2], # 3rd place
-        results[5]   # 6th place
-    ]
-    remaining_teams = teams
-
-    while len(remaining_teams) > 2:
-        all_matchups = set_matchups(remaining_teams)
-        # if round_num <= 1:
-        #     print(f"\n\033[1m\033[4mQuarter-Finals\033[0m")
-        # elif round_num == 2:
-        #     print(f"\n\033[1m\033[4mSemi-Finals\033[0m")
-
-        for matchup in all_matchups:
-            team1, team2 = matchup
-            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-            _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-            # if team1_game_win == 4:
-            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-            # elif team2_game_win == 4:
-            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-
-            # Remove loser and winner from remaining teams list
-            remaining_teams.remove(loser)
-
-        round_num += 1
-
-    # Set Grand Finals matchup
-    team1, team2 = remaining_teams[0], remaining_teams[1]
-    # print(f"\n\033[1m\033[4mGrand Finals\033[0m")
-    # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
-    _, _, team1_game_win, team2_game_win, winner, loser = simulate_series_BO7(team1, team2, team_stats)
-
-    # if team1_game_win == 4:
-    #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
-    #     print(f"\nWinner: \033[1m\033[96m {winner}\033[0m")
-    # elif team2_game_win == 4:
-    #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
-    #     print(f"\nWinner: \033[1m\033[93m {winner}\033[0m")
-
-    return winner
-
-def simulate_multiple_swiss_format(teams, team_stats):
-    num_iterations = int(input("Number of iterations: "))
-    tournaments_done = 0
-    total_wins = {teams: 0 for teams in teams}
-
-    for _ in range(num_iterations):
-        winner = swiss_format_playoffs(teams, team_stats)
-        total_wins[winner] += 1
-        tournaments_done += 1
-        print(f"\rTournaments Done: {tournaments_done}/{num_iterations}", end="")
-    print()
-
-    win_percentages = {team: (wins / num_iterations) * 100 for team, wins in total_wins.items()}
-
-    # Sort the win percentages in descending order
-    sorted_win_percentages = sorted(win_percentages.items(), key=lambda x: x[1], reverse=True)
-
-    print("\nWin Percentages: ")
-    for team, win_percentage in sorted_win_percentages:
-        tourney_wins = total_wins[team]
-        print(f"{team:<7.5} {win_percentage:.2f}% ({tourney_wins} wins)")
-
-def main():
-    # Read team data from CSV file
-    csv_file = 'C:/Users/maxim/PycharmProjects/RLCS_Simulation/RLCSsheet.csv'
-    team_stats = read_team_data(csv_file)
-    order_rankings_csv = 'C:/Users/maxim/PycharmProjects/RLCS_Simulation/rankings.csv'
-    ordered_teams = get_ordered_teams_from_csv(order_rankings_csv)
-
-    # Get user selection
-    selection = input("(1) Simulate a BO7 series\n"
-                                 "(2) Rank all teams\n"
-                                 "(3) SINGLE ELIMINATION\n"
-                                 "(4) DOUBLE ELIMINATION\n"
-                                 "(5) GROUPS\n"
-                                 "(6) SWISS\n\n"
-                                 "Selection: ")
-
-    if selection == '1':
-        # Get team names from user
-        team1 = input("Team 1: ")
-        team2 = input("Team 2: ")
-
-        # Simulate a Best of 7 series
-        simulate_series_multiple_times(team1, team2, team_stats)
-
-    elif selection == '2':
-        composite_scores = calculate_composite_score(team_stats)
-        team_names = get_team_names(csv_file)
-
-        # Write the rankings to an Excel file
-        write_rankings_to_csv(composite_scores, team_names)
-
-    elif selection == '3':
-        teams = []
-        for i in range(1, 17):
-            team_name = input(f"Team {i}: ")
-            teams.append(team_name)
-            i += 1
-
-        # Simulate a 16-team single elimination tournament
-        simulate_single_elim_tournament(teams, team_stats)
-
-    elif selection == '4':
-        simulate_double_elim_tournament_multiple_times(ordered_teams, team_stats)
-
-    elif selection == '5':
-        simulate_multiple_group_stage_playoffs(ordered_teams, team_stats)
-
-    elif selection == '6':
-        simulate_multiple_swiss_format(ordered_teams, team_stats)
-
-if __name__ == "__main__":
-    main()
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import time
+from collections import namedtuple
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+import backtest
+import batch
+import calibration
+import export
+import kernels
+import outcome_models
+import pairing
+import players
+import profiling
+import progress
+import sensitivity
+import tracing
+import variance
+from standings import Standings
+from tournament_state import TournamentState
+
+def get_team_names(csv_file):
+    team_names = []
+    with open(csv_file, mode='r') as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            team = row['Team Name']
+            if team not in team_names:
+                team_names.append(team)
+
+    return team_names
+
+def get_ranked_teams_from_csv(file_path):
+    # Read the Excel file
+    df = pd.read_csv(file_path)
+
+    # Assuming the teams are sorted by their rank in the Excel file.
+    # If not, sort them here. Replace 'Rank' with the actual rank column name if different.
+    # df.sort_values(by='Rank', inplace=True)
+
+    return df['Team Name'].tolist()
+
+def seed_bracket(ranked_teams):
+    # Order the top 16 teams as per specified sequence
+    return [ranked_teams[rank] for rank in SEEDING_ORDER]
+
+def get_ordered_teams_from_csv(file_path):
+    return seed_bracket(get_ranked_teams_from_csv(file_path))
+
+# Bracket position of each rank (0 = rank 1): 1 v 16, 8 v 9, 4 v 13, 5 v 12, 2 v 15, 7 v 10, 3 v 14, 6 v 11
+SEEDING_ORDER = [0, 15, 7, 8, 3, 12, 4, 11, 1, 14, 6, 10, 2, 13, 5, 9]
+
+# Tournaments played between progress updates, per backend
+BATCH_SIZES = {'python': 100, 'numba': 10000}
+
+# Placement of a team eliminated in each lower bracket round of the 16-team double elimination
+DOUBLE_ELIM_PLACEMENTS = {1: 13, 2: 9, 3: 7, 4: 5, 5: 4, 6: 3}
+
+# Placement of a team eliminated in each round of the 8-team playoffs (quarter-finals, semi-finals)
+PLAYOFF_PLACEMENTS = {1: 5, 2: 3}
+
+# Placement of a team eliminated from the Swiss stage, by series wins
+SWISS_PLACEMENTS = {2: 9, 1: 12, 0: 15}
+
+# Swiss buckets are paired so teams don't meet twice in the stage, as in RLCS (see pairing.py)
+AVOID_SWISS_REMATCHES = True
+
+# Compiled counterparts of the tournament functions, for the numba backend
+KERNEL_TOURNAMENTS = {'simulate_double_elim_tournament': 'double_elim_win_counts'}
+
+# Stages the compiled double elimination plays, all as BO7s
+KERNEL_STAGES = ('upper', 'lower', 'grand_final')
+
+# Series lengths in the head-to-head matrix, by games needed to win
+SERIES_LENGTHS = {'bo5': 3, 'bo7': 4}
+
+# File formats the head-to-head matrices can be written in
+HEAD_TO_HEAD_FORMATS = export.EXPORT_FORMATS + ['parquet']
+
+# Series lengths that can be played
+BEST_OF = (1, 3, 5, 7, 9)
+
+# Series length of every stage, e.g. a BO5 Swiss stage with {'swiss': 5}; --best-of swiss=5 changes it for a run
+STAGE_BEST_OF = {'swiss': 7, 'upper': 7, 'lower': 7, 'grand_final': 7, 'groups': 5, 'playoffs': 7}
+
+# Result of one series
+SeriesResult = namedtuple('SeriesResult', ['winner', 'loser', 'team1_games', 'team2_games'])
+
+def set_matchups(teams_list):
+    all_matchups = []
+    matchup = []
+    for team in teams_list:
+        matchup.append(team)
+        if len(matchup) == 2:
+            all_matchups.append(matchup)
+            matchup = []
+    return all_matchups
+
+def update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser):
+    team_ids = standings.team_ids
+    if winner == team1:
+        standings.record_series(team_ids[team1], team_ids[team2], team1_game_win, team2_game_win)
+    else:
+        standings.record_series(team_ids[team2], team_ids[team1], team2_game_win, team1_game_win)
+
+def sort_by_standings(teams, standings):
+    # Sort by Series wins, Game differential and Game wins
+    teams[:] = standings.ranked(teams)
+
+def sort_final_standings(teams, standings):
+    # Sort teams by series wins, then series losses, then game differential, then game wins
+    teams[:] = standings.ranked(teams, final=True)
+
+def rank_standings(standings):
+    return standings.ranked()
+
+def get_team_regions(csv_file):
+    team_regions = {}
+    with open(csv_file, mode='r') as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            team = row['Team Name']
+            if team not in team_regions:
+                team_regions[team] = row.get('Region', '').strip()
+
+    return team_regions
+
+def read_team_data(csv_file):
+    team_stats = {}
+    with open(csv_file, mode='r') as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            team = row['Team Name']
+            if team not in team_stats:
+                team_stats[team] = {
+                    'Goals': 0,
+                    'Assists': 0,
+                    'Saves': 0,
+                    'Shots': 0,
+                    'Uncertainty': 0,
+                    'Players': 0
+                }
+
+            # Aggregate stats for each team
+            team_stats[team]['Goals'] += float(row['Goals Per Game'])
+            team_stats[team]['Assists'] += float(row['Assists Per Game'])
+            team_stats[team]['Saves'] += float(row['Saves Per Game'])
+            team_stats[team]['Shots'] += float(row['Shots Per Game'])
+            team_stats[team]['Uncertainty'] += float(row['Uncertainty Factor'])
+            team_stats[team]['Players'] += 1
+
+            # Increase Uncertainty for teams from the 'ME' region
+            if 'Region' in row and row['Region'] == 'ME':
+                team_stats[team]['Uncertainty'] += 0.015
+
+            if 'Region' in row and row['Region'] == 'SAM':
+                team_stats[team]['Uncertainty'] += 0.010
+
+    # Calculate average stats for each team
+    for team in team_stats:
+        # print(f"Stats for \033[1m{team}\033[0m:")
+        for stat in ['Goals', 'Assists', 'Saves', 'Shots', 'Uncertainty']:
+            if team_stats[team]['Players'] > 0:  # Check to avoid division by zero
+                team_stats[team][stat] /= team_stats[team]['Players']
+                # print(f"\t{stat}: {team_stats[team][stat]:.3f}")  # Formatting numbers to three decimal places
+            else:
+                print(f"  No players found for {team}, unable to calculate averages.")
+        # print("-" * 30)
+
+    return team_stats
+
+def calculate_composite_score(team_stats):
+    # Adjust these weights according to how much you value each stat
+    weights = {
+        'Goals': 0.40,
+        'Assists': 0.25,
+        'Saves': 0.25,
+        'Shots': 0.10,
+        'Uncertainty': -0.5  # Negative weight if higher uncertainty is worse
+    }
+
+    composite_scores = []
+    for team, stats in team_stats.items():
+        goals_per_shot = ((stats['Goals'] * (1 + weights['Goals'])) / (stats['Shots'] * (1 + weights['Shots'])))
+        score = goals_per_shot + (stats['Assists'] * (1 + weights['Assists'])) + (stats['Saves'] * (1 + weights['Saves']))
+        final_score = abs(score / (stats['Uncertainty'] * weights['Uncertainty']))
+        composite_scores.append(final_score)
+
+    return composite_scores
+
+def write_rankings(composite_scores, team_names, output_dir='.', output_formats=('csv',)):
+    # Sort the teams by composite score
+    rows = sorted(zip(team_names, composite_scores), key=lambda x: x[1], reverse=True)
+
+    # rankings.csv is also the seeding input, so it keeps its 'Team Name' and 'Composite Score' columns
+    for output_format in output_formats:
+        for path in export.write_tables(output_dir, 'rankings', {'rankings': (['Team Name', 'Composite Score'], rows)}, output_format):
+            print(f"Wrote {path}")
+
+    print(f"{'Team Name':>9} {'Composite Score':>15}")
+    for team, score in rows:
+        print(f"{team:>9} {score:15.6f}")
+
+def simulate_game(team1, team2, team_stats):
+    # team_stats can also be an outcome model object, which decides the game itself
+    if not isinstance(team_stats, dict):
+        return team_stats.simulate_game(team1, team2)
+
+    # An active variance-reduction sampler supplies the uniform draws (see variance.py)
+    uniform = random.uniform if variance.active is None else variance.active.game(team1, team2)
+
+    # Base score calculation
+    base_score_team1 = (team_stats[team1]['Goals'] / team_stats[team1]['Shots']) * 0.9 + team_stats[team1]['Assists'] * 0.065 - team_stats[team2]['Saves'] * 0.035
+    base_score_team2 = (team_stats[team2]['Goals'] / team_stats[team2]['Shots']) * 0.9 + team_stats[team2]['Assists'] * 0.065 - team_stats[team1]['Saves'] * 0.035
+
+    # Random variation based on Base score calculation
+    score_variation_team1 = uniform(base_score_team1*0.85, base_score_team1*1.05)
+    score_variation_team2 = uniform(base_score_team2*0.85, base_score_team2*1.05)
+
+    # Random variation based on Uncertainty
+    variation_team1 = uniform(team_stats[team1]['Uncertainty']*0.25, team_stats[team1]['Uncertainty']*0.85)
+    variation_team2 = uniform(team_stats[team2]['Uncertainty']*0.25, team_stats[team2]['Uncertainty']*0.85)
+
+    # Final score calculation with reduced random variation and minimum threshold
+    team1_score = uniform(50*(score_variation_team1 - variation_team1), 100*(score_variation_team1 - variation_team1))
+    team2_score = uniform(50*(score_variation_team2 - variation_team2), 100*(score_variation_team2 - variation_team2))
+
+    # # Print results
+    # if team1_score > team2_score:
+    #     print(f" \033[1m{team1_score:.3f}\033[0m - {team2_score:.3f}")
+    # elif team2_score > team1_score:
+    #     print(f" {team1_score:.3f} - \033[1m{team2_score:.3f}\033[0m")
+
+    return team1_score, team2_score
+
+def simulate_series(team1, team2, team_stats, best_of=7, team1_game_win=0, team2_game_win=0):
+    # A series in progress can be played out from its current score
+    wins_needed = best_of // 2 + 1
+    while team1_game_win < wins_needed and team2_game_win < wins_needed:
+        team1_score, team2_score = simulate_game(team1, team2, team_stats)
+
+        if team1_score > team2_score:
+            team1_game_win += 1
+        elif team2_score > team1_score:
+            team2_game_win += 1
+
+    if team1_game_win == wins_needed:
+        return SeriesResult(team1, team2, team1_game_win, team2_game_win)
+    return SeriesResult(team2, team1, team1_game_win, team2_game_win)
+
+def play_series(team1, team2, team_stats, best_of=None, state=None, stage=None, round_num=None):
+    # Series inside a tournament, as long as STAGE_BEST_OF says for its stage unless best_of is given. With a live
+    # tournament state, a finished series keeps its real result and one in progress is played out from its
+    # current score.
+    best_of = best_of or STAGE_BEST_OF[stage]
+    score = state.series_score(stage, round_num, team1, team2) if state is not None else None
+    wins_needed = best_of // 2 + 1
+    if score is not None and (max(score) > wins_needed or min(score) >= wins_needed or min(score) < 0):
+        raise ValueError(f"Recorded score {score[0]}-{score[1]} for {team1} v {team2} ({stage} round {round_num}) "
+                         f"doesn't fit a best of {best_of}")
+    if score is None:
+        result = simulate_series(team1, team2, team_stats, best_of)
+    elif score[0] == wins_needed:
+        result = SeriesResult(team1, team2, score[0], score[1])
+    elif score[1] == wins_needed:
+        result = SeriesResult(team2, team1, score[0], score[1])
+    else:
+        result = simulate_series(team1, team2, team_stats, best_of, score[0], score[1])
+
+    # Only iterations picked for tracing have an active recorder
+    if tracing.active is not None:
+        tracing.active.record(stage, round_num, team1, team2, result.team1_games, result.team2_games)
+    return result
+
+def set_stage_matchups(teams_list, state=None, stage=None, round_num=None, swiss_pairing=None):
+    # Known pairings from a live tournament state replace the shuffled/sorted order, and a Swiss pairing
+    # re-pairs the bucket to avoid rematches. The engines' own lists take the real order so later rounds
+    # follow the real bracket.
+    arranged = state.arrange(stage, round_num, teams_list) if state is not None else None
+    if arranged is not None:
+        teams_list[:] = arranged
+        all_matchups = set_matchups(teams_list)
+        if swiss_pairing is not None:
+            swiss_pairing.mark(all_matchups)
+        return all_matchups
+    if swiss_pairing is not None:
+        return swiss_pairing.pair(teams_list, round_num)
+    return set_matchups(teams_list)
+
+def make_outcome_model(name, team_stats, game_parameters=None, team_regions=None):
+    # 'score' plays games with simulate_game's formula on team_stats, or with fitted game_parameters in its constants;
+    # 'rating' with Elo ratings from the composite scores
+    if name == 'rating':
+        return outcome_models.RatingModel.from_composite_scores(list(team_stats), calculate_composite_score(team_stats))
+    if name != 'score':
+        raise ValueError(f"Unknown outcome model {name!r}, expected one of {outcome_models.OUTCOME_MODELS}")
+    if game_parameters is not None:
+        return outcome_models.ScoreModel(team_stats, team_regions or {}, game_parameters)
+    return team_stats
+
+def batch_inputs(team_stats, teams):
+    # Stats array and extra keyword arguments for the vectorized batch functions
+    if isinstance(team_stats, dict):
+        return kernels.team_arrays(team_stats, teams), {}
+    return team_stats.batch_inputs(teams)
+
+def simulate_series_multiple_times(team1, team2, team_stats, best_of=7, backend='python'):
+    num_iterations = int(input("Number of Iterations: "))
+
+    if backend == 'numba' and isinstance(team_stats, dict):
+        # One compiled loop over every series
+        kernels.seed(random.getrandbits(32))
+        totals = kernels.series_counts(kernels.team_arrays(team_stats, [team1, team2]), 0, 1, best_of // 2 + 1, num_iterations)
+        total_team1_series_win, total_team2_series_win, total_team1_game_wins, total_team2_game_wins = (int(total) for total in totals)
+    else:
+        # Batched so large iteration counts aren't bound by printing a line per series
+        stats, options = batch_inputs(team_stats, [team1, team2])
+        rng = np.random.default_rng(random.getrandbits(64))
+        total_team1_series_win, total_team2_series_win, total_team1_game_wins, total_team2_game_wins = batch.series_totals(stats, 0, 1, best_of // 2 + 1, num_iterations, rng, **options)
+
+    print("*" * 50)
+    print(f"{team1} {total_team1_series_win} ({total_team1_game_wins})")
+    print(f"{team2} {total_team2_series_win} ({total_team2_game_wins})")
+
+def head_to_head_totals(stats, options, pairs, num_iterations, rng, reporter=None):
+    # Series totals of every (i, j) pair of team ids at every series length, as lists of ints so they can be
+    # sent back from a pool worker
+    totals = []
+    for i, j in pairs:
+        totals.append({label: [int(total) for total in batch.series_totals(stats, i, j, wins_needed, num_iterations, rng, **options)]
+                       for label, wins_needed in SERIES_LENGTHS.items()})
+        if reporter is not None:
+            reporter.update()
+    return totals
+
+def head_to_head_frames(teams, pairs, totals, num_iterations):
+    matrices = {}
+    for label in SERIES_LENGTHS:
+        matrices[f"{label}_win"] = np.full((len(teams), len(teams)), np.nan)
+        matrices[f"{label}_games"] = np.full((len(teams), len(teams)), np.nan)
+
+    for (i, j), pair_totals in zip(pairs, totals):
+        for label, (team1_series_win, team2_series_win, team1_game_wins, team2_game_wins) in pair_totals.items():
+            matrices[f"{label}_win"][i, j] = team1_series_win / num_iterations
+            matrices[f"{label}_win"][j, i] = team2_series_win / num_iterations
+            matrices[f"{label}_games"][i, j] = team1_game_wins / num_iterations
+            matrices[f"{label}_games"][j, i] = team2_game_wins / num_iterations
+
+    return {name: pd.DataFrame(matrix, index=teams, columns=teams) for name, matrix in matrices.items()}
+
+def head_to_head_pairs(teams):
+    return [(i, j) for i in range(len(teams)) for j in range(i + 1, len(teams))]
+
+def head_to_head_matrix(teams, team_stats, num_iterations):
+    # Every pair of teams plays num_iterations BO5 and BO7 series. For each length the result is a win probability
+    # matrix (row team beats column team) and the expected games won by the row team against the column team.
+    stats, options = batch_inputs(team_stats, teams)
+    rng = np.random.default_rng(random.getrandbits(64))
+    pairs = head_to_head_pairs(teams)
+
+    with progress.ProgressReporter(len(pairs), label="Pairs Done") as reporter:
+        totals = head_to_head_totals(stats, options, pairs, num_iterations, rng, reporter)
+
+    return head_to_head_frames(teams, pairs, totals, num_iterations)
+
+def write_head_to_head(matrices, output_prefix='head_to_head', output_format='csv', output_dir='.'):
+    if output_format == 'parquet':
+        os.makedirs(output_dir, exist_ok=True)
+        for name, df in matrices.items():
+            # Needs pyarrow or fastparquet installed
+            path = os.path.join(output_dir, f"{output_prefix}_{name}.parquet")
+            df.to_parquet(path)
+            print(f"Wrote {path}")
+        return
+
+    # One row per team with its odds against every column team; CSV gets a file per matrix, xlsx a sheet per matrix
+    tables = {name: (['Team Name'] + list(df.columns), export.dataframe_rows(df, index=True)) for name, df in matrices.items()}
+    for path in export.write_tables(output_dir, output_prefix, tables, output_format):
+        print(f"Wrote {path}")
+
+def simulate_single_elim_tournament(teams, team_stats):
+    round_num = 1
+
+    # Remaining teams
+    remaining_teams = teams
+
+    while len(remaining_teams) > 2:
+        # Set matchups for current round
+        all_matchups = set_matchups(remaining_teams)
+        print(f"\nRound {round_num} matchups:\n")
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = simulate_series(team1, team2, team_stats, 7)
+
+            if winner == team1:
+                print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+                # print(f"Winner: \033[1m\033[96m {winner}\033[0m")
+            else:
+                print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+                # print(f"Winner: \033[1m\033[93m {winner}\033[0m")
+
+            # Remove loser and winner from remaining teams list
+            remaining_teams.remove(loser)
+            remaining_teams.remove(winner)
+
+            # Add winner back to remaining teams list but at the end of the list
+            remaining_teams.append(winner)
+
+            # print("- " * 30)
+        print("-=" * 40)
+        round_num += 1
+
+    # Set Grand Finals matchup
+    team1, team2 = remaining_teams[0], remaining_teams[1]
+    print(f"\nGrand Finals matchup:")
+    # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+    # print("- " * 30)
+    winner, loser, team1_game_win, team2_game_win = simulate_series(team1, team2, team_stats, 7)
+
+    if winner == team1:
+        print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+        print(f"Winner: \033[1m\033[96m {winner}\033[0m")
+    else:
+        print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+        print(f"Winner: \033[1m\033[93m {winner}\033[0m")
+
+def simulate_double_elim_tournament(teams, team_stats, placements=None, state=None):
+    upper_bracket_round_num = 1
+    lower_bracket_round_num = 1
+
+    upper_bracket_teams = teams.copy()
+    remaining_teams = teams.copy()
+    lower_bracket_team_round1 = []
+    lower_bracket_team_round2 = []
+    lower_bracket_team_round3 = []
+    lower_bracket_team_round4 = []
+    lower_bracket_team_round5 = []
+    lower_bracket_team_final = []
+
+    # Upper Bracket
+    while len(remaining_teams) > 2:
+        all_matchups_winner = set_stage_matchups(upper_bracket_teams, state, 'upper', upper_bracket_round_num)
+
+        # if upper_bracket_round_num <= 4:
+        #     print(f"\nUpper Bracket Round {upper_bracket_round_num} matchups:")
+
+        for matchup in all_matchups_winner:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='upper', round_num=upper_bracket_round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            if upper_bracket_round_num == 1:
+                upper_bracket_teams.remove(loser)
+                lower_bracket_team_round1.append(loser)
+            elif upper_bracket_round_num == 2:
+                upper_bracket_teams.remove(loser)
+                lower_bracket_team_round2.append(loser)
+            elif upper_bracket_round_num == 3:
+                upper_bracket_teams.remove(loser)
+                lower_bracket_team_round4.append(loser)
+            elif upper_bracket_round_num == 4:
+                upper_bracket_teams.remove(loser)
+                lower_bracket_team_final.append(loser)
+
+        if upper_bracket_round_num <= 4:
+            # print("- " * 30)
+            upper_bracket_round_num += 1
+
+        # Loser Bracket
+        if lower_bracket_round_num == 1:
+            all_matchups_lower = set_stage_matchups(lower_bracket_team_round1, state, 'lower', lower_bracket_round_num)
+        elif lower_bracket_round_num == 2:
+            all_matchups_lower = set_stage_matchups(lower_bracket_team_round2, state, 'lower', lower_bracket_round_num)
+        elif lower_bracket_round_num == 3:
+            all_matchups_lower = set_stage_matchups(lower_bracket_team_round3, state, 'lower', lower_bracket_round_num)
+        elif lower_bracket_round_num == 4:
+            all_matchups_lower = set_stage_matchups(lower_bracket_team_round4, state, 'lower', lower_bracket_round_num)
+        elif lower_bracket_round_num == 5:
+            all_matchups_lower = set_stage_matchups(lower_bracket_team_round5, state, 'lower', lower_bracket_round_num)
+        elif lower_bracket_round_num == 6:
+            all_matchups_lower = set_stage_matchups(lower_bracket_team_final, state, 'lower', lower_bracket_round_num)
+
+        # print(f"\nLower Bracket Round {lower_bracket_round_num} matchups:")
+
+        for matchup in all_matchups_lower:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='lower', round_num=lower_bracket_round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Every lower bracket loss is an elimination
+            if placements is not None:
+                placements[loser] = DOUBLE_ELIM_PLACEMENTS[lower_bracket_round_num]
+
+            if lower_bracket_round_num == 1:
+                lower_bracket_team_round1.remove(loser)
+                lower_bracket_team_round2.append(winner)
+                lower_bracket_team_round1.remove(winner)
+                remaining_teams.remove(loser)
+            elif lower_bracket_round_num == 2:
+                lower_bracket_team_round2.remove(loser)
+                lower_bracket_team_round3.append(winner)
+                lower_bracket_team_round2.remove(winner)
+                remaining_teams.remove(loser)
+            elif lower_bracket_round_num == 3:
+                lower_bracket_team_round3.remove(loser)
+                lower_bracket_team_round4.append(winner)
+                lower_bracket_team_round3.remove(winner)
+                remaining_teams.remove(loser)
+            elif lower_bracket_round_num == 4:
+                lower_bracket_team_round4.remove(loser)
+                lower_bracket_team_round5.append(winner)
+                lower_bracket_team_round4.remove(winner)
+                remaining_teams.remove(loser)
+            elif lower_bracket_round_num == 5:
+                lower_bracket_team_round5.remove(loser)
+                lower_bracket_team_final.append(winner)
+                lower_bracket_team_round5.remove(winner)
+                remaining_teams.remove(loser)
+            elif lower_bracket_round_num == 6:
+                lower_bracket_team_final.remove(loser)
+                remaining_teams.remove(loser)
+
+        if lower_bracket_round_num == 1:
+            random.shuffle(lower_bracket_team_round2)
+        elif lower_bracket_round_num == 2:
+            random.shuffle(lower_bracket_team_round3)
+        elif lower_bracket_round_num == 3:
+            random.shuffle(lower_bracket_team_round4)
+
+        # print("*" * 50)
+        lower_bracket_round_num += 1
+
+        if lower_bracket_round_num == 7:
+                break
+
+    # Grand Finals
+    # print(f"\nGrand Finals:")
+    team1 = upper_bracket_teams[0]
+    # print(lower_bracket_team_final)
+    team2 = lower_bracket_team_final[0]
+    # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+    winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='grand_final', round_num=1)
+    # print(f"\033[1m\033[96m{team1}\033[0m {team1_game_win} - \033[1m{team2_game_win} \033[93m{team2}\033[0m")
+    # # print(f"Grand Champ: \033[1m {winner}\033[0m")
+    # print("\/" * 100)
+
+    if placements is not None:
+        placements[winner] = 1
+        placements[loser] = 2
+
+    return winner
+
+def group_stage(teams, team_stats, state=None):
+    group_a, group_b, group_c, group_d = [], [], [], []
+
+    for team in teams:
+        if team in teams[:4]:
+            group_a.append(team)
+        elif team in teams[4:8]:
+            group_b.append(team)
+        elif team in teams[8:12]:
+            group_c.append(team)
+        elif team in teams[12:16]:
+            group_d.append(team)
+
+    # print(f"Group A: {group_a}")
+    # print(f"Group B: {group_b}")
+    # print(f"Group C: {group_c}")
+    # print(f"Group D: {group_d}")
+
+    standings = Standings(group_a)
+    # Group A Matches and Standings
+    # print("\nGroup A:")
+    for i in range(len(group_a)):
+        for j in range(i + 1, len(group_a)):
+            team1 = group_a[i]
+            team2 = group_a[j]
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='groups', round_num=1)
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+            # if team1_game_win == 3:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 3:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+    # print("-" * 30)
+
+    sorted_standings_a = rank_standings(standings)
+
+    # for index, team in enumerate(sorted_standings_a):
+    #     record = standings.record(team)
+    #     if index < 2:  # For the first and second place teams
+    #         print(f"\033[92m\033[01m{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}] \033[0m")
+    #     else:
+    #         print(f"{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}]")
+
+    # ----------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+    standings = Standings(group_b)
+    # Group B Matches and Standings
+    # print("\nGroup B:")
+    for i in range(len(group_b)):
+        for j in range(i + 1, len(group_b)):
+            team1 = group_b[i]
+            team2 = group_b[j]
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='groups', round_num=1)
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+    #         if team1_game_win == 3:
+    #             print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+    #         elif team2_game_win == 3:
+    #             print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+    #
+    # print("-" * 30)
+
+    sorted_standings_b = rank_standings(standings)
+
+    # for index, team in enumerate(sorted_standings_b):
+    #     record = standings.record(team)
+    #     if index < 2:  # For the first and second place teams
+    #         print(f"\033[92m\033[01m{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}] \033[0m")
+    #     else:
+    #         print(f"{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}]")
+    # ----------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+    standings = Standings(group_c)
+    # Group C Matches and Standings
+    # print("\nGroup C:")
+    for i in range(len(group_c)):
+        for j in range(i + 1, len(group_c)):
+            team1 = group_c[i]
+            team2 = group_c[j]
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='groups', round_num=1)
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+    #         if team1_game_win == 3:
+    #             print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+    #         elif team2_game_win == 3:
+    #             print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+    #
+    # print("-" * 30)
+
+    sorted_standings_c = rank_standings(standings)
+
+    # for index, team in enumerate(sorted_standings_c):
+    #     record = standings.record(team)
+    #     if index < 2:  # For the first and second place teams
+    #         print(f"\033[92m\033[01m{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}] \033[0m")
+    #     else:
+    #         print(f"{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}]")
+
+    # ----------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------------
+
+    standings = Standings(group_d)
+    # Group D Matches and Standings
+    # print("\nGroup D:")
+    for i in range(len(group_d)):
+        for j in range(i + 1, len(group_d)):
+            team1 = group_d[i]
+            team2 = group_d[j]
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='groups', round_num=1)
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+    #         if team1_game_win == 3:
+    #             print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+    #         elif team2_game_win == 3:
+    #             print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+    #
+    # print("-" * 30)
+
+    sorted_standings_d = rank_standings(standings)
+
+    # for index, team in enumerate(sorted_standings_d):
+    #     record = standings.record(team)
+    #     if index < 2:
+    #         print(f"\033[92m\033[01m{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}] \033[0m")
+    #     else:
+    #         print(f"{team}: {record['series_wins']} - {record['series_losses']} ({record['game_differential']}) [{record['game_wins']}-{record['game_losses']}]")
+
+    return sorted_standings_a, sorted_standings_b, sorted_standings_c, sorted_standings_d
+
+def group_stage_playoffs(teams, team_stats, placements=None, state=None):
+    # Determine matchups
+    sorted_standings_a, sorted_standings_b, sorted_standings_c, sorted_standings_d = group_stage(teams, team_stats, state)
+
+    playoffs = [
+        sorted_standings_a[0],
+        sorted_standings_c[1],
+        sorted_standings_b[0],
+        sorted_standings_d[1],
+        sorted_standings_c[0],
+        sorted_standings_b[1],
+        sorted_standings_d[0],
+        sorted_standings_a[1]
+    ]
+
+    # Third and fourth in each group are out
+    if placements is not None:
+        for sorted_standings in (sorted_standings_a, sorted_standings_b, sorted_standings_c, sorted_standings_d):
+            placements[sorted_standings[2]] = 9
+            placements[sorted_standings[3]] = 13
+
+    round_num = 1
+    remaining_teams = playoffs.copy()
+
+    # Print matchups
+
+    # print("*" * 50)
+
+    while len(remaining_teams) > 2:
+        all_matchups = set_stage_matchups(remaining_teams, state, 'playoffs', round_num)
+        # if round_num <= 1:
+        #     print(f"\nQuarter-Finals\n")
+        # elif round_num == 2:
+        #     print(f"\nSemi-Finals\n")
+
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='playoffs', round_num=round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Remove loser and winner from remaining teams list
+            remaining_teams.remove(loser)
+            if placements is not None:
+                placements[loser] = PLAYOFF_PLACEMENTS[round_num]
+
+        # print("-" * 30)
+        round_num += 1
+
+    # Set Grand Finals matchup
+    team1, team2 = remaining_teams[0], remaining_teams[1]
+    # print(f"\nGrand Finals")
+    # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+    # print("- " * 30)
+    winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='playoffs', round_num=3)
+
+    # if team1_game_win == 4:
+    #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+    #     print(f"\nWinner: \033[1m\033[96m {winner}\033[0m")
+    # elif team2_game_win == 4:
+    #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+    #     print(f"\nWinner: \033[1m\033[93m {winner}\033[0m")
+
+    if placements is not None:
+        placements[winner] = 1
+        placements[loser] = 2
+
+    return winner
+
+def swiss_format(teams, team_stats, placements=None, state=None):
+    round_num = 1
+    remaining_teams = teams.copy()
+
+    # Round 1 Brackets (a copy, so a live state's draw order doesn't reorder the caller's seeding)
+    starting_bracket = teams.copy()
+
+    # Round 2 Brackets
+    one_win_zero_losses = []
+    zero_wins_one_loss = []
+
+    # Round 3 Brackets
+    two_wins_zero_losses = []
+    one_win_one_loss = []
+    zero_wins_two_losses = []
+
+    # Round 4 Brackets
+    two_wins_one_loss = []
+    one_win_two_losses = []
+
+    # Round 5 Brackets
+    two_wins_two_losses = []
+
+    # Final Bracket
+    playoff_bracket = []
+    eliminated_teams = []
+
+    # Standings for the Swiss Bracket
+    standings = Standings(remaining_teams)
+    swiss_pairing = pairing.SwissPairing(teams) if AVOID_SWISS_REMATCHES else None
+
+    # Print matchups for round 1
+    if round_num == 1:
+        # print(f"\n{' ': >5}\033[1m\033[4m0-0\033[0m")
+        all_matchups = set_stage_matchups(starting_bracket, state, 'swiss', round_num, swiss_pairing)
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='swiss', round_num=round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+            # Winne gets added to winning round while loser gets added to losing round
+            one_win_zero_losses.append(winner)
+            zero_wins_one_loss.append(loser)
+
+        # Sort next round brackets by Series wins, Game differential and Game wins
+        sort_by_standings(one_win_zero_losses, standings)
+        sort_by_standings(zero_wins_one_loss, standings)
+
+        round_num += 1
+
+    # Print matchups for round 2
+    if round_num == 2:
+        # print("=" * 50)
+
+        # PRINT MATCHUPS FOR 1-0 TEAMS
+        # print(f"\n{' ': >5}\033[1m\033[4m1-0\033[0m")
+        all_matchups = set_stage_matchups(one_win_zero_losses, state, 'swiss', round_num, swiss_pairing)
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='swiss', round_num=round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+            # Winner gets added to winning round while loser gets added to losing round
+            two_wins_zero_losses.append(winner)
+            one_win_one_loss.append(loser)
+
+        # Sort next round brackets by Series wins, Game differential and Game wins
+        sort_by_standings(two_wins_zero_losses, standings)
+
+        # print("-" * 40)
+
+        # PRINT MATCHUPS FOR 0-1 TEAMS
+        # print(f"{' ': >5}\033[1m\033[4m0-1\033[0m")
+        all_matchups = set_stage_matchups(zero_wins_one_loss, state, 'swiss', round_num, swiss_pairing)
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='swiss', round_num=round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+            # Winner gets added to winning round while loser gets added to losing round
+            one_win_one_loss.append(winner)
+            zero_wins_two_losses.append(loser)
+
+        # Sort next round brackets by Series wins, Game differential and Game wins
+        sort_by_standings(one_win_one_loss, standings)
+        sort_by_standings(zero_wins_two_losses, standings)
+
+        round_num += 1
+
+    # Print matchups for round 3
+    if round_num == 3:
+        # print("=" * 50)
+        #
+        # # PRINT MATCHUPS FOR 2-0 TEAMS
+        # print(f"\n{' ': >5}\033[1m\033[4m2-0\033[0m")
+        all_matchups = set_stage_matchups(two_wins_zero_losses, state, 'swiss', round_num, swiss_pairing)
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='swiss', round_num=round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+            # Winner gets added to winning round while loser gets added to losing round
+            playoff_bracket.append(winner)
+            two_wins_one_loss.append(loser)
+
+        # print ("-" * 40)
+        #
+        # # PRINT MATCHUPS FOR 1-1 TEAMS
+        # print(f"{' ': >5}\033[1m\033[4m1-1\033[0m")
+        all_matchups = set_stage_matchups(one_win_one_loss, state, 'swiss', round_num, swiss_pairing)
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='swiss', round_num=round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+            # Winner gets added to winning round while loser gets added to losing round
+            two_wins_one_loss.append(winner)
+            one_win_two_losses.append(loser)
+
+        # print ("-" * 40)
+        #
+        # # PRINT MATCHUPS FOR 0-2 TEAMS
+        # print(f"{' ': >5}\033[1m\033[4m0-2\033[0m")
+        all_matchups = set_stage_matchups(zero_wins_two_losses, state, 'swiss', round_num, swiss_pairing)
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='swiss', round_num=round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+            # Winner gets added to winning round while loser gets added to losing round
+            one_win_two_losses.append(winner)
+            eliminated_teams.append(loser)
+
+        # Sort teams by series wins, then game differential, then game wins
+        sort_by_standings(two_wins_one_loss, standings)
+        sort_by_standings(one_win_two_losses, standings)
+
+        round_num += 1
+
+    # Print matchups for round 4
+    if round_num == 4:
+        # print("=" * 50)
+        #
+        # # PRINT MATCHUPS FOR 2-1 TEAMS
+        # print(f"\n{' ': >5}\033[1m\033[4m2-1\033[0m")
+        all_matchups = set_stage_matchups(two_wins_one_loss, state, 'swiss', round_num, swiss_pairing)
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='swiss', round_num=round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+            # Winner gets added to winning round while loser gets added to losing round
+            playoff_bracket.append(winner)
+            two_wins_two_losses.append(loser)
+
+        # print ("-" * 40)
+        #
+        # # PRINT MATCHUPS FOR 1-2 TEAMS
+        # print(f"{' ': >5}\033[1m\033[4m1-2\033[0m")
+        all_matchups = set_stage_matchups(one_win_two_losses, state, 'swiss', round_num, swiss_pairing)
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='swiss', round_num=round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+            # Winner gets added to winning round while loser gets added to losing round
+            two_wins_two_losses.append(winner)
+            eliminated_teams.append(loser)
+
+        # Sort teams by series wins, then series losses , then game differential, then game wins
+        sort_by_standings(two_wins_two_losses, standings)
+
+        round_num += 1
+
+    # Print matchups for round 5
+    if round_num == 5:
+        # print("=" * 50)
+        #
+        # # PRINT MATCHUPS FOR 2-2 TEAMS
+        # print(f"\n{' ': >5}\033[1m\033[4m2-2\033[0m")
+        all_matchups = set_stage_matchups(two_wins_two_losses, state, 'swiss', round_num, swiss_pairing)
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='swiss', round_num=round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Update standings
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+            # Winner gets added to winning round while loser gets added to losing round
+            playoff_bracket.append(winner)
+            eliminated_teams.append(loser)
+
+        # Sort teams by series wins, then game differential, then game wins
+        sort_final_standings(playoff_bracket, standings)
+        sort_final_standings(eliminated_teams, standings)
+
+        # Eliminated teams share a placement per record (2-3, 1-3, 0-3)
+        if placements is not None:
+            for team in eliminated_teams:
+                placements[team] = SWISS_PLACEMENTS[standings.series_wins[standings.team_ids[team]]]
+
+    # print("=" * 50)
+
+    # PRINT STANDINGS
+    # print("\n\033[1m\033[4mSTANDINGS\033[0m")
+    # Print each teams series wins, series losses, game wins, game losses, and game differential
+    # for i in range(len(playoff_bracket)):
+    #     team = playoff_bracket[i]
+    #     if i < 2:
+    #         print(f"{i + 1}. \033[1;35m{team}\033[0m ({standings.record(team)['series_wins']}-{standings.record(team)['series_losses']}) ({standings.record(team)['game_wins']}-{standings.record(team)['game_losses']}) ({standings.record(team)['game_differential']})")
+    #     if i >= 2 and i < 5:
+    #         print(f"{i + 1}. \033[1;32m{team}\033[0m ({standings.record(team)['series_wins']}-{standings.record(team)['series_losses']}) ({standings.record(team)['game_wins']}-{standings.record(team)['game_losses']}) ({standings.record(team)['game_differential']})")
+    #     if i >= 5 and i < 9:
+    #         print(f"{i + 1}. \033[1;33m{team}\033[0m ({standings.record(team)['series_wins']}-{standings.record(team)['series_losses']}) ({standings.record(team)['game_wins']}-{standings.record(team)['game_losses']}) ({standings.record(team)['game_differential']})")
+    #
+    # for i in range(len(eliminated_teams)):
+    #     team = eliminated_teams[i]
+    #     print(f"{i + 9}. \033[1;31m{team}\033[0m ({standings.record(team)['series_wins']}-{standings.record(team)['series_losses']}) ({standings.record(team)['game_wins']}-{standings.record(team)['game_losses']}) ({standings.record(team)['game_differential']})")
+
+    return playoff_bracket
+
+def swiss_format_playoffs(teams, team_stats, placements=None, state=None):
+    round_num = 1
+    results = swiss_format(teams, team_stats, placements, state)
+    teams = [
+        results[0], # 1st place
+        results[7], # 8th place
+        results[3], # 4th place
+        results[4], # 5th place
+        results[1], # 2nd place
+        results[6], # 7th place
+        results[2], # 3rd place
+        results[5]   # 6th place
+    ]
+    remaining_teams = teams
+
+    while len(remaining_teams) > 2:
+        all_matchups = set_stage_matchups(remaining_teams, state, 'playoffs', round_num)
+        # if round_num <= 1:
+        #     print(f"\n\033[1m\033[4mQuarter-Finals\033[0m")
+        # elif round_num == 2:
+        #     print(f"\n\033[1m\033[4mSemi-Finals\033[0m")
+
+        for matchup in all_matchups:
+            team1, team2 = matchup
+            # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+            winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='playoffs', round_num=round_num)
+
+            # if team1_game_win == 4:
+            #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+            # elif team2_game_win == 4:
+            #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+
+            # Remove loser and winner from remaining teams list
+            remaining_teams.remove(loser)
+            if placements is not None:
+                placements[loser] = PLAYOFF_PLACEMENTS[round_num]
+
+        round_num += 1
+
+    # Set Grand Finals matchup
+    team1, team2 = remaining_teams[0], remaining_teams[1]
+    # print(f"\n\033[1m\033[4mGrand Finals\033[0m")
+    # print(f"\033[1m\033[96m{team1}\033[0m vs \033[1m\033[93m{team2}\033[0m")
+    winner, loser, team1_game_win, team2_game_win = play_series(team1, team2, team_stats, state=state, stage='playoffs', round_num=3)
+
+    # if team1_game_win == 4:
+    #     print(f"\033[1m\033[96m{winner}\033[0m \033[1m{team1_game_win}\033[0m - {team2_game_win} {loser}")
+    #     print(f"\nWinner: \033[1m\033[96m {winner}\033[0m")
+    # elif team2_game_win == 4:
+    #     print(f"{loser} {team1_game_win} - \033[1m{team2_game_win} \033[93m{winner}\033[0m")
+    #     print(f"\nWinner: \033[1m\033[93m {winner}\033[0m")
+
+    if placements is not None:
+        placements[winner] = 1
+        placements[loser] = 2
+
+    return winner
+
+def make_batch_runner(tournament, teams, team_stats, backend='python'):
+    # Returns run(n), which plays n tournaments and returns {team: tournament wins}
+    if backend == 'numba':
+        # Compiled brackets work on team ids (positions in teams)
+        kernel = KERNEL_TOURNAMENTS.get(tournament.__name__)
+        if kernel is None:
+            raise ValueError(f"No numba kernel for {tournament.__name__}")
+        if not isinstance(team_stats, dict):
+            raise ValueError("The numba kernels only implement the score model")
+        if any(STAGE_BEST_OF[stage] != 7 for stage in KERNEL_STAGES):
+            raise ValueError("The numba kernels play every bracket series as a BO7")
+        stats = kernels.team_arrays(team_stats, teams)
+        seeds = np.arange(len(teams))
+        kernels.seed(random.getrandbits(32))
+
+        def run(num_iterations):
+            counts = getattr(kernels, kernel)(stats, seeds, num_iterations)
+            return {team: int(counts[team_id]) for team_id, team in enumerate(teams)}
+    else:
+        def run(num_iterations):
+            total_wins = {team: 0 for team in teams}
+            for _ in range(num_iterations):
+                winner = tournament(teams, team_stats)
+                total_wins[winner] += 1
+            return total_wins
+
+    return run
+
+def win_estimate(total_wins, num_iterations, started=None):
+    # Win percentages with a 95% confidence margin (in percentage points) from the binomial standard error
+    estimate = {
+        'iterations': num_iterations,
+        'total_wins': dict(total_wins),
+        'win_percentages': {},
+        'margins': {},
+    }
+    for team, wins in total_wins.items():
+        p = wins / num_iterations if num_iterations else 0.0
+        estimate['win_percentages'][team] = p * 100
+        estimate['margins'][team] = 1.96 * math.sqrt(p * (1 - p) / num_iterations) * 100 if num_iterations else 100.0
+    if started is not None:
+        estimate['elapsed'] = time.perf_counter() - started
+    return estimate
+
+def print_win_percentages(estimate, show_margins=False):
+    # Sort the win percentages in descending order
+    sorted_win_percentages = sorted(estimate['win_percentages'].items(), key=lambda x: x[1], reverse=True)
+
+    print("\nWin Percentages: ")
+    for team, win_percentage in sorted_win_percentages:
+        tourney_wins = estimate['total_wins'][team]
+        if show_margins:
+            print(f"{team:<7.5} {win_percentage:.2f}% ± {estimate['margins'][team]:.2f} ({tourney_wins} wins)")
+        else:
+            print(f"{team:<7.5} {win_percentage:.2f}% ({tourney_wins} wins)")
+
+def simulate_tournament_multiple_times(tournament, teams, team_stats, backend='python', time_budget=None):
+    run_batch = make_batch_runner(tournament, teams, team_stats, backend)
+
+    if time_budget is not None:
+        estimate = estimate_within_time_budget(run_batch, teams, time_budget)
+        print(f"{estimate['iterations']} tournaments in {estimate['elapsed']:.2f}s")
+        print_win_percentages(estimate, show_margins=True)
+        return estimate
+
+    num_iterations = int(input("Number of Iterations: "))
+    total_wins = {team: 0 for team in teams}
+
+    with progress.ProgressReporter(num_iterations) as reporter:
+        done = 0
+        while done < num_iterations:
+            chunk = min(BATCH_SIZES[backend], num_iterations - done)
+            for team, wins in run_batch(chunk).items():
+                total_wins[team] += wins
+            done += chunk
+            reporter.update(chunk)
+
+    estimate = win_estimate(total_wins, num_iterations)
+    print_win_percentages(estimate)
+    return estimate
+
+def estimate_within_time_budget(run_batch, teams, time_budget, on_update=None, total_wins=None, num_iterations=0):
+    # Plays batches until the deadline, sizing each batch from the measured time per tournament so the last one
+    # finishes inside the budget. on_update gets the running estimate after every batch.
+    started = time.perf_counter()
+    deadline = started + time_budget
+    total_wins = dict(total_wins) if total_wins else {team: 0 for team in teams}
+    batch_size = 1
+    simulated = 0
+
+    while True:
+        now = time.perf_counter()
+        remaining = deadline - now
+        if remaining <= 0:
+            break
+        if simulated:
+            per_iteration = (now - started) / simulated
+            # Keep batches short enough to publish several updates within the budget
+            target = min(remaining * 0.9, time_budget / 10)
+            batch_size = int(target / per_iteration)
+            if batch_size < 1:
+                break
+
+        for team, wins in run_batch(batch_size).items():
+            total_wins[team] += wins
+        simulated += batch_size
+        num_iterations += batch_size
+
+        if on_update is not None:
+            on_update(win_estimate(total_wins, num_iterations, started))
+
+    return win_estimate(total_wins, num_iterations, started)
+
+def simulate_double_elim_tournament_multiple_times(teams, team_stats, backend='python', time_budget=None):
+    return simulate_tournament_multiple_times(simulate_double_elim_tournament, teams, team_stats, backend, time_budget)
+
+def simulate_multiple_group_stage_playoffs(teams, team_stats, time_budget=None):
+    return simulate_tournament_multiple_times(group_stage_playoffs, teams, team_stats, time_budget=time_budget)
+
+def simulate_multiple_swiss_format(teams, team_stats, time_budget=None):
+    return simulate_tournament_multiple_times(swiss_format_playoffs, teams, team_stats, time_budget=time_budget)
+
+# Formats that can be run by name, e.g. from the simulation service
+TOURNAMENT_FORMATS = {
+    'double_elim': simulate_double_elim_tournament,
+    'groups': group_stage_playoffs,
+    'swiss': swiss_format_playoffs,
+}
+
+def simulate_from_state(state, team_stats, time_budget=None):
+    # Forecast for an event already under way: finished series keep their results and only the rest is played
+    tournament = partial(TOURNAMENT_FORMATS[state.format], state=state)
+    return simulate_tournament_multiple_times(tournament, state.teams, team_stats, time_budget=time_budget)
+
+def placement_rows(tournament, teams, team_stats, num_iterations, counts, reporter=None):
+    # (iteration, team, placement) for every team of every iteration, generated as the tournaments are played, so
+    # they can be streamed to a file. counts[team][placement] is tallied along the way.
+    for iteration in range(num_iterations):
+        placements = {}
+        tournament(list(teams), team_stats, placements)
+        for team in teams:
+            placement = placements[team]
+            counts[team][placement] = counts[team].get(placement, 0) + 1
+            yield iteration, team, placement
+        if reporter is not None:
+            reporter.update()
+
+def placement_distribution(counts, num_iterations):
+    # Header and rows of each team's chance of every placement, best average placement first
+    placements = sorted({placement for team_counts in counts.values() for placement in team_counts})
+    average = {team: sum(placement * count for placement, count in team_counts.items()) / num_iterations for team, team_counts in counts.items()}
+    header = ['Team Name', 'Average Placement'] + [f"Place {placement} %" for placement in placements]
+    rows = [[team, average[team]] + [team_counts.get(placement, 0) / num_iterations * 100 for placement in placements]
+            for team, team_counts in sorted(counts.items(), key=lambda x: average[x[0]])]
+    return header, rows
+
+def simulate_placements(tournament_format, teams, team_stats, num_iterations, output_dir='.', output_format='csv', per_iteration=False):
+    # Placement distribution of every team; with per_iteration, every iteration's placements are written out too,
+    # row by row while they're simulated
+    counts = {team: {} for team in teams}
+    with progress.ProgressReporter(num_iterations) as reporter:
+        rows = placement_rows(TOURNAMENT_FORMATS[tournament_format], teams, team_stats, num_iterations, counts, reporter)
+        if per_iteration:
+            tables = {'placements_by_iteration': (['Iteration', 'Team Name', 'Placement'], rows)}
+            for path in export.write_tables(output_dir, 'placements_by_iteration', tables, output_format):
+                print(f"Wrote {path}")
+        else:
+            for _ in rows:
+                pass
+
+    header, rows = placement_distribution(counts, num_iterations)
+    for path in export.write_tables(output_dir, 'placements', {'placements': (header, rows)}, output_format):
+        print(f"Wrote {path}")
+    return header, rows
+
+def evaluate_roster_moves(model, moves, teams, num_iterations, backend='python', tournament=simulate_double_elim_tournament, outcome_model='score'):
+    # Title odds of every team in the event under each candidate roster move, against the current rosters.
+    # All candidate team stat lines come from one batched gather over the player matrix.
+    baseline = make_batch_runner(tournament, teams, make_outcome_model(outcome_model, model.team_stats()), backend)(num_iterations)
+    candidate_arrays = model.team_arrays(model.apply_moves(moves))
+
+    rows = []
+    with progress.ProgressReporter(len(moves), label="Roster Moves Done") as reporter:
+        for (player_in, player_out), arrays in zip(moves, candidate_arrays):
+            wins = make_batch_runner(tournament, teams, make_outcome_model(outcome_model, model.stats_dict(arrays)), backend)(num_iterations)
+            team = model.team_of(player_out)
+            rows.append({
+                'Player In': player_in,
+                'Player Out': player_out,
+                'Team': team,
+                'From': model.team_of(player_in),
+                'Title Odds': wins.get(team, 0) / num_iterations * 100,
+                'Change': (wins.get(team, 0) - baseline.get(team, 0)) / num_iterations * 100,
+                **{f"{other} Odds": wins[other] / num_iterations * 100 for other in teams},
+            })
+            reporter.update()
+
+    df = pd.DataFrame(rows)
+    df.sort_values(by='Change', ascending=False, inplace=True)
+    return df
+
+def iteration_seed(seed, iteration):
+    # Traced runs reseed every iteration, so any one of them can be replayed on its own
+    return f"{seed}:{iteration}"
+
+def run_traced(tournament, teams, team_stats, num_iterations, seed, recorder):
+    total_wins = {team: 0 for team in teams}
+    with progress.ProgressReporter(num_iterations) as reporter:
+        for iteration in range(num_iterations):
+            random.seed(iteration_seed(seed, iteration))
+            if recorder.wants(iteration):
+                recorder.begin(iteration)
+                try:
+                    winner = tournament(list(teams), team_stats)
+                finally:
+                    recorder.end()
+            else:
+                winner = tournament(list(teams), team_stats)
+            total_wins[winner] += 1
+            reporter.update()
+    return total_wins
+
+def replay_iteration(tournament, teams, team_stats, seed, iteration):
+    # Plays iteration of the traced run with this seed again, traced
+    recorder = tracing.TraceRecorder(teams, capacity=1024)
+    random.seed(iteration_seed(seed, iteration))
+    recorder.begin(iteration)
+    try:
+        tournament(list(teams), team_stats)
+    finally:
+        recorder.end()
+    return recorder
+
+# Scenarios per task when sensitivity runs on the process pool
+SENSITIVITY_CHUNK_SIZE = 4
+
+def sensitivity_chunk(tournament_format, teams, scenario_stats, num_iterations, seed, outcome_model='score', game_parameters=None, team_regions=None):
+    # Pool worker: every scenario restarts the generator from the same seed (common random numbers)
+    tournament = TOURNAMENT_FORMATS[tournament_format]
+    counts = []
+    for team_stats in scenario_stats:
+        random.seed(seed)
+        wins = make_batch_runner(tournament, teams, make_outcome_model(outcome_model, team_stats, game_parameters, team_regions))(num_iterations)
+        counts.append([wins[team] for team in teams])
+    return counts
+
+def title_sensitivity(teams, team_stats, tournament_format='double_elim', delta=0.05, num_iterations=2000, backend='python',
+                      workers=None, outcome_model='score', game_parameters=None, team_regions=None):
+    # d(title odds)/d(stat) for every team in the event and every stat, from +-delta (relative) perturbations
+    stats = kernels.team_arrays(team_stats, teams)
+    stats_batch, scenarios = sensitivity.perturb(stats, delta)
+    seed = random.getrandbits(32)
+
+    tournament = TOURNAMENT_FORMATS[tournament_format]
+    if backend == 'numba' and tournament.__name__ in KERNEL_TOURNAMENTS and outcome_model == 'score' and game_parameters is None \
+            and all(STAGE_BEST_OF[stage] == 7 for stage in KERNEL_STAGES):
+        # All scenarios in one compiled call, spread over threads
+        counts = kernels.double_elim_win_counts_batch(stats_batch, np.arange(len(teams)), num_iterations, seed)
+    else:
+        scenario_stats = [{team: dict(zip(kernels.STAT_COLUMNS, row)) for team, row in zip(teams, scenario)} for scenario in stats_batch.tolist()]
+        chunks = [scenario_stats[start:start + SENSITIVITY_CHUNK_SIZE] for start in range(0, len(scenario_stats), SENSITIVITY_CHUNK_SIZE)]
+        counts = []
+        with progress.ProgressReporter(len(scenario_stats), label="Scenarios Done") as reporter, \
+                ProcessPoolExecutor(workers or os.cpu_count() or 1, initializer=init_simulation_worker, initargs=(None, dict(STAGE_BEST_OF))) as pool:
+            # Collected in submission order to keep the scenario order; every chunk restarts from the fixed seed
+            futures = [pool.submit(sensitivity_chunk, tournament_format, teams, chunk, num_iterations, seed, outcome_model, game_parameters, team_regions)
+                       for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                counts.extend(future.result())
+                reporter.update(len(chunk))
+        counts = np.array(counts)
+
+    return sensitivity.sensitivity_matrix(counts / num_iterations, stats, scenarios, delta, teams)
+
+def simulate_variance_reduced(tournament_format, teams, team_stats, mode, num_iterations, target=None, tilt=variance.DEFAULT_TILT):
+    # Title odds with one of variance.MODES; returns the estimate with margins and effective sample sizes
+    tournament = TOURNAMENT_FORMATS[tournament_format]
+    if mode == 'antithetic' and not isinstance(team_stats, dict):
+        raise ValueError("Antithetic sampling only implements the score model")
+    team_ids = {team: team_id for team_id, team in enumerate(teams)}
+
+    with progress.ProgressReporter(num_iterations) as reporter:
+        if mode == 'antithetic':
+            stream = variance.AntitheticStream()
+            units = np.zeros((max(num_iterations // 2, 2), len(teams)))
+            variance.active = stream
+            try:
+                for pair in range(len(units)):
+                    stream.record()
+                    units[pair, team_ids[tournament(list(teams), team_stats)]] += 0.5
+                    stream.mirror()
+                    units[pair, team_ids[tournament(list(teams), team_stats)]] += 0.5
+                    reporter.update(2)
+            finally:
+                variance.active = None
+            num_iterations = 2 * len(units)
+
+        elif mode == 'importance':
+            if target not in team_ids:
+                raise ValueError(f"Importance sampling needs a target team from the event, got {target!r}")
+            stats, options = batch_inputs(team_stats, teams)
+            probabilities = variance.game_probabilities(stats, options, np.random.default_rng(random.getrandbits(64)))
+            sampler = variance.ImportanceSampler(partial(simulate_game, team_stats=team_stats), teams, probabilities, target, tilt)
+            units = np.zeros((num_iterations, len(teams)))
+            for iteration in range(num_iterations):
+                sampler.begin()
+                winner = tournament(list(teams), sampler)
+                units[iteration, team_ids[winner]] = sampler.weight
+                reporter.update()
+
+        elif mode == 'stratified':
+            rng = np.random.default_rng(random.getrandbits(64))
+            stats, options = batch_inputs(team_stats, teams)
+            strata = variance.FirstRoundStrata(variance.first_round(tournament_format, teams, STAGE_BEST_OF), team_ids, stats, options, rng)
+            per_replicate = max(num_iterations // variance.STRATIFIED_REPLICATES, 1)
+            units = np.zeros((variance.STRATIFIED_REPLICATES, len(teams)))
+            for replicate in range(variance.STRATIFIED_REPLICATES):
+                # Each iteration plays on from its stratum's first-round results, like a live forecast does
+                for results in strata.results(strata.allocate(per_replicate, rng), rng):
+                    state = TournamentState(tournament_format, teams, results)
+                    units[replicate, team_ids[tournament(list(teams), team_stats, state=state)]] += 1 / per_replicate
+                    reporter.update()
+            num_iterations = per_replicate * variance.STRATIFIED_REPLICATES
+
+        else:
+            raise ValueError(f"Unknown variance reduction mode {mode!r}, expected one of {variance.MODES}")
+
+    return variance.estimate(units, teams, num_iterations, mode)
+
+def print_variance_reduced(estimate):
+    print(f"\nWin Percentages ({estimate['mode']} sampling, {estimate['iterations']} iterations): ")
+    for team, win_percentage in sorted(estimate['win_percentages'].items(), key=lambda x: x[1], reverse=True):
+        effective = estimate['effective_sample_size'][team]
+        print(f"{team:<7.5} {win_percentage:.3f}% ± {estimate['margins'][team]:.3f} "
+              f"(effective sample size {effective:.0f}, {effective / estimate['iterations']:.1f}x)")
+
+# Circuit points by placement. Placements that aren't listed earn nothing.
+DEFAULT_POINTS = {1: 301, 2: 247, 3: 202, 4: 166, 5: 136, 7: 112, 9: 91, 12: 75, 13: 75, 15: 61}
+
+# Events are played in order; the top 'qualify' teams on points at the end of the season qualify
+DEFAULT_SEASON = {
+    'events': ['swiss', 'swiss', 'double_elim'],
+    'points': DEFAULT_POINTS,
+    'qualify': 8,
+}
+
+# Seasons per task handed to a worker process
+SEASON_CHUNK_SIZE = 1000
+
+def load_season_config(path):
+    # JSON with any of the DEFAULT_SEASON keys, e.g. {"events": ["swiss", "double_elim"], "points": {"1": 20, "2": 15}}
+    season = dict(DEFAULT_SEASON)
+    if path:
+        with open(path, mode='r') as file:
+            season.update(json.load(file))
+    season['points'] = {int(placement): points for placement, points in season['points'].items()}
+
+    for tournament_format in season['events']:
+        if tournament_format not in TOURNAMENT_FORMATS:
+            raise ValueError(f"Unknown event format {tournament_format!r}, expected one of {list(TOURNAMENT_FORMATS)}")
+    return season
+
+def simulate_season(ranked_teams, team_stats, events, points):
+    # ranked_teams is the pre-season ranking. Each event is seeded by points so far, pre-season rank breaking ties.
+    season_points = {team: 0 for team in ranked_teams}
+    event_winners = []
+
+    for tournament_format in events:
+        standings = sorted(ranked_teams, key=lambda team: season_points[team], reverse=True)
+        placements = {}
+        winner = TOURNAMENT_FORMATS[tournament_format](seed_bracket(standings), team_stats, placements)
+        event_winners.append(winner)
+
+        for team, placement in placements.items():
+            season_points[team] += points.get(placement, 0)
+
+    return season_points, event_winners
+
+def qualified_teams(season_points, ranked_teams, qualify):
+    return sorted(ranked_teams, key=lambda team: season_points[team], reverse=True)[:qualify]
+
+def simulate_season_chunk(ranked_teams, team_stats, season, num_seasons):
+    totals = {
+        'qualified': {team: 0 for team in ranked_teams},
+        'points': {team: 0 for team in ranked_teams},
+        'event_wins': {team: 0 for team in ranked_teams},
+    }
+
+    for i in range(num_seasons):
+        season_points, event_winners = simulate_season(ranked_teams, team_stats, season['events'], season['points'])
+        for team in qualified_teams(season_points, ranked_teams, season['qualify']):
+            totals['qualified'][team] += 1
+        for team, points in season_points.items():
+            totals['points'][team] += points
+        for winner in event_winners:
+            totals['event_wins'][winner] += 1
+
+        # Report in blocks so the shared progress counter isn't locked every season
+        if i % 100 == 99:
+            progress.advance(100)
+    progress.advance(num_seasons % 100)
+
+    return totals
+
+def init_simulation_worker(counter=None, stage_best_of=None):
+    # Forked workers inherit the parent's generator state, so give each its own. Workers that are spawned import
+    # main afresh, so they're also given the run's series lengths.
+    random.seed()
+    progress.init_worker(counter)
+    if stage_best_of:
+        STAGE_BEST_OF.update(stage_best_of)
+
+def simulate_seasons(ranked_teams, team_stats, season, num_seasons, workers=None):
+    ranked_teams = ranked_teams[:len(SEEDING_ORDER)]
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, min(SEASON_CHUNK_SIZE, math.ceil(num_seasons / workers)))
+    chunks = [min(chunk_size, num_seasons - start) for start in range(0, num_seasons, chunk_size)]
+
+    totals = {
+        'qualified': {team: 0 for team in ranked_teams},
+        'points': {team: 0 for team in ranked_teams},
+        'event_wins': {team: 0 for team in ranked_teams},
+    }
+
+    reporter = progress.ProgressReporter(num_seasons, label="Seasons Done")
+    with reporter, ProcessPoolExecutor(workers, initializer=init_simulation_worker, initargs=(reporter.worker_counter(), dict(STAGE_BEST_OF))) as pool:
+        futures = [pool.submit(simulate_season_chunk, ranked_teams, team_stats, season, size) for size in chunks]
+        for future in as_completed(futures):
+            for key, counts in future.result().items():
+                for team, count in counts.items():
+                    totals[key][team] += count
+
+    return {
+        'seasons': num_seasons,
+        'qualify_percentages': {team: count / num_seasons * 100 for team, count in totals['qualified'].items()},
+        'average_points': {team: points / num_seasons for team, points in totals['points'].items()},
+        'event_wins': totals['event_wins'],
+    }
+
+def print_season_odds(results, season):
+    sorted_qualify_percentages = sorted(results['qualify_percentages'].items(), key=lambda x: (x[1], results['average_points'][x[0]]), reverse=True)
+
+    print(f"\nQualification Odds (top {season['qualify']} after {len(season['events'])} events): ")
+    for team, qualify_percentage in sorted_qualify_percentages:
+        event_wins = results['event_wins'][team]
+        print(f"{team:<7.5} {qualify_percentage:6.2f}%  {results['average_points'][team]:7.1f} pts  ({event_wins} event wins)")
+
+# Regional qualifiers feed each split's major through per-region slots; after the last split the top teams on
+# circuit points (regional and major placements, majors weighted) go to Worlds
+DEFAULT_CIRCUIT = {
+    'regional_format': 'swiss',
+    'major_format': 'swiss',
+    'worlds_format': 'double_elim',
+    'major_slots': {'EU': 7, 'NA': 7, 'SAM': 1, 'ME': 1},
+    'splits': 2,
+    'points': DEFAULT_POINTS,
+    'major_points_multiplier': 2,
+}
+
+def load_circuit_config(path, region_teams):
+    circuit = dict(DEFAULT_CIRCUIT)
+    if path:
+        with open(path, mode='r') as file:
+            circuit.update(json.load(file))
+    circuit['points'] = {int(placement): points for placement, points in circuit['points'].items()}
+
+    for key in ('regional_format', 'major_format', 'worlds_format'):
+        if circuit[key] not in TOURNAMENT_FORMATS:
+            raise ValueError(f"Unknown {key} {circuit[key]!r}, expected one of {list(TOURNAMENT_FORMATS)}")
+    if sum(circuit['major_slots'].values()) != len(SEEDING_ORDER):
+        raise ValueError(f"Major slots must add up to {len(SEEDING_ORDER)}")
+    for region, slots in circuit['major_slots'].items():
+        if slots > len(region_teams.get(region, [])):
+            raise ValueError(f"{region} has {slots} major slots but only {len(region_teams.get(region, []))} teams")
+    return circuit
+
+def group_teams_by_region(ranked_teams, team_regions):
+    # Each region's teams in ranking order; teams missing from the rankings go last
+    region_teams = {}
+    for team in ranked_teams + [team for team in team_regions if team not in ranked_teams]:
+        if team in team_regions:
+            region_teams.setdefault(team_regions[team], []).append(team)
+    return region_teams
+
+def round_robin(teams, team_stats, placements=None):
+    # Every team plays every other team once, as long a series as a group match, ranked like a group
+    standings = Standings(teams)
+    for i in range(len(teams)):
+        for j in range(i + 1, len(teams)):
+            team1, team2 = teams[i], teams[j]
+            winner, loser, team1_game_win, team2_game_win = simulate_series(team1, team2, team_stats, STAGE_BEST_OF['groups'])
+            update_standings(standings, team1, team2, team1_game_win, team2_game_win, winner, loser)
+
+    sorted_standings = rank_standings(standings)
+    if placements is not None:
+        for index, team in enumerate(sorted_standings):
+            placements[team] = index + 1
+    return sorted_standings[0]
+
+def simulate_regional(teams, team_stats, tournament_format, placements):
+    # Big regions play their top 16 in the regional format, small regions play a round robin
+    if len(teams) >= len(SEEDING_ORDER):
+        return TOURNAMENT_FORMATS[tournament_format](seed_bracket(teams), team_stats, placements)
+    return round_robin(teams, team_stats, placements)
+
+def simulate_regional_chunk(teams, team_stats, tournament_format, num_iterations):
+    # Placement of every team in each iteration, in the order of teams (0 for teams that didn't play)
+    results = []
+    for _ in range(num_iterations):
+        placements = {}
+        simulate_regional(teams, team_stats, tournament_format, placements)
+        results.append(tuple(placements.get(team, 0) for team in teams))
+    progress.advance(num_iterations)
+    return results
+
+def simulate_circuit_chunk(ranked_teams, region_teams, regional_results, team_stats, circuit):
+    # regional_results[region][i] holds the placements of that region's regional i; season s uses regionals
+    # s * splits to s * splits + splits - 1
+    rank = {team: index for index, team in enumerate(ranked_teams)}
+    teams = [team for region in region_teams for team in region_teams[region]]
+    totals = {key: {team: 0 for team in teams} for key in ('major', 'major_wins', 'worlds', 'worlds_wins')}
+    splits = circuit['splits']
+    num_seasons = len(next(iter(regional_results.values()))) // splits
+
+    for season in range(num_seasons):
+        circuit_points = {team: 0 for team in teams}
+
+        for split in range(splits):
+            qualifiers = []
+            for region, slots in circuit['major_slots'].items():
+                placements = regional_results[region][season * splits + split]
+                for team, placement in zip(region_teams[region], placements):
+                    circuit_points[team] += circuit['points'].get(placement, 0)
+                finishers = sorted((placement, rank.get(team, len(rank)), team) for team, placement in zip(region_teams[region], placements) if placement)
+                qualifiers.extend(finishers[:slots])
+
+            # Seed the major by regional placement, then overall ranking
+            major_teams = [team for _, _, team in sorted(qualifiers)]
+            placements = {}
+            winner = TOURNAMENT_FORMATS[circuit['major_format']](seed_bracket(major_teams), team_stats, placements)
+            for team, placement in placements.items():
+                circuit_points[team] += circuit['points'].get(placement, 0) * circuit['major_points_multiplier']
+                totals['major'][team] += 1
+            totals['major_wins'][winner] += 1
+
+        worlds_teams = sorted(teams, key=lambda team: (-circuit_points[team], rank.get(team, len(rank))))[:len(SEEDING_ORDER)]
+        winner = TOURNAMENT_FORMATS[circuit['worlds_format']](seed_bracket(worlds_teams), team_stats)
+        for team in worlds_teams:
+            totals['worlds'][team] += 1
+        totals['worlds_wins'][winner] += 1
+
+        if season % 100 == 99:
+            progress.advance(100)
+    progress.advance(num_seasons % 100)
+
+    return totals
+
+def simulate_circuits(ranked_teams, team_regions, team_stats, circuit, num_seasons, workers=None):
+    region_teams = {region: teams for region, teams in group_teams_by_region(ranked_teams, team_regions).items() if region in circuit['major_slots']}
+    workers = workers or os.cpu_count() or 1
+    num_regionals = num_seasons * circuit['splits']
+
+    counter = progress.shared_counter()
+    with ProcessPoolExecutor(workers, initializer=init_simulation_worker, initargs=(counter, dict(STAGE_BEST_OF))) as pool:
+        # Regional stages don't depend on each other, so every region's regionals for every split run at once
+        chunk_size = max(1, min(SEASON_CHUNK_SIZE, math.ceil(num_regionals * len(region_teams) / workers)))
+        with progress.ProgressReporter(num_regionals * len(region_teams), label="Regionals Done", counter=counter):
+            futures = {
+                region: [pool.submit(simulate_regional_chunk, teams, team_stats, circuit['regional_format'], min(chunk_size, num_regionals - start))
+                         for start in range(0, num_regionals, chunk_size)]
+                for region, teams in region_teams.items()
+            }
+            regional_results = {}
+            for region, region_futures in futures.items():
+                regional_results[region] = [placements for future in region_futures for placements in future.result()]
+
+        # Majors and Worlds need every region's qualifiers, so they start once all regionals are in
+        season_chunk_size = max(1, min(SEASON_CHUNK_SIZE, math.ceil(num_seasons / workers)))
+        splits = circuit['splits']
+        totals = {}
+        counter.value = 0
+        with progress.ProgressReporter(num_seasons, label="Seasons Done", counter=counter):
+            futures = []
+            for start in range(0, num_seasons, season_chunk_size):
+                end = min(start + season_chunk_size, num_seasons)
+                chunk_results = {region: results[start * splits:end * splits] for region, results in regional_results.items()}
+                futures.append(pool.submit(simulate_circuit_chunk, ranked_teams, region_teams, chunk_results, team_stats, circuit))
+            for future in as_completed(futures):
+                for key, counts in future.result().items():
+                    for team, count in counts.items():
+                        totals.setdefault(key, {}).setdefault(team, 0)
+                        totals[key][team] += count
+
+    majors = num_seasons * splits
+    return {
+        'seasons': num_seasons,
+        'region_teams': region_teams,
+        'major_percentages': {team: count / majors * 100 for team, count in totals['major'].items()},
+        'major_title_percentages': {team: count / majors * 100 for team, count in totals['major_wins'].items()},
+        'worlds_percentages': {team: count / num_seasons * 100 for team, count in totals['worlds'].items()},
+        'worlds_title_percentages': {team: count / num_seasons * 100 for team, count in totals['worlds_wins'].items()},
+    }
+
+def forecast_event(players_path, seeding_path, tournament_format, num_iterations, backend='python', outcome_model='score', game_parameters=None):
+    # Title odds for one past event from the data available before it; runs in a backtest pool worker
+    team_stats = read_team_data(players_path)
+    outcome = make_outcome_model(outcome_model, team_stats, game_parameters, get_team_regions(players_path) if game_parameters else None)
+    ordered_teams = get_ordered_teams_from_csv(seeding_path)
+    tournament = TOURNAMENT_FORMATS[tournament_format]
+    if tournament.__name__ not in KERNEL_TOURNAMENTS:
+        backend = 'python'
+    return {'total_wins': make_batch_runner(tournament, ordered_teams, outcome, backend)(num_iterations), 'iterations': num_iterations}
+
+def run_backtest(directory, num_iterations, workers=None, backend='python', outcome_model='score', game_parameters=None):
+    events = backtest.load_events(directory)
+    settings = {'iterations': num_iterations, 'backend': backend, 'outcome_model': outcome_model, 'game_parameters': game_parameters,
+                'stage_best_of': STAGE_BEST_OF, 'avoid_swiss_rematches': AVOID_SWISS_REMATCHES}
+    keys = {event['name']: backtest.input_hash(event, settings) for event in events}
+
+    forecasts = {}
+    pending = []
+    for event in events:
+        cached = backtest.load_cached(directory, keys[event['name']])
+        if cached is not None:
+            forecasts[event['name']] = cached
+        else:
+            pending.append(event)
+    print(f"{len(events)} events, {len(events) - len(pending)} cached, {len(pending)} to simulate")
+
+    if pending:
+        with progress.ProgressReporter(len(pending), label="Events Done") as reporter, \
+                ProcessPoolExecutor(workers or os.cpu_count() or 1, initializer=init_simulation_worker, initargs=(None, dict(STAGE_BEST_OF))) as pool:
+            futures = {pool.submit(forecast_event, event['players_path'], event['seeding_path'], event['format'], num_iterations,
+                                   backend, outcome_model, game_parameters): event for event in pending}
+            for future in as_completed(futures):
+                name = futures[future]['name']
+                forecasts[name] = future.result()
+                backtest.store_cached(directory, keys[name], forecasts[name])
+                reporter.update()
+
+    return backtest.score_forecasts(events, forecasts)
+
+def print_backtest(report):
+    for tournament_format, scores in report.items():
+        print(f"\n\033[1m{tournament_format}\033[0m: {scores['events']} events, Brier {scores['brier']:.4f}, log loss {scores['log_loss']:.4f}")
+        print(f"{'Forecast':>12} {'Mean':>8} {'Observed':>9} {'Teams':>6}")
+        for bin_start, mean_forecast, observed, count in scores['calibration']:
+            print(f"{bin_start * 100:5.0f}-{(bin_start + 1 / backtest.CALIBRATION_BINS) * 100:3.0f}% {mean_forecast * 100:7.2f}% {observed * 100:8.2f}% {count:6d}")
+
+def print_calibration(fit):
+    print(f"\n{'Parameter':<18} {'Start':>10} {'Fitted':>10}")
+    for name in calibration.FITTED_PARAMETERS:
+        print(f"{name:<18} {fit['start_parameters'][name]:10.4f} \033[1m{fit['parameters'][name]:10.4f}\033[0m")
+
+    print(f"\n{'':<18} {'Start':>10} {'Fitted':>10}")
+    for metric, label in [('negative_log_likelihood', 'Score NLL'), ('log_loss', 'Log loss'), ('brier', 'Brier')]:
+        print(f"{label:<18} {fit['start_scores'][metric]:10.4f} \033[1m{fit['fitted_scores'][metric]:10.4f}\033[0m")
+
+def print_circuit_odds(results):
+    print(f"\n{'Team':<7} {'Region':<6} {'Major':>8} {'Major Win':>10} {'Worlds':>8} {'Worlds Win':>11}")
+    for region, teams in results['region_teams'].items():
+        sorted_teams = sorted(teams, key=lambda team: (results['worlds_title_percentages'][team], results['major_title_percentages'][team], results['major_percentages'][team]), reverse=True)
+        for team in sorted_teams:
+            print(f"{team:<7.5} {region:<6} {results['major_percentages'][team]:7.2f}% {results['major_title_percentages'][team]:9.2f}% "
+                  f"{results['worlds_percentages'][team]:7.2f}% {results['worlds_title_percentages'][team]:10.2f}%")
+
+def parse_stage_best_of(value):
+    # --best-of argument, e.g. swiss=5
+    stage, _, best_of = value.partition('=')
+    if stage not in STAGE_BEST_OF:
+        raise argparse.ArgumentTypeError(f"unknown stage {stage!r}, expected one of {list(STAGE_BEST_OF)}")
+    if not best_of.isdigit() or int(best_of) not in BEST_OF:
+        raise argparse.ArgumentTypeError(f"{stage} must be best of one of {BEST_OF}, got {best_of!r}")
+    return stage, int(best_of)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="RLCS tournament simulation")
+    parser.add_argument('--profile', action='store_true',
+                        help="count games/series/tournaments, RNG calls and time spent in each simulation phase")
+    parser.add_argument('--profile-dump', metavar='PATH',
+                        help="write a cProfile dump (.prof) or a pyinstrument report (.html/.txt) of the run")
+    parser.add_argument('--collapsed-stacks', metavar='PATH',
+                        help="write sampled call stacks in collapsed format for flamegraph.pl/speedscope")
+    parser.add_argument('--backend', choices=kernels.BACKENDS, default='python',
+                        help="simulation backend for repeated series and double elimination; numba falls back to python if it is not installed")
+    parser.add_argument('--outcome-model', choices=outcome_models.OUTCOME_MODELS, default='score',
+                        help="how games are decided: the stat-based score formula or Elo ratings from the composite scores")
+    parser.add_argument('--game-parameters', metavar='PATH',
+                        help="JSON of score model constants, e.g. game_parameters.json written by the calibration")
+    parser.add_argument('--best-of', type=parse_stage_best_of, action='append', default=[], metavar='STAGE=N',
+                        help=f"series length of a stage, e.g. --best-of swiss=5; can be repeated (stages: {', '.join(STAGE_BEST_OF)})")
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS',
+                        help="run tournament simulations until this many seconds have passed instead of asking for an iteration count")
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help="worker processes for parallel simulations such as seasons (default: one per CPU)")
+    parser.add_argument('--output-dir', default='.', metavar='DIR',
+                        help="directory exported tables (rankings, head-to-head, placements, reports) are written to")
+    parser.add_argument('--export-format', choices=export.EXPORT_FORMATS, default='csv',
+                        help="file format of exported tables; xlsx is written in streaming mode")
+    parser.add_argument('--progress-rate', type=float, metavar='N',
+                        help="redraw the progress line at most N times per second (default 4)")
+    parser.add_argument('--progress-log-interval', type=float, metavar='SECONDS',
+                        help="seconds between progress log lines when stdout is not a terminal (default 10)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    progress.configure(updates_per_second=args.progress_rate, log_interval=args.progress_log_interval)
+    STAGE_BEST_OF.update(args.best_of)
+
+    # Read team data from CSV file
+    csv_file = 'C:/Users/maxim/PycharmProjects/RLCS_Simulation/RLCSsheet.csv'
+    team_stats = read_team_data(csv_file)
+    order_rankings_csv = 'C:/Users/maxim/PycharmProjects/RLCS_Simulation/rankings.csv'
+    ranked_teams = get_ranked_teams_from_csv(order_rankings_csv)
+    ordered_teams = seed_bracket(ranked_teams)
+
+    # Get user selection
+    selection = input("(1) Simulate a series\n"
+                                 "(2) Rank all teams\n"
+                                 "(3) SINGLE ELIMINATION\n"
+                                 "(4) DOUBLE ELIMINATION\n"
+                                 "(5) GROUPS\n"
+                                 "(6) SWISS\n"
+                                 "(7) HEAD-TO-HEAD MATRIX\n"
+                                 "(8) SEASON\n"
+                                 "(9) REGIONALS, MAJORS AND WORLDS\n"
+                                 "(10) LIVE FORECAST FROM STATE\n"
+                                 "(11) ROSTER MOVES\n"
+                                 "(12) CALIBRATE GAME MODEL\n"
+                                 "(13) BACKTEST PAST EVENTS\n"
+                                 "(14) STAT SENSITIVITY\n"
+                                 "(15) TRACED RUN AND REPLAY\n"
+                                 "(16) VARIANCE-REDUCED ODDS\n"
+                                 "(17) PLACEMENT DISTRIBUTION\n\n"
+                                 "Selection: ")
+
+    backend = kernels.select_backend(args.backend)
+    game_parameters = outcome_models.load_game_parameters(args.game_parameters) if args.game_parameters else None
+    if backend == 'numba' and (args.outcome_model != 'score' or game_parameters is not None):
+        print("The numba backend only implements the score model, falling back to the python backend")
+        backend = 'python'
+    if backend == 'numba' and any(STAGE_BEST_OF[stage] != 7 for stage in KERNEL_STAGES):
+        print("The numba backend only plays BO7 brackets, falling back to the python backend")
+        backend = 'python'
+
+    with profiling.profile_run(globals(), counters=args.profile, dump_path=args.profile_dump, stacks_path=args.collapsed_stacks):
+        run_selection(selection, csv_file, team_stats, ranked_teams, ordered_teams, backend, args.time_budget, args.workers, args.outcome_model, game_parameters,
+                      args.output_dir, args.export_format)
+
+def run_selection(selection, csv_file, team_stats, ranked_teams, ordered_teams, backend='python', time_budget=None, workers=None, outcome_model='score', game_parameters=None,
+                  output_dir='.', export_format='csv'):
+    # Everything that plays games uses the selected outcome model; rankings and roster moves start from the raw stats
+    outcome = make_outcome_model(outcome_model, team_stats, game_parameters, get_team_regions(csv_file) if game_parameters else None)
+
+    if selection == '1':
+        # Get team names from user
+        team1 = input("Team 1: ")
+        team2 = input("Team 2: ")
+
+        best_of = int(input(f"Best of ({'/'.join(map(str, BEST_OF))}, blank for 7): ").strip() or 7)
+        if best_of not in BEST_OF:
+            raise ValueError(f"Series must be best of one of {BEST_OF}, got {best_of}")
+
+        simulate_series_multiple_times(team1, team2, outcome, best_of, backend)
+
+    elif selection == '2':
+        composite_scores = calculate_composite_score(team_stats)
+        team_names = get_team_names(csv_file)
+
+        # Write the rankings; the CSV is also the seeding input, so it's always written
+        write_rankings(composite_scores, team_names, output_dir, sorted({'csv', export_format}))
+
+    elif selection == '3':
+        teams = []
+        for i in range(1, 17):
+            team_name = input(f"Team {i}: ")
+            teams.append(team_name)
+            i += 1
+
+        # Simulate a 16-team single elimination tournament
+        simulate_single_elim_tournament(teams, outcome)
+
+    elif selection == '4':
+        simulate_double_elim_tournament_multiple_times(ordered_teams, outcome, backend, time_budget)
+
+    elif selection == '5':
+        simulate_multiple_group_stage_playoffs(ordered_teams, outcome, time_budget)
+
+    elif selection == '6':
+        simulate_multiple_swiss_format(ordered_teams, outcome, time_budget)
+
+    elif selection == '7':
+        # Blank selects every team in the player sheet
+        selected = input("Teams (comma separated, blank for all): ")
+        teams = [team.strip() for team in selected.split(',') if team.strip()] or list(team_stats)
+        num_iterations = int(input("Number of Iterations: "))
+        output_format = input(f"Output format ({'/'.join(HEAD_TO_HEAD_FORMATS)}, blank for {export_format}): ").strip().lower() or export_format
+        # Checked before the matrix is simulated so a typo doesn't throw the run away
+        if output_format not in HEAD_TO_HEAD_FORMATS:
+            raise ValueError(f"Unknown output format {output_format!r}, expected one of {HEAD_TO_HEAD_FORMATS}")
+
+        matrices = head_to_head_matrix(teams, outcome, num_iterations)
+        print(matrices['bo7_win'].round(3).to_string())
+        write_head_to_head(matrices, output_format=output_format, output_dir=output_dir)
+
+    elif selection == '8':
+        season = load_season_config(input("Season config (blank for default): ").strip())
+        num_seasons = int(input("Number of Seasons: "))
+
+        results = simulate_seasons(ranked_teams, outcome, season, num_seasons, workers)
+        print_season_odds(results, season)
+
+    elif selection == '9':
+        team_regions = get_team_regions(csv_file)
+        circuit = load_circuit_config(input("Circuit config (blank for default): ").strip(), group_teams_by_region(ranked_teams, team_regions))
+        num_seasons = int(input("Number of Seasons: "))
+
+        results = simulate_circuits(ranked_teams, team_regions, outcome, circuit, num_seasons, workers)
+        print_circuit_odds(results)
+
+    elif selection == '10':
+        # JSON written by TournamentState.save, with the results known so far
+        state = TournamentState.load(input("Tournament state: ").strip())
+        simulate_from_state(state, outcome, time_budget)
+
+    elif selection == '11':
+        model = players.PlayerModel.from_csv(csv_file)
+        moves_csv = input("Roster moves CSV (blank for every move into one team): ").strip()
+        moves = players.read_moves(moves_csv) if moves_csv else model.candidate_moves(input("Team: ").strip())
+        num_iterations = int(input("Number of Iterations: "))
+
+        # Ranked by how much each move changes the receiving team's title odds (double elimination bracket)
+        df = evaluate_roster_moves(model, moves, ordered_teams, num_iterations, backend, outcome_model=outcome_model)
+        print(df[['Player In', 'Player Out', 'Team', 'From', 'Title Odds', 'Change']].head(20).to_string(index=False))
+        for path in export.write_tables(output_dir, 'roster_moves', {'roster_moves': (list(df.columns), export.dataframe_rows(df))}, export_format):
+            print(f"Wrote {path}")
+
+    elif selection == '12':
+        # 'Team 1', 'Team 2', 'Team 1 Games', 'Team 2 Games' rows of past series
+        results = calibration.read_series_results(input("Historical series CSV: ").strip())
+        known = [result for result in results if result[0] in team_stats and result[1] in team_stats]
+        if len(known) < len(results):
+            print(f"Skipping {len(results) - len(known)} series with teams missing from the player sheet")
+
+        data = calibration.prepare(team_stats, get_team_regions(csv_file), known)
+        fit = calibration.calibrate(data, game_parameters, workers=workers)
+        print_calibration(fit)
+        os.makedirs(output_dir or '.', exist_ok=True)
+        path = os.path.join(output_dir or '.', 'game_parameters.json')
+        with open(path, mode='w') as file:
+            json.dump(fit['parameters'], file, indent=2)
+        print(f"Wrote {path} (use it with --game-parameters)")
+
+    elif selection == '13':
+        directory = input("Events directory: ").strip()
+        num_iterations = int(input("Iterations per event: "))
+
+        report = run_backtest(directory, num_iterations, workers, backend, outcome_model, game_parameters)
+        print_backtest(report)
+        for path in export.write_tables(output_dir, 'backtest', backtest.report_tables(report), export_format):
+            print(f"Wrote {path}")
+
+    elif selection == '14':
+        tournament_format = input(f"Format ({'/'.join(TOURNAMENT_FORMATS)}): ").strip() or 'double_elim'
+        delta = float(input("Relative change (blank for 0.05): ").strip() or 0.05)
+        num_iterations = int(input("Iterations per scenario: "))
+
+        df = title_sensitivity(ordered_teams, team_stats, tournament_format, delta, num_iterations, backend, workers,
+                               outcome_model, game_parameters, get_team_regions(csv_file) if game_parameters else None)
+        print("\nChange in title odds (percentage points) per unit of each stat:")
+        print(df.round(2).to_string())
+        tables = {'sensitivity': (['Team Name'] + list(df.columns), export.dataframe_rows(df, index=True))}
+        for path in export.write_tables(output_dir, 'sensitivity', tables, export_format):
+            print(f"Wrote {path}")
+
+    elif selection == '15':
+        tournament = TOURNAMENT_FORMATS[input(f"Format ({'/'.join(TOURNAMENT_FORMATS)}): ").strip() or 'double_elim']
+        seed = input("Seed (blank for random): ").strip() or str(random.getrandbits(32))
+        num_iterations = int(input("Number of Iterations: "))
+        sample_rate = float(input("Fraction of iterations to trace (blank for 0.01): ").strip() or 0.01)
+
+        recorder = tracing.TraceRecorder(ordered_teams, sample_rate=sample_rate)
+        total_wins = run_traced(tournament, ordered_teams, outcome, num_iterations, seed, recorder)
+        print_win_percentages(win_estimate(total_wins, num_iterations))
+
+        # Traced iterations won by a team outside the top 4 seeds are the upsets worth a look
+        upsets = [iteration for iteration in recorder.traced_iterations() if recorder.champion(iteration) not in ranked_teams[:4]]
+        print(f"\nSeed {seed}: {len(recorder.traced_iterations())} iterations traced, upsets in {upsets[:20]}")
+        while True:
+            selected = input("Iteration to show (blank to stop): ").strip()
+            if not selected:
+                break
+            iteration = int(selected)
+            # Iterations that weren't traced, or have partly or wholly left the ring buffer, are played again from their seed
+            rows = recorder.rows(iteration)
+            if not len(rows):
+                rows = replay_iteration(tournament, ordered_teams, outcome, seed, iteration).rows(iteration)
+            tracing.render(rows, ordered_teams)
+
+    elif selection == '16':
+        tournament_format = input(f"Format ({'/'.join(TOURNAMENT_FORMATS)}): ").strip() or 'double_elim'
+        mode = input(f"Mode ({'/'.join(variance.MODES)}): ").strip() or 'antithetic'
+        target = input("Target team: ").strip() if mode == 'importance' else None
+        tilt = float(input(f"Tilt (blank for {variance.DEFAULT_TILT}): ").strip() or variance.DEFAULT_TILT) if mode == 'importance' else variance.DEFAULT_TILT
+        num_iterations = int(input("Number of Iterations: "))
+
+        print_variance_reduced(simulate_variance_reduced(tournament_format, ordered_teams, outcome, mode, num_iterations, target, tilt))
+
+    elif selection == '17':
+        tournament_format = input(f"Format ({'/'.join(TOURNAMENT_FORMATS)}): ").strip() or 'double_elim'
+        num_iterations = int(input("Number of Iterations: "))
+        per_iteration = input("Also write every iteration's placements? (y/N): ").strip().lower() == 'y'
+
+        header, rows = simulate_placements(tournament_format, ordered_teams, outcome, num_iterations, output_dir, export_format, per_iteration)
+        print(f"\n{'Team':<7} {'Avg':>7}  " + " ".join(f"{name.split()[1]:>6}" for name in header[2:]))
+        for team, average, *percentages in rows:
+            print(f"{team:<7.5} {average:7.2f}  " + " ".join(f"{p:5.1f}%" for p in percentages))
+
+if __name__ == "__main__":
+    main()
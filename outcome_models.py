@@ -0,0 +1,129 @@
+import json
+import random
+
+import numpy as np
+
+from kernels import team_arrays
+from players import REGION_UNCERTAINTY
+
+# Outcome models decide who wins a game. The default is the score model in main.simulate_game, which works
+# straight from the team_stats dict. Any object with a simulate_game(team1, team2) method can be passed to the
+# engines in place of team_stats and is used for every game instead; batch_inputs(teams) lets the vectorized
+# batch functions use it too.
+
+OUTCOME_MODELS = ['score', 'rating']
+
+# The constants of main.simulate_game and read_team_data's regional uncertainty offsets, by name, so fitted
+# values (see calibration.py) can replace them
+DEFAULT_GAME_PARAMETERS = {
+    'goal_weight': 0.9,
+    'assist_weight': 0.065,
+    'save_weight': 0.035,
+    'form_low': 0.85,
+    'form_high': 1.05,
+    'uncertainty_low': 0.25,
+    'uncertainty_high': 0.85,
+    'score_low': 50.0,
+    'score_high': 100.0,
+    'me_uncertainty': REGION_UNCERTAINTY['ME'],
+    'sam_uncertainty': REGION_UNCERTAINTY['SAM'],
+}
+
+# Parameter holding each region's uncertainty offset
+REGION_PARAMETERS = {'ME': 'me_uncertainty', 'SAM': 'sam_uncertainty'}
+
+# Elo points per point of composite score. About 20 makes rating model game odds track the score model's
+# on the current player sheet.
+RATING_POINTS_PER_SCORE = 20.0
+
+# Rating difference that makes one team 10 times as likely to win a game as the other
+RATING_SCALE = 400.0
+
+
+def load_game_parameters(path):
+    # JSON of parameter values; anything missing keeps its default
+    parameters = dict(DEFAULT_GAME_PARAMETERS)
+    with open(path, mode='r') as file:
+        parameters.update(json.load(file))
+    return parameters
+
+
+class ScoreModel:
+    # main.simulate_game's formula with its constants and the regional offsets taken from parameters.
+    # team_stats comes from read_team_data, so the default offsets are swapped for the given ones.
+    def __init__(self, team_stats, team_regions, parameters):
+        self.parameters = dict(DEFAULT_GAME_PARAMETERS, **parameters)
+        self.team_stats = {}
+        for team, stats in team_stats.items():
+            region = team_regions.get(team, '')
+            self.team_stats[team] = dict(stats)
+            if region in REGION_PARAMETERS:
+                self.team_stats[team]['Uncertainty'] += self.parameters[REGION_PARAMETERS[region]] - REGION_UNCERTAINTY[region]
+
+    def __iter__(self):
+        return iter(self.team_stats)
+
+    def __contains__(self, team):
+        return team in self.team_stats
+
+    def simulate_game(self, team1, team2):
+        p = self.parameters
+        stats1, stats2 = self.team_stats[team1], self.team_stats[team2]
+        base_score_team1 = (stats1['Goals'] / stats1['Shots']) * p['goal_weight'] + stats1['Assists'] * p['assist_weight'] - stats2['Saves'] * p['save_weight']
+        base_score_team2 = (stats2['Goals'] / stats2['Shots']) * p['goal_weight'] + stats2['Assists'] * p['assist_weight'] - stats1['Saves'] * p['save_weight']
+
+        score_variation_team1 = random.uniform(base_score_team1 * p['form_low'], base_score_team1 * p['form_high'])
+        score_variation_team2 = random.uniform(base_score_team2 * p['form_low'], base_score_team2 * p['form_high'])
+
+        variation_team1 = random.uniform(stats1['Uncertainty'] * p['uncertainty_low'], stats1['Uncertainty'] * p['uncertainty_high'])
+        variation_team2 = random.uniform(stats2['Uncertainty'] * p['uncertainty_low'], stats2['Uncertainty'] * p['uncertainty_high'])
+
+        team1_score = random.uniform(p['score_low'] * (score_variation_team1 - variation_team1), p['score_high'] * (score_variation_team1 - variation_team1))
+        team2_score = random.uniform(p['score_low'] * (score_variation_team2 - variation_team2), p['score_high'] * (score_variation_team2 - variation_team2))
+        return team1_score, team2_score
+
+    def batch_inputs(self, teams):
+        # Stats array and keyword arguments for the vectorized batch functions
+        return team_arrays(self.team_stats, teams), {'parameters': self.parameters}
+
+
+class RatingModel:
+    # Each game is one lookup in a precomputed pairwise win probability table plus one uniform draw
+    def __init__(self, ratings, scale=RATING_SCALE):
+        self.ratings = dict(ratings)
+        self.scale = scale
+        self.probabilities = {
+            (team1, team2): 1 / (1 + 10 ** ((rating2 - rating1) / scale))
+            for team1, rating1 in self.ratings.items()
+            for team2, rating2 in self.ratings.items()
+        }
+
+    @classmethod
+    def from_composite_scores(cls, teams, composite_scores, points_per_score=RATING_POINTS_PER_SCORE, scale=RATING_SCALE):
+        # Ratings centred on 1500, spread in proportion to the composite scores
+        mean_score = sum(composite_scores) / len(composite_scores)
+        return cls({team: 1500 + (score - mean_score) * points_per_score for team, score in zip(teams, composite_scores)}, scale)
+
+    def __iter__(self):
+        # Iterates over team names like a team_stats dict does
+        return iter(self.ratings)
+
+    def __contains__(self, team):
+        return team in self.ratings
+
+    def win_probability(self, team1, team2):
+        return self.probabilities[(team1, team2)]
+
+    def simulate_game(self, team1, team2):
+        # Scores of 1 and 0, so the series functions can compare them like the score model's
+        if random.random() < self.probabilities[(team1, team2)]:
+            return 1.0, 0.0
+        return 0.0, 1.0
+
+    def probability_matrix(self, teams):
+        # Row team beats column team
+        return np.array([[self.probabilities[(team1, team2)] for team2 in teams] for team1 in teams])
+
+    def batch_inputs(self, teams):
+        # The vectorized batch functions only need the probability table
+        return None, {'probabilities': self.probability_matrix(teams)}
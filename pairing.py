@@ -0,0 +1,106 @@
+# Swiss pairings without rematches. Each team keeps a bitset of the teams it has already played in the stage, and
+# a record bucket is paired with the first matching, in preference order, that has no rematch. The preferred
+# matching is the plain adjacent one set_matchups gives (1st v 2nd, 3rd v 4th, ...), so buckets without a
+# possible rematch are paired exactly as before.
+#
+# Buckets of up to TABLE_MAX_SIZE teams use precomputed tables: every perfect matching of the bucket positions,
+# in preference order, with a bitmask of the position pairs it uses. The bucket's rematches are a bitmask over the
+# same pairs, so checking a matching is a single AND. Larger buckets fall back to a depth-first search that gives
+# up when the round's node budget runs out.
+
+TABLE_MAX_SIZE = 8
+
+# Search nodes a Swiss round may visit before falling back to adjacent pairs. A count rather than a time limit, so
+# a seeded run pairs the same way however loaded the machine is.
+DEFAULT_ROUND_BUDGET = 2000
+
+
+def _matchings(positions):
+    # Perfect matchings of positions, the first free position taking the closest partner first
+    if not positions:
+        yield []
+        return
+    first = positions[0]
+    for k in range(1, len(positions)):
+        rest = positions[1:k] + positions[k + 1:]
+        for matching in _matchings(rest):
+            yield [(first, positions[k])] + matching
+
+
+def _pair_slots(size):
+    # Bit position of every (i, j) pair, i < j
+    return {(i, j): slot for slot, (i, j) in enumerate((i, j) for i in range(size) for j in range(i + 1, size))}
+
+
+PAIR_SLOTS = {size: _pair_slots(size) for size in range(2, TABLE_MAX_SIZE + 1, 2)}
+PAIRING_TABLES = {
+    size: [(matching, sum(1 << PAIR_SLOTS[size][pair] for pair in matching)) for matching in _matchings(list(range(size)))]
+    for size in range(2, TABLE_MAX_SIZE + 1, 2)
+}
+
+
+class SwissPairing:
+    def __init__(self, teams, round_budget=DEFAULT_ROUND_BUDGET):
+        self.team_ids = {team: team_id for team_id, team in enumerate(teams)}
+        self.played = [0] * len(self.team_ids)
+        self.round_budget = round_budget
+        self.round = None
+        self.steps_left = 0
+
+    def mark(self, matchups):
+        for team1, team2 in matchups:
+            team1_id, team2_id = self.team_ids[team1], self.team_ids[team2]
+            self.played[team1_id] |= 1 << team2_id
+            self.played[team2_id] |= 1 << team1_id
+
+    def pair(self, bucket, round_num):
+        # Matchups for a bucket in standings order; the pairs are marked as played
+        if round_num != self.round:
+            self.round = round_num
+            self.steps_left = self.round_budget
+
+        ids = [self.team_ids[team] for team in bucket]
+        size = len(ids)
+        rematches = 0
+        slot = 0
+        for i in range(size):
+            played = self.played[ids[i]]
+            for j in range(i + 1, size):
+                if played >> ids[j] & 1:
+                    rematches |= 1 << slot
+                slot += 1
+
+        matching = None
+        if rematches and size in PAIRING_TABLES:
+            for candidate, mask in PAIRING_TABLES[size]:
+                if not mask & rematches:
+                    matching = candidate
+                    break
+            else:
+                # No clean matching, so the one with the fewest rematches
+                matching = min(PAIRING_TABLES[size], key=lambda entry: (entry[1] & rematches).bit_count())[0]
+        elif rematches:
+            matching = self._search(ids, list(range(size)))
+        if matching is None:
+            matching = [(i, i + 1) for i in range(0, size - 1, 2)]
+
+        matchups = [[bucket[i], bucket[j]] for i, j in matching]
+        self.mark(matchups)
+        return matchups
+
+    def _search(self, ids, free):
+        # Depth-first, closest partner first; None when there's no clean matching or the budget has run out
+        if not free:
+            return []
+        if self.steps_left <= 0:
+            return None
+        self.steps_left -= 1
+        first = free[0]
+        played = self.played[ids[first]]
+        for k in range(1, len(free)):
+            if played >> ids[free[k]] & 1:
+                continue
+            rest = self._search(ids, free[1:k] + free[k + 1:])
+            if rest is not None:
+                return [(first, free[k])] + rest
+        return None
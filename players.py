@@ -0,0 +1,94 @@
+import csv
+
+import numpy as np
+
+from kernels import STAT_COLUMNS, UNCERTAINTY
+
+# Player-level model: one row per player in a player x stat matrix, and a team x roster-slot index into it.
+# Team stat lines are gathered from the matrix when needed, so a roster move is just a different index array
+# and a whole batch of candidate rosters can be aggregated in one numpy call.
+
+# Player sheet columns, in the kernels.STAT_COLUMNS order
+PLAYER_COLUMNS = ['Goals Per Game', 'Assists Per Game', 'Saves Per Game', 'Shots Per Game', 'Uncertainty Factor']
+
+# Added to each player's uncertainty, the same regional adjustment read_team_data makes
+REGION_UNCERTAINTY = {'ME': 0.015, 'SAM': 0.010}
+
+
+class PlayerModel:
+    def __init__(self, players, stats, teams, rosters):
+        self.players = list(players)
+        self.player_ids = {player: player_id for player_id, player in enumerate(self.players)}
+        self.stats = stats
+        self.teams = list(teams)
+        self.team_ids = {team: team_id for team_id, team in enumerate(self.teams)}
+        # rosters[team_id, slot] is a player id, -1 for an empty slot on a short roster
+        self.rosters = rosters
+
+    @classmethod
+    def from_csv(cls, csv_file):
+        players, stats, roster_lists = [], [], {}
+        with open(csv_file, mode='r') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                line = [float(row[column]) for column in PLAYER_COLUMNS]
+                line[UNCERTAINTY] += REGION_UNCERTAINTY.get(row.get('Region', ''), 0.0)
+                roster_lists.setdefault(row['Team Name'], []).append(len(players))
+                players.append(row['Player Name'])
+                stats.append(line)
+
+        # The sheet can list two players under one name, so those are told apart by team, e.g. 'Dying (CLNT)'
+        player_teams = {player_id: team for team, roster in roster_lists.items() for player_id in roster}
+        players = [f"{player} ({player_teams[player_id]})" if players.count(player) > 1 else player
+                   for player_id, player in enumerate(players)]
+
+        teams = list(roster_lists)
+        rosters = np.full((len(teams), max(len(roster) for roster in roster_lists.values())), -1, dtype=np.int64)
+        for team_id, team in enumerate(teams):
+            rosters[team_id, :len(roster_lists[team])] = roster_lists[team]
+        return cls(players, np.array(stats, dtype=np.float64), teams, rosters)
+
+    def team_arrays(self, rosters=None):
+        # Mean stat line of every roster. rosters can carry leading batch dimensions, e.g. (moves, teams, slots),
+        # and the result has the same leading shape with one stat row per team.
+        rosters = self.rosters if rosters is None else rosters
+        filled = rosters >= 0
+        lines = self.stats[np.where(filled, rosters, 0)] * filled[..., None]
+        return lines.sum(axis=-2) / filled.sum(axis=-1)[..., None]
+
+    def team_stats(self, rosters=None):
+        # Same shape as read_team_data, so the result can go straight into the tournament engines
+        return self.stats_dict(self.team_arrays(rosters))
+
+    def stats_dict(self, arrays):
+        # One (teams, stats) slice of team_arrays as a team_stats dict
+        return {team: {stat: float(arrays[team_id, j]) for j, stat in enumerate(STAT_COLUMNS)}
+                for team_id, team in enumerate(self.teams)}
+
+    def roster(self, team, rosters=None):
+        rosters = self.rosters if rosters is None else rosters
+        return [self.players[player_id] for player_id in rosters[self.team_ids[team]] if player_id >= 0]
+
+    def team_of(self, player):
+        return self.teams[int(np.argwhere(self.rosters == self.player_ids[player])[0, 0])]
+
+    def candidate_moves(self, team):
+        # Every (incoming, outgoing) pair that brings a player from another roster into team
+        own = [player_id for player_id in self.rosters[self.team_ids[team]] if player_id >= 0]
+        return [(self.players[incoming], self.players[outgoing])
+                for incoming in range(len(self.players)) if incoming not in own
+                for outgoing in own]
+
+    def apply_moves(self, moves):
+        # One roster array per move, shape (len(moves), teams, slots). A move (incoming, outgoing) puts incoming
+        # in outgoing's slot; if incoming already had a slot, outgoing takes it, so a move between two rosters is a trade.
+        incoming = np.array([self.player_ids[player_in] for player_in, _ in moves], dtype=np.int64)[:, None, None]
+        outgoing = np.array([self.player_ids[player_out] for _, player_out in moves], dtype=np.int64)[:, None, None]
+        rosters = np.broadcast_to(self.rosters, (len(moves),) + self.rosters.shape)
+        return np.where(rosters == outgoing, incoming, np.where(rosters == incoming, outgoing, rosters))
+
+
+def read_moves(csv_file):
+    # Roster moves as 'Player In', 'Player Out' rows
+    with open(csv_file, mode='r') as file:
+        return [(row['Player In'], row['Player Out']) for row in csv.DictReader(file)]
@@ -0,0 +1,204 @@
+import cProfile
+import functools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Simulation functions that get wrapped with a timer, and the phase each one is reported under.
+# Nothing here touches the simulation unless profiling is switched on, so a normal run pays nothing.
+PHASES = {
+    'simulate_game': 'game',
+    'simulate_series': 'series',
+    'update_standings': 'standings',
+    'sort_by_standings': 'sorting',
+    'sort_final_standings': 'sorting',
+    'rank_standings': 'sorting',
+    'set_matchups': 'pairing',
+    'group_stage': 'stage',
+    'swiss_format': 'stage',
+    'simulate_single_elim_tournament': 'tournament',
+    'simulate_double_elim_tournament': 'tournament',
+    'group_stage_playoffs': 'tournament',
+    'swiss_format_playoffs': 'tournament',
+}
+
+# Every random.* function the simulation draws from
+RNG_FUNCTIONS = ['random', 'uniform', 'shuffle', 'choice', 'randint']
+
+
+class SimulationProfiler:
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.calls = Counter()
+        self.inclusive = Counter()
+        self.exclusive = Counter()
+        self.rng_calls = 0
+        self._stack = []
+        self._original_functions = {}
+        self._original_rng = {}
+
+    def _timed(self, phase, function):
+        calls, inclusive, exclusive, stack = self.calls, self.inclusive, self.exclusive, self._stack
+        perf_counter = time.perf_counter
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            calls[phase] += 1
+            stack.append(0.0)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                child_time = stack.pop()
+                inclusive[phase] += elapsed
+                exclusive[phase] += elapsed - child_time
+                # Time spent here is child time for whichever phase called us
+                if stack:
+                    stack[-1] += elapsed
+
+        return wrapper
+
+    def _counted(self, function):
+        def wrapper(*args, **kwargs):
+            self.rng_calls += 1
+            return function(*args, **kwargs)
+        return wrapper
+
+    def install(self):
+        for name, phase in PHASES.items():
+            if name in self.namespace:
+                self._original_functions[name] = self.namespace[name]
+                self.namespace[name] = self._timed(phase, self.namespace[name])
+
+        for name in RNG_FUNCTIONS:
+            self._original_rng[name] = getattr(random, name)
+            setattr(random, name, self._counted(self._original_rng[name]))
+
+    def uninstall(self):
+        for name, function in self._original_functions.items():
+            self.namespace[name] = function
+        for name, function in self._original_rng.items():
+            setattr(random, name, function)
+
+        self._original_functions = {}
+        self._original_rng = {}
+
+    def report(self, file=None):
+        file = file or sys.stdout
+        games = self.calls['game']
+        series = self.calls['series']
+        tournaments = self.calls['tournament']
+
+        print("\n\033[1mProfile\033[0m", file=file)
+        print(f"Games: {games}  Series: {series}  Tournaments: {tournaments}", file=file)
+        if series:
+            print(f"Games per series: {games / series:.2f}", file=file)
+        print(f"RNG calls: {self.rng_calls}", end="", file=file)
+        if tournaments:
+            print(f" ({self.rng_calls / tournaments:.1f} per tournament)", end="", file=file)
+        print(file=file)
+
+        print(f"\n{'Phase':<12} {'Calls':>12} {'Self (s)':>10} {'Total (s)':>10} {'Self %':>8} {'us/call':>9}", file=file)
+        # Interactive prompts happen inside the run, so percentages are of the time spent in profiled phases
+        profiled_time = sum(self.exclusive.values()) or 1e-12
+        for phase, self_time in self.exclusive.most_common():
+            calls = self.calls[phase]
+            per_call = self_time / calls * 1e6 if calls else 0.0
+            print(f"{phase:<12} {calls:>12} {self_time:>10.3f} {self.inclusive[phase]:>10.3f} "
+                  f"{self_time / profiled_time * 100:>7.1f}% {per_call:>9.2f}", file=file)
+        print(f"{'total':<12} {'':>12} {sum(self.exclusive.values()):>10.3f}", file=file)
+
+
+class StackSampler:
+    # Samples the call stack of one thread at a fixed interval and keeps counts of each distinct stack.
+    # The output is the "collapsed" format (frame;frame;frame count) read by flamegraph.pl and speedscope.
+    def __init__(self, thread_id=None, interval=0.001):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                # Skip the timing wrappers so stacks look the same with or without --profile
+                if code.co_filename != __file__:
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(names))] += 1
+
+    def start(self):
+        # The sampler only runs when the simulation thread releases the GIL, so shorten the switch
+        # interval or the samples pile up on the progress print (the only place that does I/O)
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval / 2)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def write(self, path):
+        with open(path, mode='w') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def _dump_profile(path):
+    if path.endswith('.html') or path.endswith('.txt'):
+        # pyinstrument is optional, only needed for its html/text reports
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(path, mode='w') as file:
+                file.write(profiler.output_html() if path.endswith('.html') else profiler.output_text())
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+
+
+@contextmanager
+def profile_run(namespace, counters=False, dump_path=None, stacks_path=None):
+    # namespace is the globals() of the module whose simulation functions should be timed
+    profiler = SimulationProfiler(namespace) if counters else None
+    sampler = StackSampler() if stacks_path else None
+
+    if profiler:
+        profiler.install()
+    if sampler:
+        sampler.start()
+    try:
+        if dump_path:
+            with _dump_profile(dump_path):
+                yield profiler
+        else:
+            yield profiler
+    finally:
+        if sampler:
+            sampler.stop()
+            sampler.write(stacks_path)
+        if profiler:
+            profiler.uninstall()
+            profiler.report()
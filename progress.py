@@ -0,0 +1,119 @@
+import multiprocessing
+import sys
+import threading
+import time
+
+# How often progress is redrawn on a terminal, and how often a log line is written when stdout is redirected
+DEFAULTS = {
+    'updates_per_second': 4.0,
+    'log_interval': 10.0,
+}
+
+# Set in pool workers by init_worker so simulation code can report progress without holding the reporter
+_worker_counter = None
+
+
+def configure(updates_per_second=None, log_interval=None):
+    if updates_per_second is not None:
+        DEFAULTS['updates_per_second'] = updates_per_second
+    if log_interval is not None:
+        DEFAULTS['log_interval'] = log_interval
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m{seconds:02d}s"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
+
+
+def shared_counter():
+    return multiprocessing.Value('q', 0)
+
+
+def init_worker(counter):
+    # Pool initializer: ProcessPoolExecutor(initializer=progress.init_worker, initargs=(reporter.worker_counter(),))
+    global _worker_counter
+    _worker_counter = counter
+
+
+def advance(n=1):
+    # Called from pool workers, ideally once per chunk rather than once per tournament
+    if _worker_counter is not None:
+        with _worker_counter.get_lock():
+            _worker_counter.value += n
+
+
+class ProgressReporter:
+    # The simulation loop only bumps an integer; a background thread does all the formatting and writing,
+    # at most updates_per_second times a second on a terminal and every log_interval seconds otherwise.
+    def __init__(self, total, label="Tournaments Done", stream=None, updates_per_second=None, log_interval=None, counter=None):
+        self.total = total
+        self.label = label
+        self.stream = stream or sys.stdout
+        self.interactive = getattr(self.stream, 'isatty', lambda: False)()
+        if self.interactive:
+            self.interval = 1.0 / (updates_per_second or DEFAULTS['updates_per_second'])
+        else:
+            self.interval = log_interval or DEFAULTS['log_interval']
+
+        self.done = 0
+        # An existing shared_counter() can be passed in when the pool outlives this reporter
+        self._shared = counter
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = None
+
+    def update(self, n=1):
+        self.done += n
+
+    def worker_counter(self):
+        # Shared counter for worker processes, summed with the local count on every redraw
+        if self._shared is None:
+            self._shared = shared_counter()
+        return self._shared
+
+    def completed(self):
+        return self.done + (self._shared.value if self._shared is not None else 0)
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._render(final=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._render()
+
+    def _render(self, final=False):
+        done = self.completed()
+        elapsed = time.perf_counter() - self._started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - done) / rate if rate > 0 else 0.0
+
+        if self.interactive:
+            line = f"\r{self.label}: {done}/{self.total}  {rate:,.1f}/s"
+            line += f"  {format_duration(elapsed)} elapsed" if final else f"  ETA {format_duration(eta)}"
+            self.stream.write(line + "\033[K" + ("\n" if final else ""))
+        else:
+            percent = done / self.total * 100 if self.total else 100.0
+            self.stream.write(f"progress label=\"{self.label}\" done={done} total={self.total} percent={percent:.1f} "
+                              f"rate={rate:.1f} elapsed={elapsed:.1f} eta={eta:.1f}\n")
+        self.stream.flush()
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from kernels import STAT_COLUMNS
+
+# Sensitivity of title odds to each team's stats. Every team's Goals/Assists/Saves/Shots/Uncertainty is moved up
+# and down by a fraction delta of its value, one at a time, and all of those scenarios plus the unperturbed one are
+# simulated as one batch with the same random numbers. With common random numbers the difference between the up
+# and down runs is mostly the effect of the change rather than sampling noise, so a central difference gives a
+# usable derivative from far fewer iterations.
+
+
+def perturb(stats, delta):
+    # stats is (teams, stats). Returns the scenario array (scenarios, teams, stats), where scenario 0 is the
+    # unperturbed one, and (team id, stat column, direction) for every other scenario.
+    scenarios = [(team_id, column, direction)
+                 for team_id in range(stats.shape[0])
+                 for column in range(stats.shape[1])
+                 for direction in (1, -1)]
+    stats_batch = np.repeat(stats[None], len(scenarios) + 1, axis=0)
+    for i, (team_id, column, direction) in enumerate(scenarios, start=1):
+        stats_batch[i, team_id, column] *= 1 + direction * delta
+    return stats_batch, scenarios
+
+
+def sensitivity_matrix(odds, stats, scenarios, delta, teams):
+    # odds is (scenarios, teams) title probabilities. Central difference of each team's own title odds, in
+    # percentage points per unit of the stat, as a teams x stats DataFrame.
+    matrix = np.zeros(stats.shape)
+    up = {}
+    for i, (team_id, column, direction) in enumerate(scenarios, start=1):
+        if direction == 1:
+            up[(team_id, column)] = odds[i, team_id]
+        else:
+            step = 2 * delta * abs(stats[team_id, column])
+            matrix[team_id, column] = (up[(team_id, column)] - odds[i, team_id]) / step * 100 if step else 0.0
+    return pd.DataFrame(matrix, index=teams, columns=STAT_COLUMNS)
@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import os
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from aiohttp import web
+
+import batch
+import kernels
+import main
+
+# Long-running forecast service. Team data is loaded once (in the server and in every pool worker),
+# simulations run on a process pool so the event loop stays responsive, and identical concurrent
+# requests share one computation.
+
+# Per-process state, filled by init_worker in the pool processes and by create_app in the server
+_state = {}
+
+# Largest iteration count each endpoint accepts
+MAX_ITERATIONS = {'series': 10000000, 'forecast': 1000000, 'head_to_head': 1000000}
+
+# Longest time budget a forecast may ask for, in seconds
+MAX_TIME_BUDGET = 300.0
+
+# Finished results the coalescer keeps at most
+DEFAULT_CACHE_SIZE = 256
+
+# Application state set up by create_app
+WORKERS = web.AppKey('workers', int)
+BACKEND = web.AppKey('backend', str)
+COALESCER = web.AppKey('coalescer', 'Coalescer')
+POOL = web.AppKey('pool', ProcessPoolExecutor)
+
+
+def load_state(players_path, rankings_path):
+    _state['team_stats'] = main.read_team_data(players_path)
+    _state['ordered_teams'] = main.get_ordered_teams_from_csv(rankings_path)
+
+
+def init_worker(players_path, rankings_path):
+    # Forked workers inherit the parent's generator state, so give each its own
+    random.seed()
+    load_state(players_path, rankings_path)
+
+
+def series_totals(team1, team2, best_of, num_iterations):
+    stats = kernels.team_arrays(_state['team_stats'], [team1, team2])
+    rng = np.random.default_rng(random.getrandbits(64))
+    return [int(total) for total in batch.series_totals(stats, 0, 1, best_of // 2 + 1, num_iterations, rng)]
+
+
+def tournament_wins(tournament_format, num_iterations, time_budget, backend):
+    teams = _state['ordered_teams']
+    run_batch = main.make_batch_runner(main.TOURNAMENT_FORMATS[tournament_format], teams, _state['team_stats'], backend)
+    if time_budget:
+        estimate = main.estimate_within_time_budget(run_batch, teams, time_budget)
+        return estimate['total_wins'], estimate['iterations']
+    return run_batch(num_iterations), num_iterations
+
+
+def head_to_head_totals(pairs, num_iterations):
+    # Series totals for a share of the team pairs. No progress reporter: the service doesn't write to stdout.
+    stats = kernels.team_arrays(_state['team_stats'], list(_state['team_stats']))
+    rng = np.random.default_rng(random.getrandbits(64))
+    return main.head_to_head_totals(stats, {}, pairs, num_iterations, rng)
+
+
+class Coalescer:
+    # Requests with the same key share one in-flight computation. Finished results are kept for ttl seconds, and
+    # at most max_entries of them: past that, the least recently used result goes first.
+    def __init__(self, ttl, max_entries=DEFAULT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.in_flight = {}
+        self.results = OrderedDict()
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [key for key, (expires, _) in self.results.items() if expires <= now]:
+            del self.results[key]
+
+    async def get(self, key, compute):
+        self._evict_expired()
+        cached = self.results.get(key)
+        if cached is not None:
+            self.results.move_to_end(key)
+            return cached[1]
+
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda finished: self._finish(key, finished))
+        # shield so one client disconnecting doesn't cancel the computation for everyone else
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        self.in_flight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self.results[key] = (time.monotonic() + self.ttl, task.result())
+            self.results.move_to_end(key)
+            while len(self.results) > self.max_entries:
+                self.results.popitem(last=False)
+
+    def cached(self, prefix):
+        self._evict_expired()
+        return {key: result for key, (_, result) in self.results.items() if key[0] == prefix}
+
+
+def _int_param(request, name, default, low=None, high=None):
+    try:
+        value = int(request.query.get(name, default))
+    except ValueError:
+        raise web.HTTPBadRequest(reason=f"{name} must be an integer")
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise web.HTTPBadRequest(reason=f"{name} must be between {low} and {high}")
+    return value
+
+
+def _float_param(request, name):
+    value = request.query.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        raise web.HTTPBadRequest(reason=f"{name} must be a number")
+
+
+async def _run(request, function, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(request.app[POOL], function, *args)
+
+
+async def teams(request):
+    return web.json_response({'teams': list(_state['team_stats']), 'seeding': _state['ordered_teams']})
+
+
+async def series(request):
+    team1, team2 = request.query.get('team1'), request.query.get('team2')
+    for team in (team1, team2):
+        if team not in _state['team_stats']:
+            raise web.HTTPBadRequest(reason=f"Unknown team {team!r}")
+    best_of = _int_param(request, 'best_of', 7)
+    if best_of not in main.BEST_OF:
+        raise web.HTTPBadRequest(reason=f"best_of must be one of {', '.join(map(str, main.BEST_OF))}")
+    num_iterations = _int_param(request, 'iterations', 100000, 1, MAX_ITERATIONS['series'])
+
+    # A warm head-to-head table with at least as many iterations answers BO5/BO7 odds without simulating
+    label = f"bo{best_of}"
+    for (_, table_iterations), matrices in request.app[COALESCER].cached('head_to_head').items():
+        if table_iterations >= num_iterations and f"{label}_win" in matrices:
+            return web.json_response({
+                'team1': team1, 'team2': team2, 'best_of': best_of, 'iterations': table_iterations,
+                'team1_win_probability': matrices[f"{label}_win"][team2][team1],
+                'team2_win_probability': matrices[f"{label}_win"][team1][team2],
+                'team1_expected_games': matrices[f"{label}_games"][team2][team1],
+                'team2_expected_games': matrices[f"{label}_games"][team1][team2],
+            })
+
+    key = ('series', team1, team2, best_of, num_iterations)
+    totals = await request.app[COALESCER].get(key, lambda: _run(request, series_totals, team1, team2, best_of, num_iterations))
+    team1_series_win, team2_series_win, team1_game_wins, team2_game_wins = totals
+    return web.json_response({
+        'team1': team1, 'team2': team2, 'best_of': best_of, 'iterations': num_iterations,
+        'team1_win_probability': team1_series_win / num_iterations,
+        'team2_win_probability': team2_series_win / num_iterations,
+        'team1_expected_games': team1_game_wins / num_iterations,
+        'team2_expected_games': team2_game_wins / num_iterations,
+    })
+
+
+async def forecast(request):
+    tournament_format = request.match_info['format']
+    if tournament_format not in main.TOURNAMENT_FORMATS:
+        raise web.HTTPNotFound(reason=f"Unknown format {tournament_format!r}")
+    num_iterations = _int_param(request, 'iterations', 10000, 1, MAX_ITERATIONS['forecast'])
+    time_budget = _float_param(request, 'time_budget')
+    if time_budget is not None and not 0 < time_budget <= MAX_TIME_BUDGET:
+        raise web.HTTPBadRequest(reason=f"time_budget must be more than 0 and at most {MAX_TIME_BUDGET}")
+    # Only formats with a compiled kernel can use the numba backend
+    backend = request.app[BACKEND] if main.TOURNAMENT_FORMATS[tournament_format].__name__ in main.KERNEL_TOURNAMENTS else 'python'
+
+    async def compute():
+        # Split the work across the pool and merge the win counts
+        workers = request.app[WORKERS]
+        chunks = [num_iterations // workers + (1 if i < num_iterations % workers else 0) for i in range(workers)]
+        results = await asyncio.gather(*[
+            _run(request, tournament_wins, tournament_format, chunk, time_budget, backend)
+            for chunk in chunks if chunk or time_budget
+        ])
+        total_wins = {team: 0 for team in _state['ordered_teams']}
+        total_iterations = 0
+        for wins, iterations in results:
+            for team, count in wins.items():
+                total_wins[team] += count
+            total_iterations += iterations
+        return main.win_estimate(total_wins, total_iterations)
+
+    key = ('forecast', tournament_format, num_iterations, time_budget)
+    estimate = await request.app[COALESCER].get(key, compute)
+    return web.json_response({'format': tournament_format, **estimate})
+
+
+async def head_to_head_table(request):
+    num_iterations = _int_param(request, 'iterations', 10000, 1, MAX_ITERATIONS['head_to_head'])
+
+    async def compute():
+        # Team pairs are dealt out across the pool and the totals put back in pair order
+        teams = list(_state['team_stats'])
+        workers = request.app[WORKERS]
+        shares = [share for share in (main.head_to_head_pairs(teams)[i::workers] for i in range(workers)) if share]
+        results = await asyncio.gather(*[_run(request, head_to_head_totals, share, num_iterations) for share in shares])
+        pairs = [pair for share in shares for pair in share]
+        totals = [pair_totals for share_totals in results for pair_totals in share_totals]
+        matrices = main.head_to_head_frames(teams, pairs, totals, num_iterations)
+        # The diagonal is NaN, which isn't valid JSON
+        return {name: df.astype(object).where(df.notna(), None).to_dict() for name, df in matrices.items()}
+
+    key = ('head_to_head', num_iterations)
+    matrices = await request.app[COALESCER].get(key, compute)
+    return web.json_response({'iterations': num_iterations, **matrices})
+
+
+def create_app(players_path, rankings_path, workers=None, backend='python', ttl=300.0, cache_size=DEFAULT_CACHE_SIZE):
+    load_state(players_path, rankings_path)
+
+    app = web.Application()
+    app[WORKERS] = workers or os.cpu_count() or 1
+    app[BACKEND] = backend
+    app[COALESCER] = Coalescer(ttl, cache_size)
+
+    async def start_pool(app):
+        app[POOL] = ProcessPoolExecutor(app[WORKERS], initializer=init_worker, initargs=(players_path, rankings_path))
+        yield
+        app[POOL].shutdown(cancel_futures=True)
+
+    app.cleanup_ctx.append(start_pool)
+    app.router.add_get('/teams', teams)
+    app.router.add_get('/series', series)
+    app.router.add_get('/forecast/{format}', forecast)
+    app.router.add_get('/head_to_head', head_to_head_table)
+    return app
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="RLCS simulation service")
+    parser.add_argument('--players', default='RLCSsheet.csv', help="player sheet CSV")
+    parser.add_argument('--rankings', default='rankings.csv', help="rankings CSV used for seeding")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, help="simulation processes (default: one per CPU)")
+    parser.add_argument('--backend', choices=kernels.BACKENDS, default='python')
+    parser.add_argument('--cache-ttl', type=float, default=300.0, help="seconds a finished result is reused")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help="finished results kept at most")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    web.run_app(create_app(args.players, args.rankings, args.workers, kernels.select_backend(args.backend), args.cache_ttl, args.cache_size),
+                host=args.host, port=args.port)
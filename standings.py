@@ -0,0 +1,50 @@
+# Standings of a stage as parallel integer columns indexed by team id. Recording a series is six list increments
+# instead of eight nested dict updates, and ranking is a single sort on a tuple key per team.
+#
+# Tiebreaks, best first:
+#   stage standings  series wins, game differential, game wins
+#   final standings  series wins, fewer series losses, game differential, game wins
+# Teams still tied keep the order they were passed in (the sort is stable).
+
+
+class Standings:
+    def __init__(self, teams):
+        self.teams = list(teams)
+        self.team_ids = {team: team_id for team_id, team in enumerate(self.teams)}
+        self.series_wins = [0] * len(self.teams)
+        self.series_losses = [0] * len(self.teams)
+        self.game_wins = [0] * len(self.teams)
+        self.game_losses = [0] * len(self.teams)
+
+    def record_series(self, winner_id, loser_id, winner_games, loser_games):
+        self.series_wins[winner_id] += 1
+        self.series_losses[loser_id] += 1
+        self.game_wins[winner_id] += winner_games
+        self.game_wins[loser_id] += loser_games
+        self.game_losses[winner_id] += loser_games
+        self.game_losses[loser_id] += winner_games
+
+    def ranked(self, teams=None, final=False):
+        # teams (default: every team, in the order they were added) best first
+        team_ids = self.team_ids
+        series_wins, series_losses, game_wins, game_losses = self.series_wins, self.series_losses, self.game_wins, self.game_losses
+        if final:
+            def key(team):
+                team_id = team_ids[team]
+                return series_wins[team_id], -series_losses[team_id], game_wins[team_id] - game_losses[team_id], game_wins[team_id]
+        else:
+            def key(team):
+                team_id = team_ids[team]
+                return series_wins[team_id], game_wins[team_id] - game_losses[team_id], game_wins[team_id]
+        return sorted(self.teams if teams is None else teams, key=key, reverse=True)
+
+    def record(self, team):
+        # One team's record in the shape the old per-team standings dicts had, for printing
+        team_id = self.team_ids[team]
+        return {
+            'series_wins': self.series_wins[team_id],
+            'series_losses': self.series_losses[team_id],
+            'game_wins': self.game_wins[team_id],
+            'game_losses': self.game_losses[team_id],
+            'game_differential': self.game_wins[team_id] - self.game_losses[team_id],
+        }
@@ -0,0 +1,32 @@
+import os
+import random
+import sys
+
+import pytest
+
+# The modules live at the repository root, which isn't a package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import main
+
+
+@pytest.fixture(scope='session')
+def team_stats():
+    return main.read_team_data(os.path.join(ROOT, 'RLCSsheet.csv'))
+
+
+@pytest.fixture(scope='session')
+def ranked_teams():
+    return main.get_ranked_teams_from_csv(os.path.join(ROOT, 'rankings.csv'))
+
+
+@pytest.fixture(scope='session')
+def ordered_teams(ranked_teams):
+    return main.seed_bracket(ranked_teams)
+
+
+@pytest.fixture
+def seeded():
+    # Every test that simulates starts from the same random state
+    random.seed(1234)
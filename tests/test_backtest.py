@@ -0,0 +1,82 @@
+import json
+import math
+
+import pytest
+
+import backtest
+
+
+def event(name, winner, tournament_format='swiss'):
+    return {'name': name, 'format': tournament_format, 'winner': winner}
+
+
+def test_perfect_forecast_scores_zero():
+    report = backtest.score_forecasts([event('a', 'A')], {'a': {'total_wins': {'A': 10, 'B': 0}, 'iterations': 10}})
+    assert report['swiss']['brier'] == 0.0
+    assert report['swiss']['log_loss'] == 0.0
+
+
+def test_scores_average_over_events():
+    events = [event('a', 'A'), event('b', 'B')]
+    forecasts = {name: {'total_wins': {'A': 3, 'B': 1}, 'iterations': 4} for name in ('a', 'b')}
+    scores = backtest.score_forecasts(events, forecasts)['swiss']
+    assert scores['events'] == 2
+    # (0.25^2 + 0.25^2 + 0.75^2 + 0.75^2) / 2
+    assert scores['brier'] == pytest.approx(0.625)
+    assert scores['log_loss'] == pytest.approx(-(math.log(0.75) + math.log(0.25)) / 2)
+
+
+def test_unforecast_winner_keeps_log_loss_finite():
+    report = backtest.score_forecasts([event('a', 'C')], {'a': {'total_wins': {'A': 100}, 'iterations': 100}})
+    assert report['swiss']['log_loss'] == pytest.approx(-math.log(0.5 / 100))
+
+
+def test_calibration_bins():
+    events = [event(name, 'A') for name in 'abcd']
+    forecasts = {name: {'total_wins': {'A': 7, 'B': 3}, 'iterations': 10} for name in 'abcd'}
+    forecasts['d'] = {'total_wins': {'A': 10, 'B': 0}, 'iterations': 10}
+    calibration = backtest.score_forecasts(events, forecasts)['swiss']['calibration']
+    # (bin start, mean forecast, observed title rate, teams); a probability of 1 falls in the last bin
+    assert calibration == [(0.0, 0.0, 0.0, 1), (0.3, pytest.approx(0.3), 0.0, 3), (0.7, pytest.approx(0.7), 1.0, 3), (0.9, 1.0, 1.0, 1)]
+
+
+def test_formats_are_scored_apart():
+    events = [event('a', 'A', 'swiss'), event('b', 'A', 'groups')]
+    forecasts = {name: {'total_wins': {'A': 1}, 'iterations': 1} for name in 'ab'}
+    report = backtest.score_forecasts(events, forecasts)
+    assert set(report) == {'swiss', 'groups'}
+    tables = backtest.report_tables(report)
+    assert [row[0] for row in tables['scores'][1]] == ['swiss', 'groups']
+
+
+def test_events_and_cache(tmp_path):
+    complete = tmp_path / 'event1'
+    complete.mkdir()
+    (complete / 'players.csv').write_text('Team Name\nA\n')
+    (complete / 'seeding.csv').write_text('Team Name\nA\n')
+    (complete / 'results.json').write_text(json.dumps({'format': 'swiss', 'winner': 'A'}))
+    (tmp_path / 'event2').mkdir()
+
+    events = backtest.load_events(str(tmp_path))
+    assert [loaded['name'] for loaded in events] == ['event1']
+
+    key = backtest.input_hash(events[0], {'iterations': 10})
+    assert key != backtest.input_hash(events[0], {'iterations': 20})
+    assert backtest.load_cached(str(tmp_path), key) is None
+    backtest.store_cached(str(tmp_path), key, {'iterations': 10})
+    assert backtest.load_cached(str(tmp_path), key) == {'iterations': 10}
+    # The cache directory isn't an event
+    assert len(backtest.load_events(str(tmp_path))) == 1
+
+
+def test_model_changes_invalidate_the_cache(tmp_path, monkeypatch):
+    event_directory = tmp_path / 'event1'
+    event_directory.mkdir()
+    for file_name in ['players.csv', 'seeding.csv']:
+        (event_directory / file_name).write_text('Team Name\nA\n')
+    loaded = {'format': 'swiss', 'players_path': str(event_directory / 'players.csv'), 'seeding_path': str(event_directory / 'seeding.csv')}
+
+    assert backtest.model_fingerprint() == backtest.model_fingerprint()
+    key = backtest.input_hash(loaded, {'iterations': 10})
+    monkeypatch.setattr(backtest, 'model_fingerprint', lambda: 'edited model')
+    assert backtest.input_hash(loaded, {'iterations': 10}) != key
@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pytest
+
+import calibration
+import main
+from conftest import ROOT
+from outcome_models import DEFAULT_GAME_PARAMETERS
+
+
+@pytest.fixture(scope='module')
+def data(team_stats, ordered_teams):
+    team_regions = main.get_team_regions(os.path.join(ROOT, 'RLCSsheet.csv'))
+    results = [(ordered_teams[i], ordered_teams[i + 1], 4, i % 4) for i in range(0, 16, 2)]
+    results += [(ordered_teams[i], ordered_teams[i + 2], i % 3, 3) for i in range(0, 12, 3)]
+    return calibration.prepare(team_stats, team_regions, results)
+
+
+def test_series_win_probabilities():
+    p = np.array([0.5, 0.6, 0.6])
+    wins_needed = np.array([4, 1, 2])
+    # A BO3 at 0.6 a game is 0.6^2 + 2 * 0.6^2 * 0.4
+    assert np.allclose(calibration.series_win_probabilities(p, wins_needed), [0.5, 0.6, 0.648])
+
+
+@pytest.mark.parametrize('scaled', [
+    # Both score bounds
+    {'score_low': 2 * 50.0, 'score_high': 2 * 100.0},
+    # Both form bounds up, the weights down by as much
+    {'form_low': 2 * 0.85, 'form_high': 2 * 1.05, 'goal_weight': 0.9 / 2, 'assist_weight': 0.065 / 2, 'save_weight': 0.035 / 2},
+    # The weights and both uncertainty bounds
+    {'goal_weight': 3 * 0.9, 'assist_weight': 3 * 0.065, 'save_weight': 3 * 0.035, 'uncertainty_low': 3 * 0.25, 'uncertainty_high': 3 * 0.85},
+])
+def test_scalings_that_leave_every_winner_alone(data, scaled):
+    # The same seed draws the same uniforms, so the probabilities match exactly up to rounding
+    expected = calibration.game_probabilities(data, DEFAULT_GAME_PARAMETERS, samples=500)
+    assert np.allclose(calibration.game_probabilities(data, dict(DEFAULT_GAME_PARAMETERS, **scaled), samples=500), expected)
+
+
+def test_fitted_parameters_exclude_the_fixed_ones():
+    assert 'score_high' not in calibration.FITTED_PARAMETERS
+    assert 'form_high' not in calibration.FITTED_PARAMETERS
+    assert 'uncertainty_high' not in calibration.FITTED_PARAMETERS
+    assert set(calibration.FITTED_PARAMETERS) == set(calibration.BOUNDS)
+
+
+def test_score(data):
+    scores = calibration.score(data, DEFAULT_GAME_PARAMETERS, samples=500)
+    assert scores['negative_log_likelihood'] > 0
+    assert 0 < scores['brier'] < 1
+
+
+def test_fit_never_ends_worse_than_it_started(data, seeded):
+    fit = calibration.calibrate(data, generations=2, population=4, elite=2, samples=200, workers=1)
+    assert fit['fitted_scores']['negative_log_likelihood'] <= fit['start_scores']['negative_log_likelihood']
+    assert set(fit['parameters']) == set(DEFAULT_GAME_PARAMETERS)
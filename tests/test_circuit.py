@@ -0,0 +1,62 @@
+import json
+import os
+
+import pytest
+
+import main
+from conftest import ROOT
+
+
+@pytest.fixture(scope='module')
+def region_teams(ranked_teams):
+    team_regions = main.get_team_regions(os.path.join(ROOT, 'RLCSsheet.csv'))
+    return main.group_teams_by_region(ranked_teams, team_regions)
+
+
+def test_teams_grouped_in_ranking_order(ranked_teams, region_teams):
+    rank = {team: index for index, team in enumerate(ranked_teams)}
+    for teams in region_teams.values():
+        ranks = [rank.get(team, len(rank)) for team in teams]
+        assert ranks == sorted(ranks)
+
+
+def test_circuit_config_checks_major_slots(region_teams, tmp_path):
+    circuit = main.load_circuit_config(None, region_teams)
+    assert sum(circuit['major_slots'].values()) == len(main.SEEDING_ORDER)
+
+    path = tmp_path / 'circuit.json'
+    path.write_text(json.dumps({'major_slots': {'EU': 8, 'NA': 7}}))
+    with pytest.raises(ValueError, match='add up'):
+        main.load_circuit_config(str(path), region_teams)
+
+    path.write_text(json.dumps({'major_slots': {'SAM': 16}}))
+    with pytest.raises(ValueError, match='SAM has 16 major slots'):
+        main.load_circuit_config(str(path), region_teams)
+
+
+def test_round_robin_places_every_team(team_stats, ranked_teams, seeded):
+    teams = ranked_teams[:6]
+    placements = {}
+    winner = main.round_robin(teams, team_stats, placements)
+    assert sorted(placements.values()) == list(range(1, 7))
+    assert placements[winner] == 1
+
+
+def test_circuit_chunk_totals(team_stats, ranked_teams, region_teams, seeded):
+    circuit = main.load_circuit_config(None, region_teams)
+    region_teams = {region: teams for region, teams in region_teams.items() if region in circuit['major_slots']}
+    num_seasons = 2
+    regional_results = {
+        region: main.simulate_regional_chunk(teams, team_stats, circuit['regional_format'], num_seasons * circuit['splits'])
+        for region, teams in region_teams.items()
+    }
+    totals = main.simulate_circuit_chunk(ranked_teams, region_teams, regional_results, team_stats, circuit)
+
+    majors = num_seasons * circuit['splits']
+    assert sum(totals['major'].values()) == majors * len(main.SEEDING_ORDER)
+    assert sum(totals['major_wins'].values()) == majors
+    assert sum(totals['worlds'].values()) == num_seasons * len(main.SEEDING_ORDER)
+    assert sum(totals['worlds_wins'].values()) == num_seasons
+    # Each region sends its slots to every major
+    for region, slots in circuit['major_slots'].items():
+        assert sum(totals['major'][team] for team in region_teams[region]) == majors * slots
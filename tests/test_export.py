@@ -0,0 +1,67 @@
+import csv
+
+import openpyxl as op
+import pandas as pd
+import pytest
+
+import export
+
+
+def read_csv(path):
+    with open(path, newline='') as file:
+        return list(csv.reader(file))
+
+
+def test_csv_round_trip_blanks_missing_values(tmp_path):
+    path = tmp_path / 'table.csv'
+    export.write_csv(path, ['team', 'wins'], iter([['A', 1], ['B', float('nan')]]))
+    assert read_csv(path) == [['team', 'wins'], ['A', '1'], ['B', '']]
+
+
+def test_xlsx_splits_long_tables_across_sheets(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, 'XLSX_MAX_ROWS', 3)
+    path = tmp_path / 'book.xlsx'
+    rows = ([i, i * i] for i in range(5))
+    export.write_xlsx(path, {'squares': (['n', 'square'], rows), 'other': (['x'], [[1]])})
+
+    workbook = op.load_workbook(path)
+    assert workbook.sheetnames == ['squares', 'squares (2)', 'squares (3)', 'other']
+    sheets = [[list(row) for row in workbook[name].iter_rows(values_only=True)] for name in workbook.sheetnames[:3]]
+    assert sheets == [[['n', 'square'], [0, 0], [1, 1]],
+                      [['n', 'square'], [2, 4], [3, 9]],
+                      [['n', 'square'], [4, 16]]]
+
+
+def test_xlsx_split_sheet_names_stay_within_the_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, 'XLSX_MAX_ROWS', 2)
+    path = tmp_path / 'book.xlsx'
+    name = 'x' * 40
+    export.write_xlsx(path, {name: (['v'], [[1], [2]])})
+    assert op.load_workbook(path).sheetnames == ['x' * 31, 'x' * 27 + ' (2)']
+
+
+def test_write_tables_names_files(tmp_path):
+    single = export.write_tables(tmp_path, 'ratings', {'ratings': (['a'], [[1]])})
+    assert single == [str(tmp_path / 'ratings.csv')]
+
+    tables = {'summary': (['a'], [[1]]), 'detail': (['b'], [[2]])}
+    several = export.write_tables(tmp_path, 'backtest', tables)
+    assert several == [str(tmp_path / 'backtest_summary.csv'), str(tmp_path / 'backtest_detail.csv')]
+
+    workbook = export.write_tables(tmp_path, 'backtest', tables, output_format='xlsx')
+    assert workbook == [str(tmp_path / 'backtest.xlsx')]
+    assert op.load_workbook(workbook[0]).sheetnames == ['summary', 'detail']
+
+
+def test_write_tables_rejects_unknown_formats(tmp_path):
+    with pytest.raises(ValueError):
+        export.write_tables(tmp_path / 'out', 'ratings', {'ratings': (['a'], [])}, output_format='parquet')
+    assert not (tmp_path / 'out').exists()
+
+
+def test_dataframe_rows_are_plain_values():
+    df = pd.DataFrame({'team': ['A', 'B'], 'wins': [3, 1], 'share': [0.5, float('nan')]})
+    rows = list(export.dataframe_rows(df))
+    assert rows[0] == ['A', 3, 0.5]
+    assert type(rows[0][1]) is int
+    assert list(export.dataframe_rows(df, index=True))[1][0] == 1
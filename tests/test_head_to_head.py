@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+import main
+
+
+def test_matrices_are_complementary(team_stats, ordered_teams, seeded):
+    teams = ordered_teams[:4]
+    matrices = main.head_to_head_matrix(teams, team_stats, 200)
+    assert set(matrices) == {'bo5_win', 'bo5_games', 'bo7_win', 'bo7_games'}
+
+    for label, wins_needed in main.SERIES_LENGTHS.items():
+        win = matrices[f"{label}_win"].to_numpy()
+        games = matrices[f"{label}_games"].to_numpy()
+        assert np.isnan(np.diag(win)).all()
+        off_diagonal = ~np.eye(len(teams), dtype=bool)
+        # Every series has exactly one winner
+        assert np.allclose((win + win.T)[off_diagonal], 1.0)
+        # The winner of a series has wins_needed games, so between them the two teams average at least that many
+        assert ((games + games.T)[off_diagonal] >= wins_needed).all()
+
+
+def test_unknown_format_is_rejected_before_simulating(monkeypatch):
+    answers = iter(['', '10', 'xslx'])
+    monkeypatch.setattr('builtins.input', lambda prompt: next(answers))
+    monkeypatch.setattr(main, 'head_to_head_matrix', lambda *args: pytest.fail("simulated before checking the format"))
+    with pytest.raises(ValueError, match='xslx'):
+        main.run_selection('7', 'RLCSsheet.csv', {'G2': {}}, [], [])
+
+
+def test_writes_one_csv_per_matrix(team_stats, ordered_teams, tmp_path, seeded):
+    matrices = main.head_to_head_matrix(ordered_teams[:2], team_stats, 50)
+    main.write_head_to_head(matrices, output_dir=tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"head_to_head_{name}.csv" for name in sorted(matrices)]
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import batch
+import kernels
+import main
+
+
+def test_select_backend():
+    assert kernels.select_backend('python') == 'python'
+    with pytest.raises(ValueError):
+        kernels.select_backend('gpu')
+
+
+def test_series_counts_are_consistent(team_stats, ordered_teams):
+    stats = kernels.team_arrays(team_stats, ordered_teams[:2])
+    kernels.seed(7)
+    team1_wins, team2_wins, team1_games, team2_games = kernels.series_counts(stats, 0, 1, 4, 2000)
+    assert team1_wins + team2_wins == 2000
+    # Every series ends with its winner on four games
+    assert team1_games >= 4 * team1_wins and team2_games >= 4 * team2_wins
+    assert team1_games + team2_games <= 7 * 2000
+
+
+def test_series_counts_match_batch(team_stats, ordered_teams):
+    # Seeds 1 and 8 (ordered_teams[2] under SEEDING_ORDER) are a close matchup, so the odds are far from 0 and 1
+    stats = kernels.team_arrays(team_stats, [ordered_teams[0], ordered_teams[2]])
+    kernels.seed(11)
+    compiled = kernels.series_counts(stats, 0, 1, 3, 20000)[0] / 20000
+    vectorized = batch.series_totals(stats, 0, 1, 3, 20000, np.random.default_rng(11))[0] / 20000
+    assert abs(compiled - vectorized) < 0.03
+
+
+def test_double_elim_win_counts(team_stats, ordered_teams):
+    stats = kernels.team_arrays(team_stats, ordered_teams)
+    kernels.seed(3)
+    counts = kernels.double_elim_win_counts(stats, np.arange(len(ordered_teams)), 500)
+    assert counts.sum() == 500
+    # The top seed is the favourite on the current sheet
+    assert counts[0] == counts.max()
+
+
+def test_series_multiple_times_on_numba(team_stats, ordered_teams, monkeypatch, capsys):
+    monkeypatch.setattr('builtins.input', lambda prompt: '1000')
+    main.simulate_series_multiple_times(ordered_teams[0], ordered_teams[1], team_stats, 5, backend='numba')
+    lines = capsys.readouterr().out.splitlines()[1:]
+    assert sum(int(line.rsplit(' ', 2)[1]) for line in lines) == 1000
@@ -0,0 +1,59 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+import batch
+import main
+import outcome_models
+
+
+def test_rating_probabilities():
+    model = outcome_models.RatingModel({'A': 1900, 'B': 1500, 'C': 1500})
+    # 400 points is 10 to 1
+    assert model.win_probability('A', 'B') == pytest.approx(10 / 11)
+    assert model.win_probability('B', 'C') == pytest.approx(0.5)
+    matrix = model.probability_matrix(['A', 'B', 'C'])
+    assert np.allclose(matrix + matrix.T, 1.0)
+
+
+def test_ratings_centred_on_1500():
+    model = outcome_models.RatingModel.from_composite_scores(['A', 'B'], [10.0, 20.0])
+    assert model.ratings == {'A': 1500 - 5 * outcome_models.RATING_POINTS_PER_SCORE, 'B': 1500 + 5 * outcome_models.RATING_POINTS_PER_SCORE}
+
+
+def test_rating_games_follow_the_table():
+    model = outcome_models.RatingModel({'A': 1900, 'B': 1500})
+    random.seed(5)
+    wins = sum(model.simulate_game('A', 'B')[0] for _ in range(20000))
+    assert wins / 20000 == pytest.approx(10 / 11, abs=0.01)
+
+
+def test_default_score_model_matches_simulate_game(team_stats, ordered_teams):
+    # With the default constants the score model draws the same scores as main.simulate_game
+    model = outcome_models.ScoreModel(team_stats, {}, {})
+    team1, team2 = ordered_teams[:2]
+    random.seed(9)
+    expected = [main.simulate_game(team1, team2, team_stats) for _ in range(5)]
+    random.seed(9)
+    assert [model.simulate_game(team1, team2) for _ in range(5)] == expected
+
+
+def test_engines_accept_a_model(ordered_teams, seeded):
+    model = outcome_models.RatingModel({team: 1500 + 10 * i for i, team in enumerate(ordered_teams)})
+    assert main.simulate_double_elim_tournament(list(ordered_teams), model) in ordered_teams
+
+
+def test_batch_rated_games():
+    probabilities = np.array([[0.5, 0.8], [0.2, 0.5]])
+    team1_score, team2_score = batch.simulate_rated_games(probabilities, np.array([0]), np.array([1]), np.random.default_rng(0), 20000)
+    assert (team1_score + team2_score == 1).all()
+    assert team1_score.mean() == pytest.approx(0.8, abs=0.01)
+
+
+def test_load_game_parameters(tmp_path):
+    path = tmp_path / 'parameters.json'
+    path.write_text(json.dumps({'goal_weight': 1.2}))
+    parameters = outcome_models.load_game_parameters(str(path))
+    assert parameters == dict(outcome_models.DEFAULT_GAME_PARAMETERS, goal_weight=1.2)
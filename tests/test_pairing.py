@@ -0,0 +1,81 @@
+import main
+import pairing
+import tracing
+
+
+def teams(n):
+    return [f"T{i}" for i in range(n)]
+
+
+def rematches(swiss_pairing, matchups):
+    return sum(swiss_pairing.played[swiss_pairing.team_ids[team1]] >> swiss_pairing.team_ids[team2] & 1 for team1, team2 in matchups)
+
+
+def test_unplayed_bucket_keeps_adjacent_pairs():
+    bucket = teams(8)
+    assert pairing.SwissPairing(bucket).pair(bucket, 1) == main.set_matchups(bucket)
+
+
+def test_rematch_is_avoided_with_the_closest_partner():
+    bucket = teams(4)
+    swiss_pairing = pairing.SwissPairing(bucket)
+    swiss_pairing.mark([['T0', 'T1']])
+    assert swiss_pairing.pair(bucket, 2) == [['T0', 'T2'], ['T1', 'T3']]
+
+
+def test_fewest_rematches_when_none_can_be_avoided():
+    bucket = teams(4)
+    swiss_pairing = pairing.SwissPairing(bucket)
+    # T0 has played everyone, and T1 has played T2 as well
+    swiss_pairing.mark([['T0', 'T1'], ['T0', 'T2'], ['T0', 'T3'], ['T1', 'T2']])
+    assert swiss_pairing.pair(bucket, 2) == [['T0', 'T1'], ['T2', 'T3']]
+
+
+def test_large_bucket_goes_to_the_search():
+    # Buckets past TABLE_MAX_SIZE have no table, so the rematch-free pairing comes from the depth-first search
+    bucket = teams(pairing.TABLE_MAX_SIZE + 2)
+    assert len(bucket) not in pairing.PAIRING_TABLES
+    swiss_pairing = pairing.SwissPairing(bucket)
+    earlier = [['T0', 'T1'], ['T2', 'T3'], ['T4', 'T5']]
+    swiss_pairing.mark(earlier)
+    before = list(swiss_pairing.played)
+
+    matchups = swiss_pairing.pair(bucket, 2)
+    assert matchups[:3] == [['T0', 'T2'], ['T1', 'T3'], ['T4', 'T6']]
+    assert sorted(team for matchup in matchups for team in matchup) == sorted(bucket)
+    swiss_pairing.played = before
+    assert rematches(swiss_pairing, matchups) == 0
+    # Visited far fewer nodes than the budget
+    assert swiss_pairing.steps_left > pairing.DEFAULT_ROUND_BUDGET - 50
+
+
+def test_search_over_budget_falls_back_to_adjacent_pairs():
+    bucket = teams(pairing.TABLE_MAX_SIZE + 2)
+    swiss_pairing = pairing.SwissPairing(bucket, round_budget=3)
+    swiss_pairing.mark([['T0', 'T1']])
+    assert swiss_pairing.pair(bucket, 2) == main.set_matchups(bucket)
+
+
+def test_budget_is_per_round():
+    first, second, third = ([f"{prefix}{i}" for i in range(10)] for prefix in 'TXY')
+    # A clean pairing of ten teams takes five search nodes
+    swiss_pairing = pairing.SwissPairing(first + second + third, round_budget=5)
+    swiss_pairing.mark([['T0', 'T1'], ['X0', 'X1'], ['Y0', 'Y1']])
+    assert swiss_pairing.pair(first, 2)[0] == ['T0', 'T2']
+    # That used up the round's budget, so the next bucket in the round falls back
+    assert swiss_pairing.pair(second, 2) == main.set_matchups(second)
+    # A new round starts with the full budget again
+    assert swiss_pairing.pair(third, 3)[0] == ['Y0', 'Y2']
+
+
+def test_swiss_stage_has_no_rematches(team_stats, ordered_teams, seeded):
+    recorder = tracing.TraceRecorder(ordered_teams)
+    for iteration in range(20):
+        recorder.begin(iteration)
+        try:
+            main.swiss_format(list(ordered_teams), team_stats)
+        finally:
+            recorder.end()
+        rows = recorder.rows(iteration)
+        matchups = {frozenset((row[tracing.TEAM1], row[tracing.TEAM2])) for row in rows}
+        assert len(matchups) == len(rows)
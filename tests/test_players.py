@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+import pytest
+
+import players
+from conftest import ROOT
+from kernels import STAT_COLUMNS
+
+
+@pytest.fixture(scope='module')
+def model():
+    return players.PlayerModel.from_csv(os.path.join(ROOT, 'RLCSsheet.csv'))
+
+
+def test_team_stats_match_the_team_sheet(model, team_stats):
+    # Averaging the player rows gives the same team lines read_team_data builds
+    for team, stats in model.team_stats().items():
+        for stat in STAT_COLUMNS:
+            assert stats[stat] == pytest.approx(team_stats[team][stat])
+
+
+def test_move_between_rosters_is_a_trade(model):
+    team1, team2 = model.teams[:2]
+    incoming, outgoing = model.roster(team2)[0], model.roster(team1)[0]
+    rosters, = model.apply_moves([(incoming, outgoing)])
+
+    assert model.roster(team1, rosters) == [incoming] + model.roster(team1)[1:]
+    assert model.roster(team2, rosters) == [outgoing] + model.roster(team2)[1:]
+    # Other teams are untouched
+    assert (rosters[2:] == model.rosters[2:]).all()
+
+
+def test_batched_team_arrays_match_one_at_a_time(model):
+    team = model.teams[0]
+    moves = model.candidate_moves(team)[:5]
+    batched = model.team_arrays(model.apply_moves(moves))
+    for move, arrays in zip(moves, batched):
+        assert np.allclose(arrays, model.team_arrays(model.apply_moves([move])[0]))
+
+
+def test_candidate_moves_bring_in_outside_players(model):
+    team = model.teams[0]
+    own = set(model.roster(team))
+    moves = model.candidate_moves(team)
+    assert len(moves) == (len(model.players) - len(own)) * len(own)
+    assert all(incoming not in own and outgoing in own for incoming, outgoing in moves)
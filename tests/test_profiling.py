@@ -0,0 +1,61 @@
+import random
+
+import profiling
+
+
+def game():
+    random.random()
+    return 1.0, 0.0
+
+
+def series():
+    return [game() for _ in range(3)]
+
+
+def test_counts_calls_and_restores_namespace():
+    namespace = {'simulate_game': game, 'simulate_series': series}
+    profiler = profiling.SimulationProfiler(namespace)
+    original_random = random.random
+
+    profiler.install()
+    try:
+        # Calls made through the namespace are timed, like main's engines looking functions up in globals
+        namespace['simulate_series']()
+        namespace['simulate_game']()
+    finally:
+        profiler.uninstall()
+
+    assert namespace == {'simulate_game': game, 'simulate_series': series}
+    assert random.random is original_random
+    # series calls game directly rather than through the namespace, so only one game is counted
+    assert profiler.calls['series'] == 1
+    assert profiler.calls['game'] == 1
+    assert profiler.rng_calls == 4
+
+
+def test_exclusive_time_excludes_children():
+    namespace = {}
+
+    def outer():
+        return namespace['simulate_game']()
+
+    namespace.update(simulate_game=game, simulate_series=outer)
+    profiler = profiling.SimulationProfiler(namespace)
+    profiler.install()
+    try:
+        for _ in range(100):
+            namespace['simulate_series']()
+    finally:
+        profiler.uninstall()
+
+    assert profiler.calls['series'] == profiler.calls['game'] == 100
+    assert profiler.exclusive['series'] <= profiler.inclusive['series']
+    assert abs(profiler.inclusive['series'] - profiler.exclusive['series'] - profiler.inclusive['game']) < 1e-6
+
+
+def test_profile_run_reports(capsys):
+    namespace = {'simulate_game': game}
+    with profiling.profile_run(namespace, counters=True) as profiler:
+        namespace['simulate_game']()
+    assert profiler.calls['game'] == 1
+    assert 'Games: 1' in capsys.readouterr().out
@@ -0,0 +1,32 @@
+import io
+
+import progress
+
+
+def test_format_duration():
+    assert progress.format_duration(5.9) == "5s"
+    assert progress.format_duration(125) == "2m05s"
+    assert progress.format_duration(3723) == "1h02m03s"
+
+
+def test_log_lines_when_not_a_terminal():
+    stream = io.StringIO()
+    with progress.ProgressReporter(10, label="Done", stream=stream, log_interval=60) as reporter:
+        reporter.update(4)
+        reporter.update(6)
+    # The interval is far longer than the test, so only the final line is written
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1
+    assert lines[0].startswith('progress label="Done" done=10 total=10 percent=100.0')
+
+
+def test_worker_counter_is_added_to_local_count():
+    reporter = progress.ProgressReporter(10, stream=io.StringIO())
+    counter = reporter.worker_counter()
+    progress.init_worker(counter)
+    try:
+        progress.advance(3)
+    finally:
+        progress.init_worker(None)
+    reporter.update(2)
+    assert reporter.completed() == 5
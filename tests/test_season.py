@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+import main
+
+
+def test_load_season_config(tmp_path):
+    path = tmp_path / 'season.json'
+    path.write_text(json.dumps({'events': ['swiss', 'groups'], 'points': {'1': 20, '2': 15}}))
+    season = main.load_season_config(str(path))
+    assert season['events'] == ['swiss', 'groups']
+    assert season['points'] == {1: 20, 2: 15}
+    assert season['qualify'] == main.DEFAULT_SEASON['qualify']
+
+    path.write_text(json.dumps({'events': ['league']}))
+    with pytest.raises(ValueError, match='league'):
+        main.load_season_config(str(path))
+
+
+def test_every_season_hands_out_the_same_points(team_stats, ranked_teams, seeded):
+    ranked_teams = ranked_teams[:len(main.SEEDING_ORDER)]
+    season = main.DEFAULT_SEASON
+    totals = []
+    for _ in range(3):
+        season_points, event_winners = main.simulate_season(ranked_teams, team_stats, season['events'], season['points'])
+        assert len(event_winners) == len(season['events'])
+        totals.append(sum(season_points.values()))
+    # Every placement is handed out once per event, whoever finishes where
+    assert len(set(totals)) == 1
+
+
+def test_season_chunk_totals(team_stats, ranked_teams, seeded):
+    ranked_teams = ranked_teams[:len(main.SEEDING_ORDER)]
+    season = main.DEFAULT_SEASON
+    totals = main.simulate_season_chunk(ranked_teams, team_stats, season, 5)
+    assert sum(totals['qualified'].values()) == 5 * season['qualify']
+    assert sum(totals['event_wins'].values()) == 5 * len(season['events'])
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+import main
+import sensitivity
+
+
+def test_perturb_moves_one_stat_per_scenario():
+    stats = np.arange(1.0, 7.0).reshape(2, 3)
+    stats_batch, scenarios = sensitivity.perturb(stats, 0.1)
+    assert stats_batch.shape == (1 + 2 * 3 * 2, 2, 3)
+    assert (stats_batch[0] == stats).all()
+    for scenario, (team_id, column, direction) in zip(stats_batch[1:], scenarios):
+        changed = scenario != stats
+        assert changed.sum() == 1 and changed[team_id, column]
+        assert scenario[team_id, column] == stats[team_id, column] * (1 + direction * 0.1)
+
+
+def test_central_difference():
+    stats = np.array([[2.0, 0.0, 1.0, 1.0, 1.0]])
+    _, scenarios = sensitivity.perturb(stats, 0.5)
+    # Title odds up by 0.1 when the first stat goes up, down by 0.1 when it goes down
+    odds = np.full((len(scenarios) + 1, 1), 0.5)
+    odds[1, 0], odds[2, 0] = 0.6, 0.4
+    matrix = sensitivity.sensitivity_matrix(odds, stats, scenarios, 0.5, ['A'])
+    # 0.2 over a step of 2 * 0.5 * 2, in percentage points; a zero stat has no step and gets 0
+    assert matrix.loc['A', 'Goals'] == pytest.approx(10.0)
+    assert matrix.loc['A', 'Assists'] == 0.0
+
+
+def test_title_sensitivity_shape(team_stats, ordered_teams, seeded):
+    df = main.title_sensitivity(ordered_teams, team_stats, 'double_elim', num_iterations=20, workers=1)
+    assert list(df.index) == ordered_teams
+    assert np.isfinite(df.to_numpy()).all()
+
+
+def test_scenarios_share_random_numbers(team_stats, ordered_teams):
+    # Identical scenarios give identical counts, so differences between scenarios come from the stats alone
+    scenario = {team: team_stats[team] for team in ordered_teams}
+    first, second = main.sensitivity_chunk('double_elim', ordered_teams, [scenario, scenario], 50, seed=42)
+    assert first == second
+    assert sum(first) == 50
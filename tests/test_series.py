@@ -0,0 +1,78 @@
+import argparse
+import sys
+
+import pytest
+
+import main
+import tracing
+import variance
+from tournament_state import TournamentState
+
+
+@pytest.mark.parametrize('best_of', main.BEST_OF)
+def test_series_ends_on_the_winning_game(team_stats, ordered_teams, best_of, seeded):
+    team1, team2 = ordered_teams[:2]
+    for _ in range(20):
+        result = main.simulate_series(team1, team2, team_stats, best_of)
+        winner_games = result.team1_games if result.winner == team1 else result.team2_games
+        loser_games = result.team2_games if result.winner == team1 else result.team1_games
+        assert winner_games == best_of // 2 + 1
+        assert loser_games < winner_games
+        assert {result.winner, result.loser} == {team1, team2}
+
+
+def state_with(score):
+    return TournamentState('swiss', ['A', 'B'], results=[{'stage': 'swiss', 'round': 1, 'team1': 'A', 'team2': 'B',
+                                                           'team1_games': score[0], 'team2_games': score[1]}])
+
+
+def test_live_scores(team_stats, seeded):
+    stats = {'A': team_stats[next(iter(team_stats))], 'B': team_stats[next(iter(team_stats))]}
+    # A finished series keeps its result
+    assert main.play_series('A', 'B', stats, state=state_with((2, 4)), stage='swiss', round_num=1) == ('B', 'A', 2, 4)
+    # One in progress is played on from its score
+    result = main.play_series('A', 'B', stats, state=state_with((3, 0)), stage='swiss', round_num=1)
+    assert result.team1_games >= 3 and max(result.team1_games, result.team2_games) == 4
+
+
+@pytest.mark.parametrize('score', [(4, 1), (1, 5), (3, 3), (-1, 2)])
+def test_scores_that_dont_fit_the_series_are_rejected(team_stats, monkeypatch, score):
+    monkeypatch.setitem(main.STAGE_BEST_OF, 'swiss', 5)
+    with pytest.raises(ValueError, match=r'A v B \(swiss round 1\)'):
+        main.play_series('A', 'B', team_stats, state=state_with(score), stage='swiss', round_num=1)
+
+
+def test_stage_lengths_reach_the_engines(team_stats, ordered_teams, monkeypatch, seeded):
+    monkeypatch.setitem(main.STAGE_BEST_OF, 'swiss', 3)
+    recorder = tracing.TraceRecorder(ordered_teams)
+    recorder.begin(0)
+    try:
+        main.swiss_format_playoffs(list(ordered_teams), team_stats)
+    finally:
+        recorder.end()
+    rows = recorder.rows(0)
+    swiss = rows[:, tracing.STAGE] == tracing.STAGE_IDS['swiss']
+    winner_games = rows[:, tracing.TEAM1_GAMES:].max(axis=1)
+    assert (winner_games[swiss] == 2).all()
+    assert (winner_games[~swiss] == 4).all()
+
+
+def test_first_round_follows_the_stage_lengths(ordered_teams):
+    stage_best_of = dict(main.STAGE_BEST_OF, swiss=5, groups=3)
+    assert {series[4] for series in variance.first_round('swiss', ordered_teams, stage_best_of)} == {3}
+    assert {series[4] for series in variance.first_round('groups', ordered_teams, stage_best_of)} == {2}
+    assert {series[4] for series in variance.first_round('double_elim', ordered_teams, stage_best_of)} == {4}
+
+
+def test_best_of_option(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['main.py', '--best-of', 'swiss=5', '--best-of', 'playoffs=9'])
+    assert main.parse_args().best_of == [('swiss', 5), ('playoffs', 9)]
+    for value in ('swiss=4', 'swiss=x', 'finals=7', 'swiss'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            main.parse_stage_best_of(value)
+
+
+def test_numba_runner_needs_bo7_brackets(team_stats, ordered_teams, monkeypatch):
+    monkeypatch.setitem(main.STAGE_BEST_OF, 'upper', 5)
+    with pytest.raises(ValueError, match='BO7'):
+        main.make_batch_runner(main.simulate_double_elim_tournament, ordered_teams, team_stats, 'numba')
@@ -0,0 +1,94 @@
+import asyncio
+import os
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+import server
+from conftest import ROOT
+
+
+def test_concurrent_requests_share_a_computation():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'result'
+
+    async def scenario():
+        coalescer = server.Coalescer(ttl=60)
+        results = await asyncio.gather(*[coalescer.get(('series', 1), compute) for _ in range(5)])
+        # Finished results are reused without computing again
+        results.append(await coalescer.get(('series', 1), compute))
+        return results
+
+    assert asyncio.run(scenario()) == ['result'] * 6
+    assert len(calls) == 1
+
+
+def test_expired_results_are_evicted():
+    async def scenario():
+        coalescer = server.Coalescer(ttl=0.01)
+        await coalescer.get(('series', 1), lambda: asyncio.sleep(0, 'stale'))
+        await asyncio.sleep(0.02)
+        assert coalescer.cached('series') == {}
+        return coalescer
+
+    assert len(asyncio.run(scenario()).results) == 0
+
+
+def test_least_recently_used_result_goes_first():
+    async def scenario():
+        coalescer = server.Coalescer(ttl=60, max_entries=2)
+        for key in ('a', 'b'):
+            await coalescer.get(('series', key), lambda: asyncio.sleep(0, key))
+        # Using 'a' again makes 'b' the least recently used
+        await coalescer.get(('series', 'a'), lambda: asyncio.sleep(0, 'recomputed'))
+        await coalescer.get(('series', 'c'), lambda: asyncio.sleep(0, 'c'))
+        return coalescer.results
+
+    assert list(asyncio.run(scenario())) == [('series', 'a'), ('series', 'c')]
+
+
+def request_app(workers, *requests):
+    # Status and JSON of each (path, query) request against a fresh app
+    async def scenario():
+        app = server.create_app(os.path.join(ROOT, 'RLCSsheet.csv'), os.path.join(ROOT, 'rankings.csv'), workers=workers)
+        async with TestClient(TestServer(app)) as client:
+            responses = []
+            for path, query in requests:
+                response = await client.get(path, params=query)
+                responses.append((response.status, await response.json() if response.status == 200 else None))
+            return responses
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize('path, query', [
+    ('/series', {'team1': 'G2', 'team2': 'VIT', 'iterations': '0'}),
+    ('/series', {'team1': 'G2', 'team2': 'VIT', 'iterations': '-5'}),
+    ('/series', {'team1': 'G2', 'team2': 'VIT', 'iterations': str(server.MAX_ITERATIONS['series'] + 1)}),
+    ('/series', {'team1': 'G2', 'team2': 'VIT', 'best_of': '4'}),
+    ('/series', {'team1': 'G2', 'team2': 'VIT', 'best_of': '999999'}),
+    ('/forecast/swiss', {'iterations': '0'}),
+    ('/forecast/swiss', {'time_budget': '0'}),
+    ('/head_to_head', {'iterations': '0'}),
+])
+def test_bad_parameters_are_rejected(path, query):
+    assert request_app(1, (path, query)) == [(400, None)]
+
+
+def test_head_to_head_is_split_across_workers():
+    (status, body), (series_status, series) = request_app(2, ('/head_to_head', {'iterations': '20'}),
+                                                          ('/series', {'team1': 'G2', 'team2': 'VIT', 'iterations': '10'}))
+    assert status == series_status == 200
+    # A BO7 asked for with fewer iterations than the warm table is answered from it
+    assert series['iterations'] == 20
+    win = body['bo7_win']
+    teams = list(win)
+    for team1 in teams:
+        assert win[team1][team1] is None
+        for team2 in teams:
+            if team1 != team2:
+                assert win[team2][team1] + win[team1][team2] == pytest.approx(1.0)
@@ -0,0 +1,51 @@
+import main
+from standings import Standings
+
+
+def test_records_both_sides_of_a_series():
+    standings = Standings(['A', 'B'])
+    standings.record_series(0, 1, 4, 2)
+    assert standings.record('A') == {'series_wins': 1, 'series_losses': 0, 'game_wins': 4, 'game_losses': 2, 'game_differential': 2}
+    assert standings.record('B') == {'series_wins': 0, 'series_losses': 1, 'game_wins': 2, 'game_losses': 4, 'game_differential': -2}
+
+
+def test_stage_tiebreaks():
+    standings = Standings(['A', 'B', 'C', 'D', 'E'])
+    ids = standings.team_ids
+    # A and B both 1-0, A with the better game differential
+    standings.record_series(ids['A'], ids['C'], 4, 0)
+    standings.record_series(ids['B'], ids['D'], 4, 2)
+    # C and D both 0-1 on -4 and -2; E hasn't played
+    assert standings.ranked() == ['A', 'B', 'E', 'D', 'C']
+
+
+def test_game_wins_break_equal_differentials():
+    standings = Standings(['A', 'B', 'C', 'D'])
+    standings.record_series(0, 2, 4, 1)
+    standings.record_series(1, 3, 3, 0)
+    # Both +3, A with more game wins
+    assert standings.ranked(['B', 'A']) == ['A', 'B']
+
+
+def test_final_standings_count_series_losses():
+    standings = Standings(['A', 'B', 'C'])
+    standings.record_series(0, 2, 4, 0)
+    standings.record_series(2, 0, 4, 3)
+    standings.record_series(1, 2, 4, 3)
+    # A and B have a series win each and A the better differential, but A has also lost a series
+    assert standings.ranked(['A', 'B']) == ['A', 'B']
+    assert standings.ranked(['A', 'B'], final=True) == ['B', 'A']
+
+
+def test_full_ties_keep_the_given_order():
+    standings = Standings(['A', 'B', 'C'])
+    assert standings.ranked(['C', 'A', 'B']) == ['C', 'A', 'B']
+
+
+def test_main_wrappers():
+    standings = Standings(['A', 'B'])
+    main.update_standings(standings, 'A', 'B', 1, 4, 'B', 'A')
+    teams = ['A', 'B']
+    main.sort_by_standings(teams, standings)
+    assert teams == ['B', 'A']
+    assert main.rank_standings(standings) == ['B', 'A']
@@ -0,0 +1,41 @@
+import time
+
+import main
+
+
+def test_win_estimate_margins():
+    estimate = main.win_estimate({'A': 25, 'B': 75}, 100)
+    assert estimate['win_percentages'] == {'A': 25.0, 'B': 75.0}
+    # 1.96 * sqrt(0.25 * 0.75 / 100)
+    assert abs(estimate['margins']['A'] - 8.487) < 0.001
+    assert estimate['margins']['A'] == estimate['margins']['B']
+
+
+def test_stops_inside_the_budget():
+    calls = []
+
+    def run_batch(n):
+        calls.append(n)
+        time.sleep(0.0005 * n)
+        return {'A': n, 'B': 0}
+
+    updates = []
+    started = time.perf_counter()
+    estimate = main.estimate_within_time_budget(run_batch, ['A', 'B'], 0.2, on_update=updates.append)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.3
+    assert estimate['iterations'] == sum(calls) == estimate['total_wins']['A']
+    # The first batch is one tournament to measure the rate, later ones are sized from it
+    assert calls[0] == 1 and max(calls) > 1
+    assert len(updates) == len(calls)
+
+
+def test_continues_an_existing_estimate():
+    def run_batch(n):
+        time.sleep(0.0001 * n)
+        return {'A': n}
+
+    estimate = main.estimate_within_time_budget(run_batch, ['A'], 0.01, total_wins={'A': 10}, num_iterations=10)
+    assert estimate['iterations'] > 10
+    assert estimate['total_wins']['A'] == estimate['iterations']
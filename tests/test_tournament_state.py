@@ -0,0 +1,47 @@
+import main
+import tracing
+from tournament_state import TournamentState
+
+
+def test_series_score_either_way_round():
+    state = TournamentState('swiss', ['A', 'B'], results=[{'stage': 'swiss', 'round': 1, 'team1': 'A', 'team2': 'B', 'team1_games': 3, 'team2_games': 1}])
+    assert state.series_score('swiss', 1, 'A', 'B') == (3, 1)
+    assert state.series_score('swiss', 1, 'B', 'A') == (1, 3)
+    assert state.series_score('swiss', 2, 'A', 'B') is None
+
+
+def test_arrange_returns_a_copy():
+    state = TournamentState('double_elim', ['A', 'B', 'C', 'D'], slots=[{'stage': 'lower', 'round': 2, 'teams': ['C', 'A', 'D', 'B']}])
+    teams = ['A', 'B', 'C', 'D']
+    assert state.arrange('lower', 2, teams) == ['C', 'A', 'D', 'B']
+    assert teams == ['A', 'B', 'C', 'D']
+    assert state.arrange('lower', 2, ['A', 'B']) is None
+    assert state.arrange('lower', 3, teams) is None
+
+
+def test_round_trips_through_a_file(tmp_path):
+    state = TournamentState('groups', ['A', 'B'], results=[{'stage': 'groups', 'round': 1, 'team1': 'A', 'team2': 'B', 'team1_games': 2, 'team2_games': 3}],
+                            slots=[{'stage': 'playoffs', 'round': 1, 'teams': ['B', 'A']}])
+    path = tmp_path / 'state.json'
+    state.save(str(path))
+    assert TournamentState.load(str(path)).to_dict() == state.to_dict()
+
+
+def test_live_state_leaves_the_seeding_alone(team_stats, ordered_teams, seeded):
+    # Round 1 slots in reverse seeding order
+    state = TournamentState('swiss', ordered_teams, slots=[{'stage': 'swiss', 'round': 1, 'teams': ordered_teams[::-1]}])
+    teams = list(ordered_teams)
+    recorder = tracing.TraceRecorder(teams)
+    for iteration in range(3):
+        recorder.begin(iteration)
+        try:
+            main.swiss_format_playoffs(teams, team_stats, state=state)
+        finally:
+            recorder.end()
+        assert teams == ordered_teams
+
+        # Round 1 is paired from the slots in every iteration
+        rows = recorder.rows(iteration)
+        round1 = rows[(rows[:, tracing.STAGE] == tracing.STAGE_IDS['swiss']) & (rows[:, tracing.ROUND] == 1)]
+        pairs = [[ordered_teams[row[tracing.TEAM1]], ordered_teams[row[tracing.TEAM2]]] for row in round1]
+        assert pairs == main.set_matchups(ordered_teams[::-1])
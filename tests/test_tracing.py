@@ -0,0 +1,45 @@
+import main
+import tracing
+
+
+def traced_run(teams, team_stats, capacity, num_iterations=3):
+    recorder = tracing.TraceRecorder(teams, capacity=capacity, iterations=range(num_iterations))
+    main.run_traced(main.simulate_double_elim_tournament, teams, team_stats, num_iterations, 'seed', recorder)
+    return recorder
+
+
+def test_rows_per_iteration(team_stats, ordered_teams):
+    recorder = traced_run(ordered_teams, team_stats, capacity=1000)
+    assert recorder.traced_iterations() == [0, 1, 2]
+    rows = recorder.rows(1)
+    assert (rows[:, tracing.ITERATION] == 1).all()
+    # The last row is the grand final
+    assert rows[-1, tracing.STAGE] == tracing.STAGE_IDS['grand_final']
+    assert recorder.champion(1) in ordered_teams
+
+
+def test_wrapped_buffer_drops_partly_overwritten_iterations(team_stats, ordered_teams):
+    full = traced_run(ordered_teams, team_stats, capacity=1000)
+    per_iteration = len(full.rows(0))
+    # Room for the last iteration and part of the one before
+    wrapped = traced_run(ordered_teams, team_stats, capacity=per_iteration + per_iteration // 2)
+
+    assert wrapped.traced_iterations() == [2]
+    assert not wrapped.complete(1) and wrapped.complete(2)
+    assert len(wrapped.rows(1)) == 0
+    assert (wrapped.rows(2) == full.rows(2)).all()
+
+
+def test_replay_rebuilds_an_iteration(team_stats, ordered_teams):
+    full = traced_run(ordered_teams, team_stats, capacity=1000)
+    replayed = main.replay_iteration(main.simulate_double_elim_tournament, ordered_teams, team_stats, 'seed', 1)
+    assert (replayed.rows(1) == full.rows(1)).all()
+
+
+def test_render(team_stats, ordered_teams):
+    recorder = traced_run(ordered_teams, team_stats, capacity=1000, num_iterations=1)
+    lines = []
+    tracing.render(recorder.rows(0), ordered_teams, write=lines.append)
+    assert lines[0] == "\nUpper Bracket Round 1 matchups:"
+    assert recorder.champion(0) in lines[-1]
+    assert sum(1 for line in lines if ' - ' in line) == len(recorder.rows(0))
@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+import pytest
+
+import main
+import variance
+
+
+def test_plain_units_have_their_own_sample_size():
+    rng = np.random.default_rng(0)
+    units = np.zeros((20000, 2))
+    units[np.arange(20000), (rng.random(20000) < 0.3).astype(int)] = 1
+    estimate = variance.estimate(units, ['A', 'B'], 20000, 'plain')
+    assert estimate['win_percentages']['B'] == pytest.approx(30, abs=1)
+    # Plain iterations are their own effective sample size
+    assert estimate['effective_sample_size']['B'] == pytest.approx(20000, rel=0.05)
+
+
+def test_constant_units_fall_back_to_the_iteration_count():
+    units = np.tile([1.0, 0.0], (10, 1))
+    assert variance.estimate(units, ['A', 'B'], 10, 'plain')['effective_sample_size'] == {'A': 10.0, 'B': 10.0}
+
+
+def test_antithetic_stream_mirrors_by_matchup_and_game():
+    stream = variance.AntitheticStream()
+    stream.record()
+    uniform = stream.game('A', 'B')
+    recorded = [uniform(0, 1), uniform(0, 1)]
+    stream.mirror()
+    # The same matchup the other way round: team1 and team2 draws trade places
+    mirrored = stream.game('B', 'A')
+    assert [mirrored(0, 1), mirrored(0, 1)] == [1 - recorded[1], 1 - recorded[0]]
+    # A game the first run never played gets fresh draws
+    assert 0 <= stream.game('A', 'C')(0, 1) <= 1
+
+
+def test_importance_weights_average_one():
+    probabilities = np.array([[0.5, 0.2], [0.8, 0.5]])
+    sampler = variance.ImportanceSampler(lambda team1, team2: pytest.fail("base game played"), ['A', 'B'], probabilities, 'A', tilt=3.0)
+    random.seed(2)
+    weights, wins = [], 0
+    for _ in range(40000):
+        sampler.begin()
+        won = sampler.simulate_game('A', 'B')[0] == 1.0
+        weights.append(sampler.weight)
+        wins += won * sampler.weight
+    # Under the tilt A wins 0.2 * 3 / (0.2 * 3 + 0.8) of games, and the weights undo it
+    assert np.mean(weights) == pytest.approx(1.0, abs=0.02)
+    assert wins / 40000 == pytest.approx(0.2, abs=0.01)
+
+
+def test_strata_weights(team_stats, ordered_teams):
+    team_ids = {team: team_id for team_id, team in enumerate(ordered_teams)}
+    stats, options = main.batch_inputs(team_stats, ordered_teams)
+    rng = np.random.default_rng(4)
+    series = variance.first_round('double_elim', ordered_teams, main.STAGE_BEST_OF)[:3]
+    strata = variance.FirstRoundStrata(series, team_ids, stats, options, rng, samples=2000)
+    assert len(strata.probabilities) == 2 ** 3
+    assert strata.probabilities.sum() == pytest.approx(1.0)
+
+    # Systematic allocation gives every stratum its share to within one iteration
+    counts = np.bincount(strata.allocate(1000, rng), minlength=len(strata.probabilities))
+    assert (np.abs(counts - strata.probabilities * 1000) <= 1).all()
+
+    # Each iteration's first-round results have the winners of its stratum and finished scorelines
+    allocated = strata.allocate(50, rng)
+    for stratum, results in zip(allocated, strata.results(allocated, rng)):
+        for k, (result, (_, _, _, _, wins_needed)) in enumerate(zip(results, series)):
+            assert (result['team1_games'] == wins_needed) == strata.outcomes[stratum, k]
+            assert min(result['team1_games'], result['team2_games']) < wins_needed
+
+
+@pytest.mark.parametrize('mode', variance.MODES)
+def test_modes_estimate_title_odds(team_stats, ordered_teams, mode, seeded, monkeypatch):
+    monkeypatch.setattr(variance, 'STRATUM_SAMPLES', 2000)
+    monkeypatch.setattr(variance, 'GAME_SAMPLES', 2000)
+    estimate = main.simulate_variance_reduced('double_elim', ordered_teams, team_stats, mode, 200, target=ordered_teams[5])
+    assert estimate['mode'] == mode
+    if mode == 'importance':
+        # Weighted runs only add up to 100% on average
+        assert all(np.isfinite(list(estimate['win_percentages'].values())))
+    else:
+        assert sum(estimate['win_percentages'].values()) == pytest.approx(100)
+    assert variance.active is None
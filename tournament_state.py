@@ -0,0 +1,77 @@
+import json
+
+# Results that are already known in a running event, so a forecast only has to simulate what's left.
+#
+# Matches are identified by stage, round and the two teams:
+#   swiss: rounds 1-5            upper: rounds 1-4    lower: rounds 1-6    grand_final: round 1
+#   groups: round 1 (every group match)               playoffs: quarter-finals 1, semi-finals 2, final 3
+# A result where neither team has reached the series win count is a series in progress and is played out
+# from that score. Slots fix the order of a bracket round or Swiss bucket (e.g. the real lower bracket draw)
+# in place of the shuffle or standings sort.
+
+FORMATS = ['swiss', 'double_elim', 'groups']
+
+
+class TournamentState:
+    def __init__(self, tournament_format, teams, results=None, slots=None):
+        if tournament_format not in FORMATS:
+            raise ValueError(f"Unknown format {tournament_format!r}, expected one of {FORMATS}")
+        self.format = tournament_format
+        self.teams = list(teams)
+        self.results = {}
+        self.slots = {}
+        for result in results or []:
+            self.record(result['stage'], result['round'], result['team1'], result['team2'], result['team1_games'], result['team2_games'])
+        for slot in slots or []:
+            self.set_slots(slot['stage'], slot['round'], slot['teams'])
+
+    def record(self, stage, round_num, team1, team2, team1_games, team2_games):
+        self.results[(stage, round_num, frozenset((team1, team2)))] = {team1: team1_games, team2: team2_games}
+
+    def set_slots(self, stage, round_num, teams):
+        self.slots.setdefault((stage, round_num), []).append(list(teams))
+
+    def series_score(self, stage, round_num, team1, team2):
+        # (team1 games, team2 games) if this series has started, otherwise None
+        result = self.results.get((stage, round_num, frozenset((team1, team2))))
+        if result is None:
+            return None
+        return result[team1], result[team2]
+
+    def arrange(self, stage, round_num, teams):
+        # A copy of teams in the order of the recorded slots for the same set of teams, or None if there are none.
+        # teams itself is left alone.
+        for order in self.slots.get((stage, round_num), []):
+            if len(order) == len(teams) and set(order) == set(teams):
+                return list(order)
+        return None
+
+    def to_dict(self):
+        return {
+            'format': self.format,
+            'teams': self.teams,
+            'results': [
+                {'stage': stage, 'round': round_num, 'team1': team1, 'team2': team2,
+                 'team1_games': result[team1], 'team2_games': result[team2]}
+                for (stage, round_num, _), result in self.results.items()
+                for team1, team2 in [tuple(result)]
+            ],
+            'slots': [
+                {'stage': stage, 'round': round_num, 'teams': order}
+                for (stage, round_num), orders in self.slots.items()
+                for order in orders
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['format'], data['teams'], data.get('results'), data.get('slots'))
+
+    def save(self, path):
+        with open(path, mode='w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, mode='r') as file:
+            return cls.from_dict(json.load(file))
@@ -0,0 +1,125 @@
+import random
+
+import numpy as np
+
+# Per-iteration match traces. While an iteration is traced, every series the engines play through main.play_series
+# is written as one integer row into a preallocated ring buffer; iterations that aren't traced only cost a check
+# of the module-level `active` recorder per series. render() turns the rows back into the coloured bracket output
+# the engines' commented-out prints used to give.
+
+STAGES = ['swiss', 'upper', 'lower', 'grand_final', 'groups', 'playoffs']
+STAGE_IDS = {stage: stage_id for stage_id, stage in enumerate(STAGES)}
+
+# Columns of a trace row
+ITERATION, STAGE, ROUND, TEAM1, TEAM2, TEAM1_GAMES, TEAM2_GAMES = range(7)
+
+# Recorder for the iteration being played, None when it isn't traced
+active = None
+
+
+class TraceRecorder:
+    def __init__(self, teams, capacity=100000, sample_rate=0.0, iterations=(), sampling_seed=None):
+        self.teams = list(teams)
+        self.team_ids = {team: team_id for team_id, team in enumerate(self.teams)}
+        self.buffer = np.zeros((capacity, 7), dtype=np.int32)
+        self.capacity = capacity
+        self.written = 0
+        self.iteration = -1
+        # Row number each traced iteration started at, to tell which ones the ring buffer has partly overwritten
+        self.starts = {}
+
+        # Iterations traced by index, plus a random sample of the rest. Sampling has its own generator so that
+        # turning tracing on doesn't change the simulation's random numbers.
+        self.iterations = set(iterations)
+        self.sample_rate = sample_rate
+        self._sampler = random.Random(sampling_seed)
+
+    def wants(self, iteration):
+        return iteration in self.iterations or (self.sample_rate > 0 and self._sampler.random() < self.sample_rate)
+
+    def begin(self, iteration):
+        global active
+        self.iteration = iteration
+        self.starts[iteration] = self.written
+        active = self
+
+    def end(self):
+        global active
+        active = None
+
+    def record(self, stage, round_num, team1, team2, team1_games, team2_games):
+        self.buffer[self.written % self.capacity] = (self.iteration, STAGE_IDS[stage], round_num,
+                                                     self.team_ids[team1], self.team_ids[team2], team1_games, team2_games)
+        self.written += 1
+
+    def complete(self, iteration):
+        # Whether every row of a traced iteration is still in the buffer
+        start = self.starts.get(iteration)
+        return start is not None and start >= self.written - self.capacity
+
+    def rows(self, iteration=None):
+        # Rows still in the buffer, oldest first, optionally for one iteration. An iteration whose first rows have
+        # been overwritten gives no rows rather than the tail of a bracket.
+        if self.written <= self.capacity:
+            rows = self.buffer[:self.written]
+        else:
+            rows = np.roll(self.buffer, -(self.written % self.capacity), axis=0)
+        if iteration is None:
+            return rows
+        if not self.complete(iteration):
+            return rows[:0]
+        return rows[rows[:, ITERATION] == iteration]
+
+    def traced_iterations(self):
+        # Iterations whose rows are all still in the buffer
+        iterations = self.rows()[:, ITERATION]
+        return [iteration for iteration in dict.fromkeys(iterations.tolist()) if self.complete(iteration)]
+
+    def champion(self, iteration):
+        team1, team2, team1_games, team2_games = self.rows(iteration)[-1, TEAM1:]
+        return self.teams[team1 if team1_games > team2_games else team2]
+
+
+def stage_header(stage, round_num, record, group):
+    if stage == 'swiss':
+        return f"\n{' ': >5}\033[1m\033[4m{record[0]}-{record[1]}\033[0m"
+    if stage == 'upper':
+        return f"\nUpper Bracket Round {round_num} matchups:"
+    if stage == 'lower':
+        return f"\nLower Bracket Round {round_num} matchups:"
+    if stage == 'grand_final':
+        return "\nGrand Finals:"
+    if stage == 'groups':
+        return f"\nGroup {'ABCD'[group]}:"
+    return f"\n\033[1m\033[4m{['Quarter-Finals', 'Semi-Finals', 'Grand Finals'][round_num - 1]}\033[0m"
+
+
+def render(rows, teams, write=print):
+    # Swiss buckets come from the records built up over the trace; groups are told apart by their teams
+    records = {}
+    group, group_teams = -1, set()
+    header = None
+    team1_games = team2_games = 0
+    for _, stage_id, round_num, team1_id, team2_id, team1_games, team2_games in rows.tolist():
+        stage, team1, team2 = STAGES[stage_id], teams[team1_id], teams[team2_id]
+        if stage == 'groups' and team1 not in group_teams and team2 not in group_teams:
+            group, group_teams = group + 1, set()
+        group_teams.update((team1, team2))
+
+        current = stage_header(stage, round_num, records.get(team1, (0, 0)), group)
+        if current != header:
+            write(current)
+            header = current
+
+        if team1_games > team2_games:
+            write(f"\033[1m\033[96m{team1}\033[0m \033[1m{team1_games}\033[0m - {team2_games} {team2}")
+            winner, loser = team1, team2
+        else:
+            write(f"{team1} {team1_games} - \033[1m{team2_games} \033[93m{team2}\033[0m")
+            winner, loser = team2, team1
+        records[winner] = (records.get(winner, (0, 0))[0] + 1, records.get(winner, (0, 0))[1])
+        records[loser] = (records.get(loser, (0, 0))[0], records.get(loser, (0, 0))[1] + 1)
+
+    if len(rows):
+        colour = 96 if team1_games > team2_games else 93
+        write(f"\nWinner: \033[1m\033[{colour}m {winner}\033[0m")
@@ -0,0 +1,231 @@
+import itertools
+import math
+import random
+
+import numpy as np
+
+import batch
+
+# Variance reduction for the tournament Monte Carlo. Every mode estimates the same title odds as plain sampling
+# does, plus an effective sample size: the number of plain iterations that would give the same variance.
+#
+#   antithetic  iterations come in pairs; the second replays the uniforms simulate_game drew in the first as
+#               1 - u, so a lucky run for a team is paired with an unlucky one
+#   stratified  the first-round series winners are assigned systematically in proportion to their
+#               probability instead of being left to chance, and the rest of the event is simulated from there
+#   importance  the target team's game win odds are multiplied by a tilt and each run is weighted by its
+#               likelihood ratio, so a long shot wins often enough to be measured
+#
+# The antithetic stream works through the module-level `active` sampler, which simulate_game asks for the
+# game's uniform draws. The importance sampler is an outcome model passed in place of team_stats, and
+# stratification fixes the first round through a TournamentState. Importance weights and strata come from game
+# and series probabilities estimated with the batch functions, so those two modes carry a small estimation
+# error from GAME_SAMPLES and STRATUM_SAMPLES.
+
+MODES = ['antithetic', 'stratified', 'importance']
+
+# Sampler supplying the uniforms of the game being played, None for plain sampling
+active = None
+
+# Factor on the importance sampler's target team game win odds (1 is plain sampling)
+DEFAULT_TILT = 2.0
+
+# Games simulated per pair of teams to estimate game win probabilities for the importance sampler
+GAME_SAMPLES = 20000
+
+# Independent replicates of a stratified run; their spread gives the variance
+STRATIFIED_REPLICATES = 20
+
+# Series simulated per first-round matchup to estimate its win probability and scorelines
+STRATUM_SAMPLES = 200000
+
+
+class AntitheticStream:
+    # Records the uniforms of every game in the first run of a pair and replays them mirrored in the second.
+    # Draws are matched by matchup and game number rather than by position in the stream, so once the runs'
+    # paths split (a series goes to a different length, a different team advances), the games that do happen in
+    # both runs still get mirrored draws. Games the first run didn't play get fresh ones.
+    def __init__(self):
+        self.games = {}
+        self.played = {}
+        self.mirroring = False
+        self.draws = None
+        self.swap = False
+        self.position = 0
+
+    def record(self):
+        self.games = {}
+        self.played = {}
+        self.mirroring = False
+
+    def mirror(self):
+        self.played = {}
+        self.mirroring = True
+
+    def game(self, team1, team2):
+        key = frozenset((team1, team2))
+        number = self.played.get(key, 0)
+        self.played[key] = number + 1
+        games = self.games.setdefault(key, [])
+        if not self.mirroring:
+            self.draws = []
+            games.append((team1, self.draws))
+        elif number < len(games):
+            # With the teams the other way round, team1 and team2 draws trade places
+            recorded_team1, self.draws = games[number]
+            self.swap = recorded_team1 != team1
+        else:
+            self.draws = None
+        self.position = 0
+        return self.uniform
+
+    def uniform(self, a, b):
+        position = self.position
+        self.position += 1
+        if not self.mirroring:
+            u = random.random()
+            self.draws.append(u)
+        elif self.draws is not None and position < len(self.draws):
+            u = 1 - self.draws[position ^ 1 if self.swap else position]
+        else:
+            u = random.random()
+        return a + (b - a) * u
+
+
+class ImportanceSampler:
+    # An outcome model that decides the target team's games itself: the target wins with its game win odds
+    # multiplied by tilt, and the run's weight picks up the likelihood ratio p / q of every such game. Other
+    # games go to base_game unchanged. probabilities[i, j] is the chance team i beats team j in a game.
+    def __init__(self, base_game, teams, probabilities, target, tilt=DEFAULT_TILT):
+        if tilt <= 0:
+            raise ValueError(f"tilt must be positive, got {tilt}")
+        self.base_game = base_game
+        self.teams = list(teams)
+        self.target = target
+        self.weight = 1.0
+        # (chance the target wins under the tilt, weight if it wins, weight if it loses), by opponent
+        self.odds = {}
+        target_id = self.teams.index(target)
+        for team_id, team in enumerate(self.teams):
+            p = probabilities[target_id, team_id]
+            q = p * tilt / (p * tilt + 1 - p)
+            self.odds[team] = (q, p / q if q else 1.0, (1 - p) / (1 - q) if q < 1 else 1.0)
+
+    def __iter__(self):
+        return iter(self.teams)
+
+    def __contains__(self, team):
+        return team in self.teams
+
+    def begin(self):
+        self.weight = 1.0
+
+    def simulate_game(self, team1, team2):
+        if team1 == self.target:
+            opponent = team2
+        elif team2 == self.target:
+            opponent = team1
+        else:
+            return self.base_game(team1, team2)
+
+        q, win_weight, loss_weight = self.odds[opponent]
+        target_won = random.random() < q
+        self.weight *= win_weight if target_won else loss_weight
+        # Scores of 1 and 0, like the rating model's
+        return (1.0, 0.0) if target_won == (team1 == self.target) else (0.0, 1.0)
+
+
+def game_probabilities(stats, options, rng, samples=GAME_SAMPLES):
+    # probabilities[i, j], the chance team i beats team j in a game, from batched games (tied games are replayed
+    # in the engines, so they don't count). The rating model's table is used as it is.
+    if 'probabilities' in options:
+        return options['probabilities']
+    team1, team2 = np.triu_indices(len(stats), k=1)
+    team1_score, team2_score = batch.simulate_games(stats, team1, team2, rng, samples, options.get('parameters'))
+    team1_wins = (team1_score > team2_score).sum(axis=1)
+    team2_wins = (team2_score > team1_score).sum(axis=1)
+    probabilities = np.full((len(stats), len(stats)), 0.5)
+    probabilities[team1, team2] = team1_wins / np.maximum(team1_wins + team2_wins, 1)
+    probabilities[team2, team1] = 1 - probabilities[team1, team2]
+    return probabilities
+
+
+def first_round(tournament_format, teams, stage_best_of):
+    # The first-round series of a format, which don't depend on any earlier result: (stage, round, team1, team2,
+    # wins needed). Groups start with the first two teams of each group. stage_best_of is main.STAGE_BEST_OF, so
+    # the series are as long as the engines play them.
+    if tournament_format == 'groups':
+        wins_needed = stage_best_of['groups'] // 2 + 1
+        return [('groups', 1, teams[start], teams[start + 1], wins_needed) for start in range(0, len(teams), 4)]
+    stage = 'upper' if tournament_format == 'double_elim' else 'swiss'
+    wins_needed = stage_best_of[stage] // 2 + 1
+    return [(stage, 1, teams[i], teams[i + 1], wins_needed) for i in range(0, len(teams), 2)]
+
+
+class FirstRoundStrata:
+    # One stratum per combination of first-round winners (256 for a 16-team bracket). Each matchup's win
+    # probability and scoreline distribution are estimated from STRATUM_SAMPLES batched series, so stratum
+    # probabilities are products of those estimates.
+    def __init__(self, series, team_ids, stats, options, rng, samples=STRATUM_SAMPLES):
+        self.series = series
+        self.scorelines = []
+        win_probabilities = []
+        for _, _, team1, team2, wins_needed in series:
+            team1_won, team1_games, team2_games = batch.simulate_series(
+                stats, np.full(samples, team_ids[team1]), np.full(samples, team_ids[team2]), wins_needed, rng, **options)
+            win_probabilities.append(team1_won.mean())
+            # Scorelines and their cumulative probabilities, given team1 won / lost
+            by_winner = []
+            for won in (True, False):
+                rows = team1_won == won
+                if not rows.any():
+                    # Never happened in the samples, so its strata have probability 0 and are never allocated
+                    by_winner.append((np.zeros((1, 2), dtype=np.int64), np.ones(1)))
+                    continue
+                scores, counts = np.unique(np.stack([team1_games[rows], team2_games[rows]], axis=1), axis=0, return_counts=True)
+                by_winner.append((scores, np.cumsum(counts) / counts.sum()))
+            self.scorelines.append(by_winner)
+
+        # outcomes[stratum, k] is whether team1 of series k wins
+        self.outcomes = np.array(list(itertools.product([True, False], repeat=len(series))))
+        p = np.array(win_probabilities)
+        self.probabilities = np.where(self.outcomes, p, 1 - p).prod(axis=1)
+        self.cumulative = np.cumsum(self.probabilities)
+        self.cumulative[-1] = 1.0
+
+    def allocate(self, iterations, rng):
+        # Systematic proportional allocation: iteration i gets the stratum holding (i + u) / iterations
+        points = (np.arange(iterations) + rng.random()) / iterations
+        return np.searchsorted(self.cumulative, points, side='right')
+
+    def results(self, strata, rng):
+        # First-round results for each allocated stratum, as TournamentState result dicts
+        games = np.zeros((len(strata), len(self.series), 2), dtype=np.int64)
+        for k in range(len(self.series)):
+            won = self.outcomes[strata, k]
+            draws = rng.random(len(strata))
+            for side, (scores, cumulative) in enumerate(self.scorelines[k]):
+                rows = won if side == 0 else ~won
+                games[rows, k] = scores[np.minimum(np.searchsorted(cumulative, draws[rows], side='right'), len(scores) - 1)]
+        return [
+            [{'stage': stage, 'round': round_num, 'team1': team1, 'team2': team2, 'team1_games': int(score[0]), 'team2_games': int(score[1])}
+             for (stage, round_num, team1, team2, _), score in zip(self.series, iteration_games)]
+            for iteration_games in games
+        ]
+
+
+def estimate(units, teams, iterations, mode):
+    # units is (units, teams): one unbiased estimate of every team's title probability per independent unit
+    # (an antithetic pair, an importance-sampled run, a stratified replicate). The effective sample size is
+    # p(1 - p) over the variance of the mean, i.e. how many plain iterations would do as well.
+    p = units.mean(axis=0)
+    variance_of_mean = units.var(axis=0, ddof=1) / len(units)
+    binomial = p * (1 - p)
+    effective = np.divide(binomial, variance_of_mean, out=np.full(len(teams), float(iterations)), where=variance_of_mean > 0)
+    return {
+        'mode': mode,
+        'iterations': iterations,
+        'win_percentages': {team: float(p[i]) * 100 for i, team in enumerate(teams)},
+        'margins': {team: 1.96 * math.sqrt(variance_of_mean[i]) * 100 for i, team in enumerate(teams)},
+        'effective_sample_size': {team: float(effective[i]) for i, team in enumerate(teams)},
+    }